@@ -0,0 +1,227 @@
+import sqlite3
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from fractions import Fraction
+from pathlib import Path
+from typing import Self
+
+from rich.box import SIMPLE
+from rich.console import Console
+from rich.table import Table
+
+from .helpers import InputPart, stylize
+from .matrix_leaf import MatrixLeaf
+from .tuning import CENTS_PER_SEMITONE, get_midi_number, get_pitch_frequency
+
+DEFAULT_DATABASE = Path("agni.db")
+DEFAULT_TOLERANCE = 20
+DEFAULT_LIMIT = 20
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pieces (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    composer TEXT NOT NULL,
+    multiples INTEGER NOT NULL,
+    tone_set TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leaves (
+    piece_id INTEGER NOT NULL REFERENCES pieces (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    onset REAL NOT NULL,
+    duration REAL NOT NULL,
+    bass REAL,
+    melody REAL,
+    PRIMARY KEY (piece_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pitches (
+    piece_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    instrument_name TEXT NOT NULL,
+    frequency REAL NOT NULL,
+    midi_number REAL NOT NULL,
+    FOREIGN KEY (piece_id, position)
+        REFERENCES leaves (piece_id, position) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS leaves_onset ON leaves (piece_id, onset);
+CREATE INDEX IF NOT EXISTS leaves_duration ON leaves (duration);
+CREATE INDEX IF NOT EXISTS leaves_bass ON leaves (bass);
+CREATE INDEX IF NOT EXISTS leaves_melody ON leaves (melody);
+CREATE INDEX IF NOT EXISTS pitches_midi_number
+    ON pitches (midi_number, piece_id, position);
+CREATE INDEX IF NOT EXISTS pitches_leaf ON pitches (piece_id, position);
+"""
+PITCH_QUERY = """
+SELECT
+    pieces.title,
+    pieces.path,
+    COUNT(DISTINCT pitches.position),
+    MIN(leaves.onset),
+    MIN(ABS(pitches.midi_number - :midi_number))
+FROM pitches
+JOIN leaves USING (piece_id, position)
+JOIN pieces ON pieces.id = pitches.piece_id
+WHERE pitches.midi_number BETWEEN :low AND :high
+GROUP BY pitches.piece_id
+ORDER BY 3 DESC, 5, pieces.title
+LIMIT :limit
+"""
+
+
+@dataclass
+class CorpusResult:
+    title: str
+    path: str
+    matrices: int
+    onset: Fraction
+    deviation: float
+
+
+def get_leaf_rows(
+    piece_id: int, matrix_leaves: Iterable[MatrixLeaf]
+) -> Iterator[tuple[tuple, list[tuple]]]:
+    onset = Fraction(0)
+    for position, matrix_leaf in enumerate(matrix_leaves):
+        duration = matrix_leaf.sounding_duration or Fraction(0)
+        bass = matrix_leaf._bass
+        melody = matrix_leaf._melody
+        bass_frequency = bass.hertz if bass else None
+        melody_frequency = melody.hertz if melody else None
+        leaf_row = (
+            piece_id,
+            position,
+            float(onset),
+            float(duration),
+            bass_frequency,
+            melody_frequency,
+        )
+        frequencies = [
+            (matrix_pitch.instrument_name, matrix_pitch.frequency)
+            for matrix_pitch in matrix_leaf.generated_pitches
+        ]
+        if frequencies:
+            frequencies += [
+                (InputPart.BASS.title(), bass_frequency),
+                (InputPart.MELODY.title(), melody_frequency),
+            ]
+        pitch_rows = [
+            (
+                piece_id,
+                position,
+                instrument_name,
+                frequency,
+                get_midi_number(frequency),
+            )
+            for instrument_name, frequency in frequencies
+            if frequency
+        ]
+        yield leaf_row, pitch_rows
+        onset += duration
+
+
+class Corpus:
+    def __init__(self, database: Path = DEFAULT_DATABASE):
+        self._connection = sqlite3.connect(database)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(SCHEMA)
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def add(
+        self,
+        path: Path,
+        title: str,
+        composer: str,
+        multiples: int,
+        tone_set: str,
+        matrix_leaves: Iterable[MatrixLeaf],
+    ) -> int:
+        connection = self._connection
+        with connection:
+            connection.execute(
+                "DELETE FROM pieces WHERE path = ?", (str(path.resolve()),)
+            )
+            cursor = connection.execute(
+                "INSERT INTO pieces"
+                " (path, title, composer, multiples, tone_set)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (str(path.resolve()), title, composer, multiples, tone_set),
+            )
+            piece_id = cursor.lastrowid or 0
+            leaf_rows = []
+            pitch_rows = []
+            for leaf_row, leaf_pitch_rows in get_leaf_rows(
+                piece_id, matrix_leaves
+            ):
+                leaf_rows.append(leaf_row)
+                pitch_rows.extend(leaf_pitch_rows)
+            connection.executemany(
+                "INSERT INTO leaves VALUES (?, ?, ?, ?, ?, ?)", leaf_rows
+            )
+            connection.executemany(
+                "INSERT INTO pitches VALUES (?, ?, ?, ?, ?)", pitch_rows
+            )
+        return len(leaf_rows)
+
+    def query(
+        self,
+        pitch: str,
+        tolerance: float = DEFAULT_TOLERANCE,
+        limit: int = DEFAULT_LIMIT,
+    ) -> list[CorpusResult]:
+        midi_number = get_midi_number(get_pitch_frequency(pitch))
+        semitones = tolerance / CENTS_PER_SEMITONE
+        rows = self._connection.execute(
+            PITCH_QUERY,
+            {
+                "midi_number": midi_number,
+                "low": midi_number - semitones,
+                "high": midi_number + semitones,
+                "limit": limit,
+            },
+        )
+        return [
+            CorpusResult(
+                title,
+                path,
+                matrices,
+                Fraction(onset).limit_denominator(),
+                deviation * CENTS_PER_SEMITONE,
+            )
+            for title, path, matrices, onset, deviation in rows
+        ]
+
+    def display_query(
+        self,
+        pitch: str,
+        tolerance: float = DEFAULT_TOLERANCE,
+        limit: int = DEFAULT_LIMIT,
+    ):
+        title = stylize(
+            f"Matrices within {tolerance} cents of {pitch}", "cyan"
+        )
+        table = Table(title=title, box=SIMPLE)
+        for column in (
+            "Title",
+            "File",
+            "Matrices",
+            "First onset",
+            "Deviation",
+        ):
+            table.add_column(column)
+        for result in self.query(pitch, tolerance, limit):
+            table.add_row(
+                result.title,
+                result.path,
+                str(result.matrices),
+                str(result.onset),
+                f"{round(result.deviation, 2)} cents",
+            )
+        Console().print(table)
@@ -1,4 +1,7 @@
 from enum import StrEnum, auto
+from functools import cached_property, lru_cache
+from sys import intern
+from typing import Any
 
 from abjad import Staff, StaffGroup
 
@@ -8,7 +11,19 @@ class InputPart(StrEnum):
     MELODY = auto()
 
 
+class atomic_cached_property(cached_property):
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        cache = instance.__dict__
+        name = self.attrname
+        if name in cache:
+            return cache[name]
+        return cache.setdefault(name, self.func(instance))
+
+
 def _get_part_label(multiple: int, input_part: InputPart) -> str:
+    multiple = abs(multiple)
     if multiple == 0:
         return ""
     if multiple == 1:
@@ -22,16 +37,62 @@ def _get_part_label(multiple: int, input_part: InputPart) -> str:
     return f"{multiplier}{part_abbreviation}"
 
 
-def get_instrument_name(bass_multiple: int, melody_multiple: int) -> str:
+def _format_instrument_name(bass_multiple: int, melody_multiple: int) -> str:
     bass_label = _get_part_label(bass_multiple, InputPart.BASS)
     melody_label = _get_part_label(melody_multiple, InputPart.MELODY)
     if not bass_label:
         return melody_label
     if not melody_label:
         return bass_label
+    if bass_multiple * melody_multiple < 0:
+        return f"{melody_label} - {bass_label}"
     return f"{bass_label} + {melody_label}"
 
 
+@lru_cache
+def get_instrument_name_table(multiples: int) -> tuple[tuple[str, ...], ...]:
+    multipliers = range(1 - multiples, multiples)
+    return tuple(
+        tuple(
+            intern(_format_instrument_name(bass_multiple, melody_multiple))
+            for bass_multiple in multipliers
+        )
+        for melody_multiple in multipliers
+    )
+
+
+def get_instrument_name(
+    bass_multiple: int, melody_multiple: int, multiples: int
+) -> str:
+    offset = multiples - 1
+    table = get_instrument_name_table(multiples)
+    return table[melody_multiple + offset][bass_multiple + offset]
+
+
+def _is_input_multiple(bass_multiple: int, melody_multiple: int) -> bool:
+    return (
+        bass_multiple == 0
+        and melody_multiple == 0
+        or abs(bass_multiple) == 1
+        and melody_multiple == 0
+        or bass_multiple == 0
+        and melody_multiple == 1
+    )
+
+
+@lru_cache
+def get_instrument_names(
+    multiples: int, bass_multiples: range
+) -> tuple[str, ...]:
+    instrument_names = (
+        get_instrument_name(bass_multiple, melody_multiple, multiples)
+        for melody_multiple in range(multiples)
+        for bass_multiple in bass_multiples
+        if not _is_input_multiple(bass_multiple, melody_multiple)
+    )
+    return tuple(dict.fromkeys(instrument_names))
+
+
 def get_staff_by_name(
     staves: StaffGroup | list[Staff], name: str
 ) -> Staff | None:
@@ -0,0 +1,476 @@
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from math import gcd
+
+from abjad import (
+    AssignabilityError,
+    BarLine,
+    Clef,
+    Component,
+    Container,
+    Duration,
+    Leaf,
+    MultimeasureRest,
+    NamedPitch,
+    Note,
+    Rest,
+    Staff,
+    Tie,
+    TimeSignature,
+    Tuplet,
+    attach,
+)
+
+from .helpers import InputPart
+from .timeline import MeteredLeaf
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<comment>%\{.*?%\}|%[^\n]*)
+    | (?P<string>"(?:\\.|[^"\\])*")
+    | (?P<command>\\[A-Za-z]+)
+    | (?P<simultaneous>(?:<<|>>))
+    | (?P<fraction>\d+/\d+)
+    | (?P<number>\d+)
+    | (?P<word>[A-Za-z]+)
+    | (?P<octave>[',]+)
+    | (?P<symbol>\S)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+PITCH_NAME_PATTERN = re.compile(r"^[a-g](?:t?q[sf]|ss?|ff?)?$")
+PITCH_LETTERS = "cdefgab"
+SKIPPED_BLOCKS = ("\\header", "\\paper", "\\layout", "\\midi")
+DURATION_COMMANDS = {"\\breve": Duration(2), "\\longa": Duration(4)}
+DEFAULT_TIME_SIGNATURE = (4, 4)
+
+
+class UnsupportedInputError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Token:
+    kind: str
+    value: str
+
+
+@dataclass
+class LeafRecord:
+    pitch: str | None
+    written_duration: Duration
+    multiplier: tuple[int, int] | None = None
+    is_multi_measure_rest: bool = False
+    is_forced: bool = False
+    is_cautionary: bool = False
+
+
+@dataclass
+class ContainerRecord:
+    items: list = field(default_factory=list)
+    tuplet: str | None = None
+
+
+@dataclass(frozen=True)
+class IndicatorRecord:
+    command: str
+    value: str | tuple[int, int] | None = None
+
+
+Record = LeafRecord | ContainerRecord | IndicatorRecord
+
+
+@lru_cache
+def _get_named_pitch(name: str) -> NamedPitch:
+    return NamedPitch(name)
+
+
+class LilyPondReader:
+    def __init__(self, lilypond_input: str):
+        self._tokens = self._tokenize(lilypond_input)
+        self._position = 0
+        self._written_duration = Duration(1, 4)
+        self._has_multiplier = False
+        self._relative_reference: int | None = None
+        self._variables: dict[str, ContainerRecord | None] = {}
+        self._staves: dict[str, ContainerRecord] = {}
+        self._read_top_level()
+
+    @staticmethod
+    def _tokenize(lilypond_input: str) -> list[Token]:
+        return [
+            Token(str(match.lastgroup), match.group())
+            for match in TOKEN_PATTERN.finditer(lilypond_input)
+            if match.lastgroup != "comment"
+        ]
+
+    def _peek(self, offset: int = 0) -> Token | None:
+        position = self._position + offset
+        if position >= len(self._tokens):
+            return None
+        return self._tokens[position]
+
+    def _next(self) -> Token:
+        token = self._peek()
+        if token is None:
+            raise UnsupportedInputError("unexpected end of input")
+        self._position += 1
+        return token
+
+    def _expect(self, value: str) -> Token:
+        token = self._next()
+        if token.value != value:
+            raise UnsupportedInputError(f"expected {value!r}, got {token}")
+        return token
+
+    def _skip_block(self):
+        self._expect("{")
+        depth = 1
+        while depth:
+            value = self._next().value
+            if value == "{":
+                depth += 1
+            elif value == "}":
+                depth -= 1
+
+    def _skip_value(self):
+        token = self._next()
+        if token.value == "#":
+            next_token = self._peek()
+            if next_token and next_token.value == "(":
+                depth = 0
+                while True:
+                    value = self._next().value
+                    if value == "(":
+                        depth += 1
+                    elif value == ")":
+                        depth -= 1
+                        if not depth:
+                            return
+            else:
+                self._skip_value()
+            return
+        next_token = self._peek()
+        if token.kind == "command" and next_token and next_token.value == "{":
+            self._skip_block()
+
+    def _read_top_level(self):
+        while (token := self._peek()) is not None:
+            next_token = self._peek(1)
+            if token.kind == "word" and next_token and next_token.value == "=":
+                self._read_assignment()
+            elif token.value == "\\language":
+                self._next()
+                if self._next().value != '"english"':
+                    raise UnsupportedInputError("unsupported pitch language")
+            elif token.value in SKIPPED_BLOCKS:
+                self._next()
+                self._skip_block()
+            elif token.value == "\\score":
+                self._next()
+                self._read_score()
+                return
+            else:
+                self._next()
+
+    def _read_assignment(self):
+        name = self._next().value
+        self._expect("=")
+        token = self._peek()
+        if token and token.value in ("{", "\\relative"):
+            self._variables[name] = self._read_music_expression()
+        else:
+            self._variables[name] = None
+            self._skip_value()
+
+    def _read_score(self):
+        self._expect("{")
+        depth = 1
+        while depth:
+            token = self._next()
+            if token.value == "{":
+                depth += 1
+            elif token.value == "}":
+                depth -= 1
+            elif token.value in ("\\new", "\\context"):
+                self._read_context()
+
+    def _read_context(self):
+        token = self._peek()
+        if not token or token.value != "Staff":
+            return
+        self._next()
+        token = self._peek()
+        if not token or token.value != "=":
+            return
+        self._next()
+        name = self._next().value.strip('"')
+        token = self._peek()
+        if token and token.value == "\\with":
+            self._next()
+            self._skip_block()
+        token = self._peek()
+        if not token or token.value != "{":
+            raise UnsupportedInputError(f"unsupported staff music: {token}")
+        staff = self._read_music_expression()
+        if name not in self._staves:
+            self._staves[name] = staff
+
+    def _read_music_expression(self) -> ContainerRecord:
+        token = self._next()
+        if token.value == "{":
+            return ContainerRecord(self._read_sequence())
+        if token.value == "\\relative":
+            return self._read_relative()
+        if token.value == "\\tuplet":
+            fraction = self._next().value
+            numerator, denominator = self._get_fraction(fraction)
+            if (token := self._peek()) and token.kind == "number":
+                self._next()
+            items = self._read_music_expression().items
+            return ContainerRecord(items, f"{numerator}:{denominator}")
+        if token.value == "\\times":
+            fraction = self._next().value
+            numerator, denominator = self._get_fraction(fraction)
+            items = self._read_music_expression().items
+            return ContainerRecord(items, f"{denominator}:{numerator}")
+        if token.kind == "command":
+            return self._read_variable(token.value[1:])
+        raise UnsupportedInputError(f"unsupported music expression: {token}")
+
+    def _read_variable(self, name: str) -> ContainerRecord:
+        if self._relative_reference is not None:
+            raise UnsupportedInputError("variable inside relative music")
+        variable = self._variables.get(name)
+        if variable is None:
+            raise UnsupportedInputError(f"unsupported variable: {name}")
+        return ContainerRecord(variable.items, variable.tuplet)
+
+    def _read_relative(self) -> ContainerRecord:
+        token = self._next()
+        if token.kind != "word" or not PITCH_NAME_PATTERN.match(token.value):
+            raise UnsupportedInputError("relative music without a pitch")
+        octave = self._read_octave()
+        step = PITCH_LETTERS.index(token.value[0])
+        previous_reference = self._relative_reference
+        self._relative_reference = octave * 7 + step
+        expression = self._read_music_expression()
+        self._relative_reference = previous_reference
+        return expression
+
+    def _read_octave(self) -> int:
+        token = self._peek()
+        if not token or token.kind != "octave":
+            return 0
+        self._next()
+        return token.value.count("'") - token.value.count(",")
+
+    @staticmethod
+    def _get_fraction(fraction: str) -> tuple[int, int]:
+        if "/" not in fraction:
+            raise UnsupportedInputError(f"expected a fraction: {fraction}")
+        numerator, denominator = fraction.split("/")
+        return int(numerator), int(denominator)
+
+    def _read_sequence(self) -> list[Record]:
+        items: list[Record] = []
+        while True:
+            token = self._peek()
+            if token is None:
+                raise UnsupportedInputError("unterminated music")
+            value = token.value
+            if value == "}":
+                self._next()
+                return items
+            if value == "|":
+                self._next()
+            elif value == "~":
+                self._next()
+                items.append(IndicatorRecord("~"))
+            elif value == "\\time":
+                self._next()
+                pair = self._get_fraction(self._next().value)
+                items.append(IndicatorRecord(value, pair))
+            elif value in ("\\clef", "\\bar"):
+                self._next()
+                string = self._next()
+                if string.kind != "string":
+                    raise UnsupportedInputError(f"unsupported {value}")
+                items.append(IndicatorRecord(value, string.value.strip('"')))
+            elif value == "\\addlyrics":
+                self._next()
+                self._skip_value()
+            elif token.kind == "word" and value in ("r", "R"):
+                self._next()
+                items.append(self._read_rest(value == "R"))
+            elif token.kind == "word" and PITCH_NAME_PATTERN.match(value):
+                self._next()
+                items.append(self._read_note(value))
+            else:
+                items.append(self._read_music_expression())
+
+    def _read_duration(self) -> tuple[Duration, tuple[int, int] | None]:
+        token = self._peek()
+        if token and token.kind == "number":
+            self._next()
+            written_duration = Duration(1, int(token.value))
+        elif token and token.value in DURATION_COMMANDS:
+            self._next()
+            written_duration = DURATION_COMMANDS[token.value]
+        else:
+            if self._has_multiplier:
+                raise UnsupportedInputError("implicit scaled duration")
+            return self._written_duration, None
+        dot_value = written_duration
+        while (token := self._peek()) and token.value == ".":
+            self._next()
+            dot_value = dot_value / 2
+            written_duration += dot_value
+        multiplier = None
+        if (token := self._peek()) and token.value == "*":
+            self._next()
+            factor = self._next()
+            if factor.kind == "number":
+                multiplier = (int(factor.value), 1)
+            else:
+                numerator, denominator = self._get_fraction(factor.value)
+                divisor = gcd(numerator, denominator)
+                multiplier = (numerator // divisor, denominator // divisor)
+        if (token := self._peek()) and token.value == "*":
+            raise UnsupportedInputError("compound duration multiplier")
+        self._written_duration = Duration(written_duration)
+        self._has_multiplier = multiplier is not None
+        return self._written_duration, multiplier
+
+    def _read_rest(self, is_multi_measure_rest: bool) -> LeafRecord:
+        written_duration, multiplier = self._read_duration()
+        return LeafRecord(
+            None,
+            written_duration,
+            multiplier,
+            is_multi_measure_rest=is_multi_measure_rest,
+        )
+
+    def _get_absolute_pitch(self, name: str, octave: int) -> str:
+        reference = self._relative_reference
+        if reference is not None:
+            step = PITCH_LETTERS.index(name[0])
+            octave += (reference - step + 3) // 7
+            self._relative_reference = octave * 7 + step
+        if octave > 0:
+            return name + "'" * octave
+        return name + "," * -octave
+
+    def _read_note(self, name: str) -> LeafRecord:
+        octave = self._read_octave()
+        pitch = self._get_absolute_pitch(name, octave)
+        is_forced = is_cautionary = False
+        token = self._peek()
+        if token and token.value == "!":
+            self._next()
+            is_forced = True
+        elif token and token.value == "?":
+            self._next()
+            is_cautionary = True
+        token = self._peek()
+        if token and token.value == "=":
+            raise UnsupportedInputError("octave checks are not supported")
+        written_duration, multiplier = self._read_duration()
+        return LeafRecord(
+            pitch,
+            written_duration,
+            multiplier,
+            is_forced=is_forced,
+            is_cautionary=is_cautionary,
+        )
+
+    def get_staff_record(self, name: str) -> ContainerRecord | None:
+        return self._staves.get(name)
+
+
+class MeteredStaffBuilder:
+    def __init__(self):
+        self._time_signature = TimeSignature(DEFAULT_TIME_SIGNATURE)
+        self._pending_indicators: list[Clef | TimeSignature] = []
+        self._previous_leaf: Leaf | None = None
+        self.metered_leaves: list[MeteredLeaf] = []
+
+    @staticmethod
+    def _get_leaf(record: LeafRecord) -> Leaf:
+        duration = record.written_duration
+        multiplier = record.multiplier
+        if record.pitch is None:
+            if record.is_multi_measure_rest:
+                return MultimeasureRest(duration, multiplier=multiplier)
+            return Rest(duration, multiplier=multiplier)
+        note = Note(
+            _get_named_pitch(record.pitch), duration, multiplier=multiplier
+        )
+        if record.is_forced:
+            note.note_head.is_forced = True
+        if record.is_cautionary:
+            note.note_head.is_cautionary = True
+        return note
+
+    def _add_indicator(self, record: IndicatorRecord):
+        command = record.command
+        previous_leaf = self._previous_leaf
+        if command == "~" or command == "\\bar":
+            if previous_leaf is None:
+                raise UnsupportedInputError(f"{command} without a leaf")
+            if command == "~":
+                attach(Tie(), previous_leaf)
+            else:
+                attach(BarLine(str(record.value)), previous_leaf)
+        elif command == "\\time":
+            time_signature = TimeSignature(record.value)
+            self._pending_indicators.append(time_signature)
+        else:
+            self._pending_indicators.append(Clef(str(record.value)))
+
+    def _add_leaf(self, record: LeafRecord) -> Leaf:
+        leaf = self._get_leaf(record)
+        for indicator in self._pending_indicators:
+            attach(indicator, leaf)
+            if isinstance(indicator, TimeSignature):
+                self._time_signature = indicator
+        self._pending_indicators = []
+        self._previous_leaf = leaf
+        self.metered_leaves.append(MeteredLeaf(leaf, self._time_signature))
+        return leaf
+
+    def build_components(self, records: list[Record]) -> list[Component]:
+        components: list[Component] = []
+        for record in records:
+            if isinstance(record, IndicatorRecord):
+                self._add_indicator(record)
+            elif isinstance(record, LeafRecord):
+                components.append(self._add_leaf(record))
+            else:
+                items = self.build_components(record.items)
+                if record.tuplet:
+                    components.append(Tuplet(record.tuplet, items))
+                else:
+                    components.append(Container(items))
+        return components
+
+    def build_staff(self, record: ContainerRecord, name: str) -> Staff:
+        components = self.build_components(record.items)
+        if self._pending_indicators:
+            raise UnsupportedInputError("indicators after the last leaf")
+        return Staff(components, name=name)
+
+
+def read_metered_staff(
+    lilypond_input: str, input_part: InputPart
+) -> tuple[Staff, list[MeteredLeaf]] | None:
+    try:
+        record = LilyPondReader(lilypond_input).get_staff_record(input_part)
+        if record is None:
+            return None
+        builder = MeteredStaffBuilder()
+        staff = builder.build_staff(record, input_part)
+    except (UnsupportedInputError, AssignabilityError):
+        return None
+    return staff, builder.metered_leaves
@@ -0,0 +1,152 @@
+from collections.abc import Iterable
+from functools import lru_cache
+from math import floor, log2
+
+from abjad import NamedPitch
+
+from .matrix_pitch import MatrixPitch, Tuning, quantize_matrix_pitches
+from .tuning import get_cent_deviation
+
+INDENT = "    "
+CLEF_OCTAVE = 3
+BASE_FREQUENCY_DURATION = "1"
+BASE_MULTIPLE_DURATION = "2"
+DEFAULT_DURATION = "4"
+LOWEST_OCTAVE = 0
+HIGHEST_OCTAVE = 7
+OCTAVE_CLEFS_AND_OTTAVAS = {
+    0: ("bass_15", -2),
+    1: ("bass_8", -1),
+    2: ("bass", 0),
+    3: ("bass", 0),
+    4: ("treble", 0),
+    5: ("treble", 0),
+    6: ("treble^8", 1),
+    7: ("treble^15", 2),
+}
+
+
+def get_quarter_tone(number: float) -> float:
+    number = round(number * 4) / 4
+    quotient = floor(number)
+    remainder = number - quotient
+    if remainder == 0.75:
+        quotient += 1
+    elif remainder == 0.5:
+        return quotient + 0.5
+    return quotient
+
+
+@lru_cache
+def get_pitch_name(number: float) -> str:
+    return NamedPitch(number).name
+
+
+def get_octave(pitch_name: str) -> int:
+    return CLEF_OCTAVE + pitch_name.count("'") - pitch_name.count(",")
+
+
+def clamp_octave(octave: int) -> int:
+    return min(max(octave, LOWEST_OCTAVE), HIGHEST_OCTAVE)
+
+
+def get_clef_and_ottava(octave: int) -> tuple[str | None, int | None]:
+    if not octave:
+        return None, None
+    return OCTAVE_CLEFS_AND_OTTAVAS[clamp_octave(octave)]
+
+
+def get_staff_clef(clef: str | None) -> str:
+    if clef and "bass" in clef:
+        return "bass"
+    return "treble"
+
+
+def get_note_name(
+    matrix_pitch: MatrixPitch, tuning: Tuning
+) -> tuple[str, int]:
+    frequency = matrix_pitch.frequency or 0
+    if not tuning.has_lilypond_names:
+        midi_number = matrix_pitch.get_quantized_midi_number(tuning) or 0
+        semitone, deviation = get_cent_deviation(midi_number)
+        return get_pitch_name(semitone - 60), deviation
+    number = get_quarter_tone(9 + 12 * log2(frequency / 440))
+    if tuning == Tuning.EQUAL_TEMPERED and number % 1:
+        number = int(number)
+    return get_pitch_name(number), 0
+
+
+def get_duration(matrix_pitch: MatrixPitch) -> str:
+    if matrix_pitch.is_base_frequency:
+        return BASE_FREQUENCY_DURATION
+    if matrix_pitch.is_base_multiple:
+        return BASE_MULTIPLE_DURATION
+    return DEFAULT_DURATION
+
+
+def _get_instrument_name_lines(name: str | int) -> list[str]:
+    markup = f"\\markup {{ {name} }}"
+    return [
+        f"\\set Staff.instrumentName = {markup}",
+        f"\\set Staff.shortInstrumentName = {markup}",
+    ]
+
+
+def _get_note_lines(
+    matrix_pitches: Iterable[MatrixPitch], tuning: Tuning, name: str | int
+) -> list[str]:
+    lines = []
+    current_clef: str | None = None
+    current_ottava: int | None = None
+    for index, matrix_pitch in enumerate(matrix_pitches):
+        pitch_name, deviation = get_note_name(matrix_pitch, tuning)
+        clef, ottava = get_clef_and_ottava(get_octave(pitch_name))
+        if not index or clef != current_clef:
+            lines.append(f'\\clef "{get_staff_clef(clef)}"')
+        if ottava is not None and ottava != current_ottava:
+            lines.append(f"\\ottava {ottava}")
+        if not index:
+            lines.extend(_get_instrument_name_lines(name))
+        lines.append(f"{pitch_name}{get_duration(matrix_pitch)}")
+        if deviation:
+            lines.append(f"^ \\markup {{ {deviation:+d} }}")
+        current_clef = get_staff_clef(clef) if not index else clef
+        current_ottava = ottava
+    return lines
+
+
+def _get_chord_lines(
+    matrix_pitches: Iterable[MatrixPitch], tuning: Tuning, name: str | int
+) -> list[str]:
+    pitch_names = " ".join(
+        get_note_name(matrix_pitch, tuning)[0]
+        for matrix_pitch in matrix_pitches
+    )
+    return [
+        *_get_instrument_name_lines(name),
+        f"<{pitch_names}>{DEFAULT_DURATION}",
+    ]
+
+
+def get_reference_score(
+    matrix_pitches: Iterable[MatrixPitch],
+    tuning: Tuning,
+    name: str | int,
+    as_chord=False,
+) -> str:
+    matrix_pitches = [
+        matrix_pitch
+        for matrix_pitch in matrix_pitches
+        if matrix_pitch.frequency
+    ]
+    quantize_matrix_pitches(matrix_pitches, tuning)
+    if as_chord:
+        lines = _get_chord_lines(matrix_pitches, tuning, name)
+    else:
+        lines = _get_note_lines(matrix_pitches, tuning, name)
+    staff_indent = INDENT * 2
+    body = "\n".join(f"{staff_indent}{line}" for line in lines)
+    return (
+        f"\\new Score\n<<\n{INDENT}\\new Staff\n{INDENT}{{\n"
+        f"{body}\n{INDENT}}}\n>>"
+    )
@@ -1,13 +1,19 @@
+from fractions import Fraction
 from pathlib import Path
 
 from cyclopts import App
 
 from agni import __version__
 
+from .corpus import DEFAULT_DATABASE, DEFAULT_LIMIT, DEFAULT_TOLERANCE, Corpus
 from .matrix import Matrix
-from .matrix_pitch import DisplayFormat, PitchType, Tuning
+from .matrix_pitch import DisplayFormat, PitchType, ToneSet, Tuning
+from .matrix_store import write_matrix_store
+from .midi_writer import write_midi_file
 from .notation import Notation
 from .passage import Passage
+from .search import Search
+from .spectrum import FrequencyModulation, HarmonicSeries, RingModulation
 
 agni = App(
     help="agni: Compositional tools inspired by the techniques of Claude Vivier."
@@ -34,22 +40,7 @@ pitch_type: PitchType
     Set the display type for pitches. (If none is provided, the same type as the input pitches is used.)
 """
 
-docstring = f"""Create combination-tone matrix from two pitches.
-
-Parameters
-----------
-bass: str
-    [hertz|midi|lilypond]
-melody: str
-    [hertz|midi|lilypond]
-multiples: Matrix
-    Number of multiples to calculate
-{pitch_type}
-tuning: Tuning
-    Set the tunint to quantize to
-midi_input: False
-    Set the input type (applies to numeric input only)
-display_format: DisplayFormat
+output_options = """display_format: DisplayFormat
     Set the matrix display format
 as_chord: False
     Output matrix as a chord
@@ -65,9 +56,61 @@ display: True
     Set the matrix display format
 play: False
     Play matrix
+min_hz: float
+    Only include pitches at or above this frequency
+max_hz: float
+    Only include pitches at or below this frequency
+limit: int
+    Only include this many of the lowest pitches
+"""
+
+input_options = f"""{pitch_type}
+tuning: Tuning
+    Set the tunint to quantize to
+midi_input: False
+    Set the input type (applies to numeric input only)
+"""
+
+docstring = f"""Create combination-tone matrix from two pitches.
+
+Parameters
+----------
+bass: str
+    [hertz|midi|lilypond]
+melody: str
+    [hertz|midi|lilypond]
+multiples: Matrix
+    Number of multiples to calculate
+{input_options}
+{output_options}
+tone_set: ToneSet
+    Include sum tones, difference tones, or both
 """
 
 
+def output_matrix(
+    matrix: Matrix,
+    display_format: DisplayFormat,
+    tuning: Tuning,
+    as_chord: bool,
+    notate: bool,
+    save: bool,
+    as_ensemble: bool,
+    output_directory: Path,
+    display: bool,
+    play: bool,
+):
+    if display or not notate and not play:
+        matrix.display()
+    if notate:
+        as_chord = as_chord or display_format == DisplayFormat.CHORD
+        Notation(
+            matrix, as_ensemble, tuning, save, as_chord, output_directory
+        ).notate()
+    if play:
+        matrix.play()
+
+
 @agni.command()
 def matrix(
     bass: str,
@@ -85,6 +128,10 @@ def matrix(
     output_directory=Path("examples"),
     display=True,
     play=False,
+    min_hz: float | None = None,
+    max_hz: float | None = None,
+    limit: int | None = None,
+    tone_set=ToneSet.SUM,
 ):
     display_format = get_display_format_from_input(as_chord, display_format)
     matrix = Matrix(
@@ -95,21 +142,217 @@ def matrix(
         tuning,
         display_format,
         midi_input=midi_input,
+        min_hz=min_hz,
+        max_hz=max_hz,
+        limit=limit,
+        tone_set=tone_set,
+    )
+    output_matrix(
+        matrix,
+        display_format,
+        tuning,
+        as_chord,
+        notate,
+        save,
+        as_ensemble,
+        output_directory,
+        display,
+        play,
     )
-    if display or not notate and not play:
-        matrix.display()
-    if notate:
-        as_chord = as_chord or display_format == DisplayFormat.CHORD
-        Notation(
-            matrix, as_ensemble, tuning, save, as_chord, output_directory
-        ).notate()
-    if play:
-        matrix.play()
 
 
 matrix.__doc__ = docstring
 
 
+@agni.command()
+def ring_modulation(
+    carrier: str,
+    modulator: str,
+    /,
+    multiples=Matrix.DEFAULT_MULTIPLES,
+    pitch_type=PitchType.LILYPOND,
+    tuning=Tuning.MICROTONAL,
+    midi_input=False,
+    display_format=DisplayFormat.DEFAULT,
+    as_chord=False,
+    notate=False,
+    save=False,
+    as_ensemble=False,
+    output_directory=Path("examples"),
+    display=True,
+    play=False,
+    min_hz: float | None = None,
+    max_hz: float | None = None,
+    limit: int | None = None,
+):
+    display_format = get_display_format_from_input(as_chord, display_format)
+    spectrum = RingModulation(
+        carrier,
+        modulator,
+        multiples,
+        pitch_type,
+        tuning,
+        display_format,
+        midi_input=midi_input,
+        min_hz=min_hz,
+        max_hz=max_hz,
+        limit=limit,
+    )
+    output_matrix(
+        spectrum,
+        display_format,
+        tuning,
+        as_chord,
+        notate,
+        save,
+        as_ensemble,
+        output_directory,
+        display,
+        play,
+    )
+
+
+ring_modulation.__doc__ = f"""Create ring-modulation spectrum from two pitches.
+
+Parameters
+----------
+carrier: str
+    [hertz|midi|lilypond]
+modulator: str
+    [hertz|midi|lilypond]
+multiples: Matrix
+    Number of multiples of each input to combine
+{input_options}
+{output_options}
+"""
+
+
+@agni.command()
+def frequency_modulation(
+    carrier: str,
+    modulator: str,
+    /,
+    multiples=Matrix.DEFAULT_MULTIPLES,
+    pitch_type=PitchType.LILYPOND,
+    tuning=Tuning.MICROTONAL,
+    midi_input=False,
+    display_format=DisplayFormat.DEFAULT,
+    as_chord=False,
+    notate=False,
+    save=False,
+    as_ensemble=False,
+    output_directory=Path("examples"),
+    display=True,
+    play=False,
+    min_hz: float | None = None,
+    max_hz: float | None = None,
+    limit: int | None = None,
+):
+    display_format = get_display_format_from_input(as_chord, display_format)
+    spectrum = FrequencyModulation(
+        carrier,
+        modulator,
+        multiples,
+        pitch_type,
+        tuning,
+        display_format,
+        midi_input=midi_input,
+        min_hz=min_hz,
+        max_hz=max_hz,
+        limit=limit,
+    )
+    output_matrix(
+        spectrum,
+        display_format,
+        tuning,
+        as_chord,
+        notate,
+        save,
+        as_ensemble,
+        output_directory,
+        display,
+        play,
+    )
+
+
+frequency_modulation.__doc__ = f"""Create frequency-modulation sidebands from two pitches.
+
+Parameters
+----------
+carrier: str
+    [hertz|midi|lilypond]
+modulator: str
+    [hertz|midi|lilypond]
+multiples: Matrix
+    Number of sideband pairs to calculate
+{input_options}
+{output_options}
+"""
+
+
+@agni.command()
+def series(
+    fundamental: str,
+    /,
+    shift=0.0,
+    partials=16,
+    pitch_type=PitchType.LILYPOND,
+    tuning=Tuning.MICROTONAL,
+    midi_input=False,
+    display_format=DisplayFormat.DEFAULT,
+    as_chord=False,
+    notate=False,
+    save=False,
+    as_ensemble=False,
+    output_directory=Path("examples"),
+    display=True,
+    play=False,
+    min_hz: float | None = None,
+    max_hz: float | None = None,
+    limit: int | None = None,
+):
+    display_format = get_display_format_from_input(as_chord, display_format)
+    spectrum = HarmonicSeries(
+        fundamental,
+        shift,
+        partials,
+        pitch_type,
+        tuning,
+        display_format,
+        midi_input=midi_input,
+        min_hz=min_hz,
+        max_hz=max_hz,
+        limit=limit,
+    )
+    output_matrix(
+        spectrum,
+        display_format,
+        tuning,
+        as_chord,
+        notate,
+        save,
+        as_ensemble,
+        output_directory,
+        display,
+        play,
+    )
+
+
+series.__doc__ = f"""Create harmonic or frequency-shifted series from a fundamental.
+
+Parameters
+----------
+fundamental: str
+    [hertz|midi|lilypond]
+shift: float
+    Hertz to add to every partial (nonzero values produce an inharmonic series)
+partials: int
+    Number of partials to calculate
+{input_options}
+{output_options}
+"""
+
+
 @agni.command()
 def passage(
     input_file: Path,
@@ -126,13 +369,27 @@ def passage(
     output_directory=Path("examples"),
     full_score=False,
     display=True,
+    fast_input=True,
+    unordered=False,
+    counts=False,
+    tone_set=ToneSet.SUM,
+    voice_leading=False,
+    fast_output=True,
+    export_midi: Path | None = None,
+    bass_track: int | None = None,
+    melody_track: int | None = None,
+    export_matrices: Path | None = None,
+    engraving_workers: int = 1,
+    bars: tuple[int, int] | None = None,
+    from_: Fraction | None = None,
+    to: Fraction | None = None,
 ):
     """Create combination-tone matrices for a two-voice passage.
 
     Parameters
     ----------
     input_file: Path
-        LilyPond input file
+        LilyPond, MIDI or MusicXML input file
     multiples: Matrix
         Number of multiples to calculate
     pitch_type: PitchType
@@ -159,6 +416,34 @@ def passage(
         Output matrices as an ensemble score using the input rhythms
     display: True
         Don't show the output in the terminal
+    fast_input: True
+        Read the input staves with the lightweight LilyPond reader, falling back to the full parser for unsupported input
+    unordered: False
+        Treat matrices with the bass and melody swapped as duplicates
+    counts: False
+        Show how many times each matrix occurs in the passage
+    tone_set: ToneSet
+        Include sum tones, difference tones, or both
+    voice_leading: False
+        Assign ensemble notes to staves by the smallest total movement between successive matrices
+    fast_output: True
+        Write reference scores directly as LilyPond source instead of building Abjad scores
+    export_midi: Path
+        Write the passage matrices to a multitrack MIDI file, one track per instrument
+    bass_track: int
+        For MIDI or MusicXML input, the MIDI track number (counting from 0, including any conductor track) or MusicXML part index to use as the bass (defaults to one named "bass" or the lower of the first two)
+    melody_track: int
+        For MIDI or MusicXML input, the MIDI track number (counting from 0, including any conductor track) or MusicXML part index to use as the melody (defaults to one named "melody" or the higher of the first two)
+    export_matrices: Path
+        Write the pitches of every matrix to a binary columnar file for numeric analysis
+    engraving_workers: int
+        Number of LilyPond processes to engrave the score with, building each chunk of matrices while earlier chunks are engraved (requires Ghostscript to join the chunks)
+    bars: tuple[int, int]
+        Analyze only the bars from the first to the last number given, inclusive
+    from_: Fraction
+        Analyze only from this offset, in whole notes from the start of the passage (e.g. 15/4)
+    to: Fraction
+        Analyze only up to this offset, in whole notes from the start of the passage
     """
 
     message = ""
@@ -166,6 +451,15 @@ def passage(
     if not input_file.exists():
         message = f"{input_file} does not exist"
         exit = True
+    elif bars and (from_ is not None or to is not None):
+        message = "--bars cannot be combined with --from or --to"
+        exit = True
+    elif bars and bars[0] > bars[1]:
+        message = "--bars must start before it ends"
+        exit = True
+    elif from_ is not None and to is not None and from_ >= to:
+        message = "--from must be before --to"
+        exit = True
     if exit:
         return message
     display_format = get_display_format_from_input(as_chord, display_format)
@@ -181,9 +475,26 @@ def passage(
         display_format,
         as_set,
         adjacent_duplicates,
+        fast_input,
+        unordered,
+        counts,
+        tone_set,
+        bass_track,
+        melody_track,
+        bars=bars,
+        start=from_,
+        end=to,
     )
-    if display or not notate:
+    if display or not notate and not export_midi and not export_matrices:
         passage.display()
+    if export_midi:
+        write_midi_file(
+            passage.matrix_leaves, export_midi, tuning, passage.title
+        )
+        print(f"MIDI file saved to: {export_midi}")
+    if export_matrices:
+        write_matrix_store(passage.matrix_leaves, export_matrices)
+        print(f"Matrices saved to: {export_matrices}")
     if notate:
         Notation(
             passage,
@@ -193,4 +504,147 @@ def passage(
             as_chord,
             output_directory,
             full_score,
+            voice_leading,
+            fast_output,
+            engraving_workers,
         ).notate()
+
+
+@agni.command()
+def index(
+    *input_files: Path,
+    database=DEFAULT_DATABASE,
+    multiples=Matrix.DEFAULT_MULTIPLES,
+    tone_set=ToneSet.SUM,
+    fast_input=True,
+    bass_track: int | None = None,
+    melody_track: int | None = None,
+):
+    """Store the matrices of passages in a database for later queries.
+
+    Parameters
+    ----------
+    input_files: Path
+        LilyPond, MIDI or MusicXML input files
+    database: Path
+        SQLite database in which to store the matrices
+    multiples: Matrix
+        Number of multiples to calculate
+    tone_set: ToneSet
+        Include sum tones, difference tones, or both
+    fast_input: True
+        Read the input staves with the lightweight LilyPond reader, falling back to the full parser for unsupported input
+    bass_track: int
+        For MIDI or MusicXML input, the MIDI track number (counting from 0, including any conductor track) or MusicXML part index to use as the bass
+    melody_track: int
+        For MIDI or MusicXML input, the MIDI track number (counting from 0, including any conductor track) or MusicXML part index to use as the melody
+    """
+
+    with Corpus(database) as corpus:
+        for input_file in input_files:
+            if not input_file.exists():
+                print(f"{input_file} does not exist")
+                continue
+            passage = Passage(
+                input_file,
+                multiples,
+                PitchType.LILYPOND,
+                Tuning.MICROTONAL,
+                DisplayFormat.TABLE,
+                False,
+                True,
+                fast_input,
+                tone_set=tone_set,
+                bass_track=bass_track,
+                melody_track=melody_track,
+            )
+            leaves = corpus.add(
+                input_file,
+                passage.title,
+                passage.composer,
+                multiples,
+                tone_set,
+                passage.matrix_leaves,
+            )
+            print(f"Indexed {leaves} leaves from {input_file}")
+
+
+@agni.command()
+def query(
+    pitch: str,
+    /,
+    database=DEFAULT_DATABASE,
+    tolerance: float = DEFAULT_TOLERANCE,
+    limit=DEFAULT_LIMIT,
+):
+    """Find indexed passages whose matrices contain a pitch.
+
+    Parameters
+    ----------
+    pitch: str
+        [hertz|lilypond] pitch to find
+    database: Path
+        SQLite database in which the matrices are stored
+    tolerance: float
+        Maximum distance in cents for a matrix pitch to match
+    limit: int
+        Number of passages to show
+    """
+
+    with Corpus(database) as corpus:
+        corpus.display_query(pitch, tolerance, limit)
+
+
+@agni.command()
+def search(
+    *target: str,
+    multiples=Matrix.DEFAULT_MULTIPLES,
+    bass_low="c,",
+    bass_high="c'",
+    melody_low="c'",
+    melody_high="c'''",
+    step: float = Search.DEFAULT_STEP,
+    tolerance: float = Search.DEFAULT_TOLERANCE,
+    limit=Search.DEFAULT_LIMIT,
+    tone_set=ToneSet.SUM,
+    workers: int | None = None,
+):
+    """Find bass and melody pairs whose matrix best matches a target chord.
+
+    Parameters
+    ----------
+    target: str
+        [hertz|lilypond] pitches of the target chord
+    multiples: Matrix
+        Number of multiples to calculate
+    bass_low: str
+        Lowest candidate bass pitch
+    bass_high: str
+        Highest candidate bass pitch
+    melody_low: str
+        Lowest candidate melody pitch
+    melody_high: str
+        Highest candidate melody pitch
+    step: float
+        Distance in cents between candidate pitches
+    tolerance: float
+        Maximum distance in cents for a matrix pitch to match a target pitch
+    limit: int
+        Number of candidates to show
+    tone_set: ToneSet
+        Include sum tones, difference tones, or both
+    workers: int
+        Number of processes to search with (defaults to searching in this process)
+    """
+
+    Search(
+        target,
+        multiples,
+        (bass_low, bass_high),
+        (melody_low, melody_high),
+        step,
+        tolerance,
+        limit,
+        tone_set,
+        workers,
+    ).display()
@@ -1,4 +1,8 @@
-from functools import cached_property, lru_cache
+from collections.abc import Iterable, Iterator, Sequence
+from functools import lru_cache
+from heapq import heapify, heappop, heappush
+from itertools import islice
+from math import ceil, floor, log2
 from time import sleep
 from typing import Any
 
@@ -13,18 +17,24 @@ from rich.theme import Theme
 from supriya import Server
 from supriya.patterns import EventPattern, SequencePattern
 
-from .helpers import stylize
+from .helpers import atomic_cached_property, stylize
 from .matrix_pitch import (
     DisplayColor,
     DisplayFormat,
     MatrixPitch,
     PitchType,
+    ToneSet,
     Tuning,
+    quantize_matrix_pitches,
 )
+from .tuning import CENTS_PER_OCTAVE, get_pitch_frequency
 
 
 class Matrix:
     DEFAULT_MULTIPLES = 4
+    TITLE = "Combination-Tone Matrix"
+    INPUT_NAMES = ("bass", "melody")
+    KEY_CENTS = 1
 
     def __init__(
         self,
@@ -35,6 +45,10 @@ class Matrix:
         tuning: Tuning = Tuning.MICROTONAL,
         display_format: DisplayFormat = DisplayFormat.TABLE,
         midi_input=False,
+        min_hz: float | None = None,
+        max_hz: float | None = None,
+        limit: int | None = None,
+        tone_set: ToneSet = ToneSet.SUM,
     ):
         if not multiples:
             multiples = self.DEFAULT_MULTIPLES
@@ -43,16 +57,20 @@ class Matrix:
         self._pitch_type = self._get_pitch_type(bass, midi_input, pitch_type)
         self._tuning = tuning
         self._display_format = display_format
-        self.bass = self._get_frequency_from_input(bass)
-        self.melody = self._get_frequency_from_input(melody)
+        self.bass = get_pitch_frequency(bass, self._midi_input)
+        self.melody = get_pitch_frequency(melody, self._midi_input)
+        self._min_hz = min_hz
+        self._max_hz = max_hz
+        self._limit = limit
+        self._tone_set = tone_set
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, type(self)):
             return NotImplemented
-        return other.bass == self.bass and other.melody == self.melody
+        return other.key == self.key
 
     def __hash__(self) -> int:
-        return hash((self.bass, self.melody))
+        return hash(self.key)
 
     def __repr__(self) -> str:
         return f"Matrix({self.bass}, {self.melody})"
@@ -73,45 +91,234 @@ class Matrix:
             return PitchType.HERTZ
         return PitchType.LILYPOND
 
-    @staticmethod
+    @classmethod
     @lru_cache
-    def _convert_midi_to_hertz(midi_number: float) -> float:
-        return (2 ** ((midi_number - 69) / 12)) * 440
-
-    def _get_frequency_from_input(self, pitch: str | NamedPitch) -> float:
-        if isinstance(pitch, NamedPitch):
-            return pitch.hertz
-        try:
-            frequency = float(pitch)
-            if self._midi_input:
-                return self._convert_midi_to_hertz(frequency)
-            return frequency
-        except ValueError:
-            return NamedPitch(pitch).hertz
+    def _get_quantized_cents(cls, frequency: float) -> int | None:
+        if frequency <= 0:
+            return None
+        cents = CENTS_PER_OCTAVE * log2(frequency)
+        return round(cents / cls.KEY_CENTS)
+
+    @atomic_cached_property
+    def key(self) -> tuple[int | None, int | None]:
+        return (
+            self._get_quantized_cents(self.bass),
+            self._get_quantized_cents(self.melody),
+        )
+
+    @atomic_cached_property
+    def unordered_key(self) -> tuple[int | None, int | None]:
+        bass, melody = self.key
+        if bass is None or melody is None or bass <= melody:
+            return bass, melody
+        return melody, bass
+
+    def get_key(self, unordered=False) -> tuple[int | None, int | None]:
+        if unordered:
+            return self.unordered_key
+        return self.key
+
+    @atomic_cached_property
+    def _bass_multipliers(self) -> Sequence[int]:
+        return self._tone_set.get_bass_multipliers(len(self._multiples))
+
+    @atomic_cached_property
+    def _melody_multipliers(self) -> range:
+        return self._multiples
 
     @property
+    def _instrument_name_multiples(self) -> int:
+        return len(self._multiples)
+
+    def _get_matrix_pitch(
+        self, bass_multiplier: int, melody_multiplier: int
+    ) -> MatrixPitch:
+        return MatrixPitch(
+            self.bass,
+            self.melody,
+            bass_multiplier,
+            melody_multiplier,
+            self.INPUT_NAMES,
+            self._instrument_name_multiples,
+        )
+
+    @atomic_cached_property
+    def grid(self) -> list[list[MatrixPitch]]:
+        return [
+            [
+                self._get_matrix_pitch(bass_multiplier, melody_multiplier)
+                for melody_multiplier in self._melody_multipliers
+            ]
+            for bass_multiplier in self._bass_multipliers
+        ]
+
+    def get_pitch(
+        self, bass_multiplier: int, melody_multiplier: int
+    ) -> MatrixPitch:
+        row = self._bass_multipliers.index(bass_multiplier)
+        column = self._melody_multipliers.index(melody_multiplier)
+        return self.grid[row][column]
+
+    @atomic_cached_property
     def pitches(self) -> list[MatrixPitch]:
-        frequencies = []
-        multiples = self._multiples
-        for bass_multiplier in multiples:
-            for melody_multiplier in multiples:
-                matrix_pitch = MatrixPitch(
-                    self.bass,
-                    self.melody,
-                    bass_multiplier,
-                    melody_multiplier,
+        return [matrix_pitch for row in self.grid for matrix_pitch in row]
+
+    @property
+    def is_query(self) -> bool:
+        return any(
+            value is not None
+            for value in (self._min_hz, self._max_hz, self._limit)
+        )
+
+    def _get_melody_multiplier_runs(
+        self,
+        offset: float,
+        min_hz: float | None,
+        max_hz: float | None,
+    ) -> tuple[range, range]:
+        melody = self.melody
+        columns = self._melody_multipliers
+        if len(columns) == 1 or not melody:
+            return columns, range(0)
+        first_positive = min(
+            max(columns.start, ceil(-offset / melody)), columns.stop
+        )
+        ascending_start = first_positive
+        ascending_stop = columns.stop
+        descending_start = first_positive - 1
+        descending_stop = columns.start - 1
+        if min_hz is not None:
+            ascending_start = max(
+                ascending_start, ceil((min_hz - offset) / melody) - 1
+            )
+            descending_start = min(
+                descending_start, floor((-min_hz - offset) / melody) + 1
+            )
+        if max_hz is not None:
+            ascending_stop = min(
+                ascending_stop, floor((max_hz - offset) / melody) + 2
+            )
+            descending_stop = max(
+                descending_stop, ceil((-max_hz - offset) / melody) - 2
+            )
+        return (
+            range(ascending_start, max(ascending_start, ascending_stop)),
+            range(
+                descending_start, min(descending_start, descending_stop), -1
+            ),
+        )
+
+    def _get_lowest_melody_offset(self) -> float:
+        melody = self.melody
+        columns = self._melody_multipliers
+        if not columns:
+            return 0
+        return min(0, melody * columns[0], melody * columns[-1])
+
+    def _get_query_candidates(
+        self, min_hz: float | None, max_hz: float | None
+    ) -> Iterator[MatrixPitch]:
+        bass = self.bass
+        melody = self.melody
+        heap = []
+        lowest_melody_offset = self._get_lowest_melody_offset()
+        for row, bass_multiplier in enumerate(self._bass_multipliers):
+            offset = bass * bass_multiplier
+            if max_hz is not None and offset + lowest_melody_offset > max_hz:
+                continue
+            runs = self._get_melody_multiplier_runs(offset, min_hz, max_hz)
+            for run in runs:
+                if not run:
+                    continue
+                melody_multiplier = run.start
+                heap.append(
+                    (
+                        abs(offset + melody * melody_multiplier),
+                        bass_multiplier < 0 or melody_multiplier < 0,
+                        row,
+                        melody_multiplier,
+                        bass_multiplier,
+                        run,
+                    )
+                )
+        heapify(heap)
+        while heap:
+            (
+                frequency,
+                _,
+                row,
+                melody_multiplier,
+                bass_multiplier,
+                run,
+            ) = heappop(heap)
+            if max_hz is not None and frequency > max_hz:
+                return
+            next_melody_multiplier = melody_multiplier + run.step
+            if next_melody_multiplier in run:
+                next_frequency = abs(
+                    bass * bass_multiplier + melody * next_melody_multiplier
                 )
-                frequencies.append(matrix_pitch)
-        return frequencies
+                heappush(
+                    heap,
+                    (
+                        next_frequency,
+                        bass_multiplier < 0 or next_melody_multiplier < 0,
+                        row,
+                        next_melody_multiplier,
+                        bass_multiplier,
+                        run,
+                    ),
+                )
+            if min_hz is not None and frequency < min_hz:
+                continue
+            yield self._get_matrix_pitch(bass_multiplier, melody_multiplier)
 
-    @cached_property
-    def sorted_pitches(self) -> list[MatrixPitch]:
-        frequencies = sorted(
-            self.pitches, key=MatrixPitch.get_sortable_frequency
+    @property
+    def _deduplicate(self) -> bool:
+        return self._tone_set == ToneSet.ALL
+
+    def _get_unique_pitches(
+        self, pitches: Iterable[MatrixPitch]
+    ) -> Iterator[MatrixPitch]:
+        deduplicate = self._deduplicate
+        keys = set()
+        for pitch in pitches:
+            frequency = pitch.frequency
+            if not frequency:
+                continue
+            if deduplicate:
+                key = self._get_quantized_cents(frequency)
+                if pitch.is_signed and key in keys:
+                    continue
+                keys.add(key)
+            yield pitch
+
+    def query(
+        self,
+        min_hz: float | None = None,
+        max_hz: float | None = None,
+        limit: int | None = None,
+    ) -> Iterator[MatrixPitch]:
+        pitches = self._get_unique_pitches(
+            self._get_query_candidates(min_hz, max_hz)
         )
-        return [frequency for frequency in frequencies if frequency.frequency]
+        return islice(pitches, limit)
 
-    @cached_property
+    @staticmethod
+    def _get_sortable_pitch(matrix_pitch: MatrixPitch) -> tuple[float, bool]:
+        return (
+            MatrixPitch.get_sortable_frequency(matrix_pitch),
+            matrix_pitch.is_signed,
+        )
+
+    @atomic_cached_property
+    def sorted_pitches(self) -> list[MatrixPitch]:
+        if self.is_query:
+            return list(self.query(self._min_hz, self._max_hz, self._limit))
+        frequencies = sorted(self.pitches, key=self._get_sortable_pitch)
+        return list(self._get_unique_pitches(frequencies))
+
+    @atomic_cached_property
     def sorted_frequencies(self) -> list[float]:
         return [
             frequency.frequency
@@ -119,8 +326,9 @@ class Matrix:
             if frequency.frequency
         ]
 
-    @property
+    @atomic_cached_property
     def display_pitches(self) -> list[str]:
+        quantize_matrix_pitches(self.sorted_pitches, self._tuning)
         return [
             frequency.get_display(
                 self._pitch_type, self._tuning, self._display_format
@@ -136,14 +344,15 @@ class Matrix:
             if frequency.frequency and not frequency.is_base_frequency
         ]
 
-    @staticmethod
-    def _get_multiplier_label(multiplier: int, pitch: str) -> str:
+    @classmethod
+    def _get_multiplier_label(cls, multiplier: int, pitch: str) -> str:
         multiplier_label = f"{multiplier} x {pitch}"
+        multiplier = abs(multiplier)
         if multiplier == 1:
             color = DisplayColor.BASE_FREQUENCY
             bold = True
         elif multiplier > 1:
-            if pitch == "bass":
+            if pitch == cls.INPUT_NAMES[0]:
                 color = DisplayColor.BASS_MULTIPLE
             else:
                 color = DisplayColor.MELODY_MULTIPLE
@@ -153,9 +362,13 @@ class Matrix:
             bold = False
         return stylize(multiplier_label, color, bold=bold)
 
+    @property
+    def title(self) -> str:
+        return self.TITLE
+
     def _get_display_title(self) -> str:
         pitch_type = self._pitch_type
-        title = f"Combination-Tone Matrix ({pitch_type.title()})"
+        title = f"{self.title} ({pitch_type.title()})"
         return stylize(title, "cyan")
 
     def _get_display_table(self) -> Table:
@@ -164,10 +377,7 @@ class Matrix:
 
     def _display_chord(self):
         table = self._get_display_table()
-        for frequency in reversed(self.sorted_pitches):
-            frequency_display = frequency.get_display(
-                self._pitch_type, self._tuning, self._display_format
-            )
+        for frequency_display in reversed(self.display_pitches):
             table.add_row(frequency_display)
         Console().print(table)
 
@@ -191,29 +401,32 @@ class Matrix:
 
     def _display_table(self):
         table = self._get_display_table()
+        bass_name, melody_name = self.INPUT_NAMES
         melody_header = [""] + [
-            self._get_multiplier_label(multiplier, "melody")
-            for multiplier in self._multiples
+            self._get_multiplier_label(multiplier, melody_name)
+            for multiplier in self._melody_multipliers
         ]
         table.add_row(*melody_header)
-        for multiple in self._multiples:
+        quantize_matrix_pitches(self.pitches, self._tuning)
+        for multiple, row in zip(self._bass_multipliers, self.grid):
             display_frequencies = [
                 frequency.get_display(
                     self._pitch_type,
                     self._tuning,
                     self._display_format,
                 )
-                for frequency in self.pitches
-                if frequency.bass_multiplier == multiple
+                for frequency in row
             ]
-            bass_label = [self._get_multiplier_label(multiple, "bass")]
+            bass_label = [self._get_multiplier_label(multiple, bass_name)]
             formatted_row = bass_label + display_frequencies
             table.add_row(*formatted_row)
         Console().print(table)
 
     def display(self):
         display_format = self._display_format
-        if display_format == DisplayFormat.CHORD:
+        if display_format == DisplayFormat.CHORD or (
+            display_format == DisplayFormat.TABLE and self.is_query
+        ):
             self._display_chord()
         elif display_format == DisplayFormat.LIST:
             self._display_list()
@@ -1,11 +1,17 @@
 from dataclasses import dataclass, field
-from functools import cached_property
+from fractions import Fraction
 
 from abjad import Duration, NamedPitch, Tuplet
 
-from .helpers import get_instrument_name
+from .helpers import atomic_cached_property, get_instrument_names
 from .matrix import Matrix
-from .matrix_pitch import DisplayFormat, MatrixPitch, PitchType, Tuning
+from .matrix_pitch import (
+    DisplayFormat,
+    MatrixPitch,
+    PitchType,
+    ToneSet,
+    Tuning,
+)
 
 
 def get_default_duration() -> Duration:
@@ -25,8 +31,9 @@ class MatrixLeaf:
     _pitch_type: PitchType = PitchType.LILYPOND
     _tuning: Tuning = Tuning.MICROTONAL
     _display_format: DisplayFormat = DisplayFormat.TABLE
+    _tone_set: ToneSet = ToneSet.SUM
 
-    @property
+    @atomic_cached_property
     def matrix(self) -> Matrix | None:
         if not self._bass or not self._melody:
             return None
@@ -37,39 +44,36 @@ class MatrixLeaf:
             self._pitch_type,
             self._tuning,
             self._display_format,
+            tone_set=self._tone_set,
         )
 
+    @property
+    def sounding_duration(self) -> Duration | None:
+        duration = self.duration
+        tuplet = self.tuplet
+        if not duration or not tuplet:
+            return duration
+        numerator, denominator = tuplet.multiplier
+        return Duration(duration * Fraction(numerator, denominator))
+
     @property
     def contains_pitches(self) -> bool:
         return all([self._bass, self._melody])
 
-    @cached_property
+    @atomic_cached_property
     def generated_pitches(self) -> list[MatrixPitch]:
         bass = self._bass
         melody = self._melody
         duration = self.duration
         if not bass or not melody or not duration:
             return []
-        matrix = Matrix(bass.name, melody.name, self._multiples)
+        matrix = Matrix(
+            bass.name, melody.name, self._multiples, tone_set=self._tone_set
+        )
         return matrix.sorted_generated_pitches
 
-    @cached_property
-    def instrument_names(self) -> list[str]:
-        multiples = range(self._multiples)
-        staff_names = []
-        for melody_multiple in multiples:
-            for bass_multiple in multiples:
-                if (
-                    bass_multiple == 0
-                    and melody_multiple == 0
-                    or bass_multiple == 1
-                    and melody_multiple == 0
-                    or bass_multiple == 0
-                    and melody_multiple == 1
-                ):
-                    continue
-                instrument_name = get_instrument_name(
-                    bass_multiple, melody_multiple
-                )
-                staff_names.append(instrument_name)
-        return staff_names
+    @property
+    def instrument_names(self) -> tuple[str, ...]:
+        multiples = self._multiples
+        bass_multiples = self._tone_set.get_bass_multipliers(multiples)
+        return get_instrument_names(multiples, bass_multiples)
@@ -1,11 +1,17 @@
+from collections.abc import Iterable
 from enum import StrEnum, auto
-from functools import cached_property
-from math import log
 from typing import Any
 
 from abjad import Duration, NamedPitch, Note, NumberedPitch, Tie, attach
 
-from .helpers import get_instrument_name, stylize
+from .helpers import atomic_cached_property, get_instrument_name, stylize
+from .tuning import (
+    Tuning,
+    get_cent_deviation,
+    get_frequency,
+    get_midi_number,
+    get_quantizer,
+)
 
 
 class PitchType(StrEnum):
@@ -15,11 +21,6 @@ class PitchType(StrEnum):
     LILYPOND = auto()
 
 
-class Tuning(StrEnum):
-    EQUAL_TEMPERED = auto()
-    MICROTONAL = auto()
-
-
 class DisplayFormat(StrEnum):
     DEFAULT = auto()
     CHORD = auto()
@@ -28,6 +29,19 @@ class DisplayFormat(StrEnum):
     TABLE = auto()
 
 
+class ToneSet(StrEnum):
+    SUM = auto()
+    DIFFERENCE = auto()
+    ALL = auto()
+
+    def get_bass_multipliers(self, multiples: int) -> range:
+        if self == ToneSet.DIFFERENCE:
+            return range(0, -multiples, -1)
+        if self == ToneSet.ALL:
+            return range(1 - multiples, multiples)
+        return range(multiples)
+
+
 class DisplayColor(StrEnum):
     BASE_FREQUENCY = "bright_white"
     BASS_MULTIPLE = "dark_orange3"
@@ -42,12 +56,19 @@ class MatrixPitch:
         melody: float,
         bass_multiplier: int,
         melody_multiplier: int,
+        input_names: tuple[str, str] = ("bass", "melody"),
+        multiples: int | None = None,
     ):
         bass_frequency = bass * bass_multiplier
         melody_frequency = melody * melody_multiplier
         self.bass_multiplier = bass_multiplier
         self._melody_multiplier = melody_multiplier
-        frequency = bass_frequency + melody_frequency
+        self._bass_frequency = bass_frequency
+        self._melody_frequency = melody_frequency
+        self._input_names = input_names
+        self._multiples = multiples
+        self._quantized_midi_numbers: dict[Tuning, float] = {}
+        frequency = abs(bass_frequency + melody_frequency)
         self.frequency = frequency or None
 
     def __repr__(self) -> str:
@@ -66,45 +87,85 @@ class MatrixPitch:
             and other.frequency == self.frequency
         )
 
+    @property
+    def melody_multiplier(self) -> int:
+        return self._melody_multiplier
+
     @staticmethod
     def get_sortable_frequency(matrix_pitch: "MatrixPitch") -> float:
         return matrix_pitch.frequency or 0
 
-    @cached_property
+    @atomic_cached_property
+    def is_difference_tone(self) -> bool:
+        return self._bass_frequency * self._melody_frequency < 0
+
+    @atomic_cached_property
+    def is_signed(self) -> bool:
+        return self.bass_multiplier < 0 or self._melody_multiplier < 0
+
+    @atomic_cached_property
     def _is_bass_frequency(self) -> bool:
-        if self.bass_multiplier == 1 and self._melody_multiplier == 0:
+        if abs(self.bass_multiplier) == 1 and self._melody_multiplier == 0:
             return True
         return False
 
-    @cached_property
+    @atomic_cached_property
     def _is_melody_frequency(self) -> bool:
-        if self.bass_multiplier == 0 and self._melody_multiplier == 1:
+        if self.bass_multiplier == 0 and abs(self._melody_multiplier) == 1:
             return True
         return False
 
-    @cached_property
+    @atomic_cached_property
     def is_base_frequency(self) -> bool:
         return self._is_bass_frequency or self._is_melody_frequency
 
-    @cached_property
+    @atomic_cached_property
     def _is_bass_multiple(self) -> bool:
-        if self.bass_multiplier > 1 and self._melody_multiplier == 0:
+        if abs(self.bass_multiplier) > 1 and self._melody_multiplier == 0:
             return True
         return False
 
-    @cached_property
+    @atomic_cached_property
     def _is_melody_multiple(self) -> bool:
-        if self._melody_multiplier > 1 and self.bass_multiplier == 0:
+        if abs(self._melody_multiplier) > 1 and self.bass_multiplier == 0:
             return True
         return False
 
-    @cached_property
+    @atomic_cached_property
     def is_base_multiple(self) -> bool:
         return self._is_bass_multiple or self._is_melody_multiple
 
+    @atomic_cached_property
+    def midi_number(self) -> float | None:
+        if not self.frequency:
+            return None
+        return get_midi_number(self.frequency)
+
+    def get_quantized_midi_number(self, tuning: Tuning) -> float | None:
+        if self.midi_number is None:
+            return None
+        if tuning not in self._quantized_midi_numbers:
+            quantize_matrix_pitches((self,), tuning)
+        return self._quantized_midi_numbers[tuning]
+
+    def _get_cent_deviation_display_pitch(self, tuning: Tuning) -> str:
+        midi_number = self.get_quantized_midi_number(tuning)
+        if midi_number is None:
+            return ""
+        semitone, deviation = get_cent_deviation(midi_number)
+        pitch_name = NamedPitch(NumberedPitch(semitone - 60).name).name
+        if deviation:
+            pitch_name = f"{pitch_name}{deviation:+d}"
+        label = get_quantizer(tuning).get_label(midi_number)
+        if label:
+            pitch_name = f"{pitch_name} ({label})"
+        return pitch_name
+
     def _get_lilypond_display_pitch(self, tuning: Tuning) -> str:
         if not self.frequency:
             return ""
+        if not tuning.has_lilypond_names:
+            return self._get_cent_deviation_display_pitch(tuning)
         named_pitch = NamedPitch.from_hertz(self.frequency)
         if tuning == Tuning.EQUAL_TEMPERED:
             pitch_number = named_pitch.number
@@ -117,23 +178,23 @@ class MatrixPitch:
     def _get_midi_display_pitch(self, tuning: Tuning) -> str:
         if not self.frequency:
             return ""
-        frequency = self.frequency / 440
-        logarithm = log(frequency, 2)
-        midi_number = 12 * logarithm + 69
+        midi_number = self.get_quantized_midi_number(tuning)
+        if tuning == Tuning.EQUAL_TEMPERED:
+            return str(round(midi_number or 0))
         if tuning == Tuning.MICROTONAL:
-            midi_number = round(midi_number * 2) / 2
-        else:
-            midi_number = round(midi_number)
-        return str(midi_number)
+            return str(midi_number)
+        return str(round(midi_number or 0, 2))
 
     def _get_hertz_display_pitch(self, tuning: Tuning) -> str:
         if not self.frequency:
             return ""
+        if tuning == Tuning.EQUAL_TEMPERED:
+            return f"{round(self.frequency):,}"
         if tuning == Tuning.MICROTONAL:
-            decimals = 2
-        else:
-            decimals = None
-        return f"{round(self.frequency, decimals):,}"
+            return f"{round(self.frequency, 2):,}"
+        midi_number = self.get_quantized_midi_number(tuning) or 0
+        frequency = get_frequency(midi_number)
+        return f"{round(frequency, 2):,}"
 
     @staticmethod
     def _stylize_base_frequency(text: str) -> str:
@@ -148,14 +209,18 @@ class MatrixPitch:
         return stylize(text, DisplayColor.MELODY_MULTIPLE)
 
     def _get_bass_label(self, abbreviated=False) -> str:
+        bass_multiplier = abs(self.bass_multiplier)
+        bass_name = self._input_names[0]
         if abbreviated:
-            return f"{self.bass_multiplier}B"
-        return f"({self.bass_multiplier} x bass)"
+            return f"{bass_multiplier}{bass_name[0].upper()}"
+        return f"({bass_multiplier} x {bass_name})"
 
     def _get_melody_label(self, abbreviated=False) -> str:
+        melody_multiplier = abs(self._melody_multiplier)
+        melody_name = self._input_names[1]
         if abbreviated:
-            return f"{self._melody_multiplier}M"
-        return f"({self._melody_multiplier} x melody)"
+            return f"{melody_multiplier}{melody_name[0].upper()}"
+        return f"({melody_multiplier} x {melody_name})"
 
     def _get_display_label(self, display_format=DisplayFormat.CHORD) -> str:
         if display_format == DisplayFormat.MELODY:
@@ -174,7 +239,12 @@ class MatrixPitch:
             melody_multiplier = self._stylize_melody_multiple(
                 melody_multiplier
             )
-        label = f"{bass_multiplier} + {melody_multiplier}"
+        if self.is_difference_tone and self._bass_frequency < 0:
+            label = f"{melody_multiplier} - {bass_multiplier}"
+        elif self.is_difference_tone:
+            label = f"{bass_multiplier} - {melody_multiplier}"
+        else:
+            label = f"{bass_multiplier} + {melody_multiplier}"
         if display_format == DisplayFormat.CHORD:
             label = f"{label} = "
         return stylize(label, DisplayColor.LABEL)
@@ -212,8 +282,10 @@ class MatrixPitch:
 
     @property
     def instrument_name(self) -> str:
+        if self._multiples is None:
+            raise ValueError("instrument names need the matrix multiples")
         return get_instrument_name(
-            self.bass_multiplier, self._melody_multiplier
+            self.bass_multiplier, self._melody_multiplier, self._multiples
         )
 
     def get_note(self, duration: Duration, tie: bool) -> Note | None:
@@ -224,3 +296,19 @@ class MatrixPitch:
         if tie:
             attach(Tie(), note)
         return note
+
+
+def quantize_matrix_pitches(
+    matrix_pitches: Iterable[MatrixPitch], tuning: Tuning
+):
+    unquantized_pitches = [
+        matrix_pitch
+        for matrix_pitch in matrix_pitches
+        if matrix_pitch.midi_number is not None
+        and tuning not in matrix_pitch._quantized_midi_numbers
+    ]
+    midi_numbers = get_quantizer(tuning).quantize_all(
+        matrix_pitch.midi_number or 0 for matrix_pitch in unquantized_pitches
+    )
+    for matrix_pitch, midi_number in zip(unquantized_pitches, midi_numbers):
+        matrix_pitch._quantized_midi_numbers[tuning] = midi_number
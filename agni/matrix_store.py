@@ -0,0 +1,165 @@
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from contextlib import suppress
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from shutil import copyfileobj
+from struct import Struct
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Self
+
+from .matrix_leaf import MatrixLeaf
+
+MAGIC = b"AGMX"
+VERSION = 1
+HEADER = Struct("<4sHHQ")
+COLUMNS = (
+    ("frequencies", "f"),
+    ("leaves", "I"),
+    ("bass_multipliers", "h"),
+    ("melody_multipliers", "h"),
+)
+SPOOL_SIZE = 1 << 20
+CHUNK_SIZE = 1 << 16
+
+
+class UnsupportedMatrixStoreError(Exception):
+    pass
+
+
+def get_column_offsets(count: int) -> dict[str, tuple[int, int]]:
+    offsets = {}
+    offset = HEADER.size
+    for name, typecode in COLUMNS:
+        end = offset + count * array(typecode).itemsize
+        offsets[name] = offset, end
+        offset = end
+    return offsets
+
+
+class MatrixStoreWriter:
+    def __init__(self, path: Path):
+        self._path = path
+        self._count = 0
+        self._leaf = 0
+        self._buffers = {name: array(typecode) for name, typecode in COLUMNS}
+        self._columns = {
+            name: SpooledTemporaryFile(max_size=SPOOL_SIZE)  # noqa: SIM115
+            for name, _ in COLUMNS
+        }
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _flush(self):
+        for name, buffer in self._buffers.items():
+            if sys.byteorder == "big":
+                buffer.byteswap()
+            buffer.tofile(self._columns[name])
+            del buffer[:]
+
+    def add_leaf(self, matrix_leaf: MatrixLeaf):
+        matrix = matrix_leaf.matrix
+        if matrix:
+            buffers = self._buffers
+            for matrix_pitch in matrix.sorted_pitches:
+                if not matrix_pitch.frequency:
+                    continue
+                buffers["frequencies"].append(matrix_pitch.frequency)
+                buffers["leaves"].append(self._leaf)
+                buffers["bass_multipliers"].append(
+                    matrix_pitch.bass_multiplier
+                )
+                buffers["melody_multipliers"].append(
+                    matrix_pitch.melody_multiplier
+                )
+                self._count += 1
+            if len(buffers["leaves"]) >= CHUNK_SIZE:
+                self._flush()
+        self._leaf += 1
+
+    def _write(self, file: BinaryIO):
+        file.write(HEADER.pack(MAGIC, VERSION, len(COLUMNS), self._count))
+        for column in self._columns.values():
+            column.seek(0)
+            copyfileobj(column, file)
+
+    def close(self):
+        self._flush()
+        with open(self._path, "wb") as file:
+            self._write(file)
+        for column in self._columns.values():
+            column.close()
+
+
+def write_matrix_store(matrix_leaves: Iterable[MatrixLeaf], path: Path):
+    with MatrixStoreWriter(path) as writer:
+        for matrix_leaf in matrix_leaves:
+            writer.add_leaf(matrix_leaf)
+
+
+class MatrixStore:
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            self._map = mmap(file.fileno(), 0, access=ACCESS_READ)
+        self._view = memoryview(self._map)
+        self._columns: dict[str, memoryview] = {}
+        magic, version, columns, count = HEADER.unpack_from(self._view)
+        if magic != MAGIC or version != VERSION or columns != len(COLUMNS):
+            self.close()
+            raise UnsupportedMatrixStoreError(f"{path} is not a matrix store")
+        if sys.byteorder == "big":
+            self.close()
+            raise UnsupportedMatrixStoreError(
+                "big-endian hosts are unsupported"
+            )
+        self.count = count
+        offsets = get_column_offsets(count)
+        for name, typecode in COLUMNS:
+            start, end = offsets[name]
+            self._columns[name] = self._view[start:end].cast(typecode)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def frequencies(self) -> memoryview:
+        return self._columns["frequencies"]
+
+    @property
+    def leaves(self) -> memoryview:
+        return self._columns["leaves"]
+
+    @property
+    def bass_multipliers(self) -> memoryview:
+        return self._columns["bass_multipliers"]
+
+    @property
+    def melody_multipliers(self) -> memoryview:
+        return self._columns["melody_multipliers"]
+
+    def get_leaf_range(self, leaf: int) -> tuple[int, int]:
+        leaves = self.leaves
+        return bisect_left(leaves, leaf), bisect_right(leaves, leaf)
+
+    def get_frequencies(self, leaf: int) -> memoryview:
+        start, stop = self.get_leaf_range(leaf)
+        return self.frequencies[start:stop]
+
+    def close(self):
+        for column in self._columns.values():
+            column.release()
+        self._view.release()
+        with suppress(BufferError):
+            self._map.close()
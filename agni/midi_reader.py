@@ -0,0 +1,321 @@
+from dataclasses import dataclass, field
+from fractions import Fraction
+from functools import lru_cache
+
+from abjad import (
+    Duration,
+    Leaf,
+    NamedPitch,
+    Note,
+    Rest,
+    Staff,
+    Tie,
+    TimeSignature,
+    attach,
+)
+
+from .helpers import InputPart
+from .timeline import MeteredLeaf
+
+MIDI_SUFFIXES = (".mid", ".midi", ".smf")
+DEFAULT_QUANTIZATION = 16
+DEFAULT_TIME_SIGNATURE = (4, 4)
+MIDDLE_C = 60
+NOTE_OFF = 0x80
+NOTE_ON = 0x90
+PROGRAM_CHANGE = 0xC0
+CHANNEL_PRESSURE = 0xD0
+SYSTEM_EXCLUSIVE = 0xF0
+ESCAPE = 0xF7
+META_EVENT = 0xFF
+TRACK_NAME = 0x03
+TIME_SIGNATURE = 0x58
+
+
+class UnsupportedMidiError(Exception):
+    pass
+
+
+@dataclass
+class MidiNote:
+    start: int
+    end: int
+    key: int
+
+
+@dataclass
+class MidiVoice:
+    track: int
+    channel: int
+    name: str = ""
+    notes: list[MidiNote] = field(default_factory=list)
+
+    @property
+    def average_key(self) -> float:
+        return sum(note.key for note in self.notes) / len(self.notes)
+
+
+@lru_cache
+def _get_named_pitch(key: int) -> NamedPitch:
+    return NamedPitch(key - MIDDLE_C)
+
+
+@lru_cache
+def _get_time_signature(pair: tuple[int, int]) -> TimeSignature:
+    return TimeSignature(pair)
+
+
+def get_assignable_units(units: int) -> list[int]:
+    parts = []
+    while units:
+        bit = units.bit_length() - 1
+        part = 1 << bit
+        while bit and units & (1 << (bit - 1)):
+            bit -= 1
+            part |= 1 << bit
+        parts.append(part)
+        units &= ~part
+    return parts
+
+
+class MidiReader:
+    def __init__(
+        self,
+        midi_input: bytes,
+        bass_track: int | None = None,
+        melody_track: int | None = None,
+        quantization: int = DEFAULT_QUANTIZATION,
+    ):
+        self._data = memoryview(midi_input)
+        self._quantization = quantization
+        self._voice_indices = {
+            InputPart.BASS: bass_track,
+            InputPart.MELODY: melody_track,
+        }
+        self.composer = ""
+        self.division = 0
+        self.track_count = 0
+        self.title = ""
+        self.voices: list[MidiVoice] = []
+        self.time_signatures: dict[int, tuple[int, int]] = {}
+        self._read()
+
+    @staticmethod
+    def _read_variable_length_quantity(
+        data: memoryview, position: int
+    ) -> tuple[int, int]:
+        value = 0
+        while True:
+            byte = data[position]
+            position += 1
+            value = value << 7 | byte & 0x7F
+            if not byte & 0x80:
+                return value, position
+
+    def _read(self):
+        data = self._data
+        if bytes(data[:4]) != b"MThd":
+            raise UnsupportedMidiError("missing MThd header")
+        header_length = int.from_bytes(data[4:8], "big")
+        tracks = int.from_bytes(data[10:12], "big")
+        division = int.from_bytes(data[12:14], "big")
+        if division & 0x8000:
+            raise UnsupportedMidiError("SMPTE time division is not supported")
+        self.division = division
+        self.track_count = tracks
+        position = 8 + header_length
+        for track in range(tracks):
+            if bytes(data[position : position + 4]) != b"MTrk":
+                raise UnsupportedMidiError(f"missing MTrk chunk {track}")
+            length = int.from_bytes(data[position + 4 : position + 8], "big")
+            start = position + 8
+            position = start + length
+            self._read_track(track, start, position)
+        self.voices = [voice for voice in self.voices if voice.notes]
+
+    def _read_track(self, track: int, position: int, end: int):
+        data = self._data
+        read_quantity = self._read_variable_length_quantity
+        voices: dict[int, MidiVoice] = {}
+        sounding: dict[tuple[int, int], int] = {}
+        track_name = ""
+        tick = 0
+        status = 0
+        while position < end:
+            delta, position = read_quantity(data, position)
+            tick += delta
+            if data[position] & 0x80:
+                status = data[position]
+                position += 1
+            if status == META_EVENT:
+                meta_type = data[position]
+                length, position = read_quantity(data, position + 1)
+                value = bytes(data[position : position + length])
+                position += length
+                if meta_type == TRACK_NAME:
+                    track_name = value.decode("latin-1")
+                    if not track:
+                        self.title = track_name
+                elif meta_type == TIME_SIGNATURE:
+                    self.time_signatures[tick] = (value[0], 2 ** value[1])
+                continue
+            if status in (SYSTEM_EXCLUSIVE, ESCAPE):
+                length, position = read_quantity(data, position)
+                position += length
+                continue
+            kind = status & 0xF0
+            if kind in (PROGRAM_CHANGE, CHANNEL_PRESSURE):
+                position += 1
+                continue
+            key = data[position]
+            velocity = data[position + 1]
+            position += 2
+            if kind not in (NOTE_ON, NOTE_OFF):
+                continue
+            channel = status & 0x0F
+            if kind == NOTE_ON and velocity:
+                if channel not in voices:
+                    voices[channel] = MidiVoice(track, channel)
+                sounding[channel, key] = tick
+                continue
+            start = sounding.pop((channel, key), None)
+            if start is not None and tick > start:
+                voices[channel].notes.append(MidiNote(start, tick, key))
+        for voice in voices.values():
+            voice.name = track_name
+            voice.notes.sort(key=lambda note: note.start)
+            self.voices.append(voice)
+
+    def _get_whole_notes(self, tick: int) -> Fraction:
+        return Fraction(tick, 4 * self.division)
+
+    def _quantize(self, tick: int) -> Fraction:
+        quantization = self._quantization
+        return Fraction(
+            round(self._get_whole_notes(tick) * quantization), quantization
+        )
+
+    def _get_track_voice(self, track: int) -> MidiVoice:
+        if not 0 <= track < self.track_count:
+            raise UnsupportedMidiError(
+                f"track {track} is out of range; the file has tracks 0 to"
+                f" {self.track_count - 1}"
+            )
+        voice = next(
+            (voice for voice in self.voices if voice.track == track), None
+        )
+        if not voice:
+            raise UnsupportedMidiError(f"track {track} has no notes")
+        return voice
+
+    def _get_voice(self, input_part: InputPart) -> MidiVoice:
+        voices = self.voices
+        track = self._voice_indices[input_part]
+        if track is not None:
+            return self._get_track_voice(track)
+        named_voice = next(
+            (voice for voice in voices if voice.name.lower() == input_part),
+            None,
+        )
+        if named_voice:
+            return named_voice
+        if len(voices) < 2:
+            raise UnsupportedMidiError("expected at least two voices")
+        bass, melody = sorted(voices[:2], key=lambda voice: voice.average_key)
+        if input_part == InputPart.BASS:
+            return bass
+        return melody
+
+    def _get_segments(
+        self, voice: MidiVoice
+    ) -> list[tuple[Fraction, Fraction, int | None]]:
+        segments = []
+        position = Fraction(0)
+        notes = voice.notes
+        for index, note in enumerate(notes):
+            start = max(self._quantize(note.start), position)
+            end = self._quantize(note.end)
+            if index + 1 < len(notes):
+                end = min(end, self._quantize(notes[index + 1].start))
+            if end <= start:
+                continue
+            if start > position:
+                segments.append((position, start, None))
+            segments.append((start, end, note.key))
+            position = end
+        return segments
+
+    def _get_measures(
+        self, end: Fraction
+    ) -> list[tuple[Fraction, tuple[int, int]]]:
+        changes = [
+            (self._get_whole_notes(tick), time_signature)
+            for tick, time_signature in sorted(self.time_signatures.items())
+        ]
+        change_index = 0
+        time_signature = DEFAULT_TIME_SIGNATURE
+        measures = []
+        position = Fraction(0)
+        while True:
+            while (
+                change_index < len(changes)
+                and changes[change_index][0] <= position
+            ):
+                _, time_signature = changes[change_index]
+                change_index += 1
+            measures.append((position, time_signature))
+            if position >= end:
+                return measures
+            position += Fraction(*time_signature)
+
+    @staticmethod
+    def _get_assignable_durations(duration: Fraction) -> list[Fraction]:
+        denominator = duration.denominator
+        return [
+            Fraction(units, denominator)
+            for units in get_assignable_units(duration.numerator)
+        ]
+
+    @staticmethod
+    def _get_leaf(key: int | None, duration: Fraction) -> Leaf:
+        if key is None:
+            return Rest(Duration(duration))
+        return Note(_get_named_pitch(key), Duration(duration))
+
+    def get_metered_staff(
+        self, input_part: InputPart
+    ) -> tuple[Staff, list[MeteredLeaf]]:
+        segments = self._get_segments(self._get_voice(input_part))
+        end = segments[-1][1] if segments else Fraction(0)
+        measures = self._get_measures(end)
+        leaves: list[Leaf] = []
+        metered_leaves = []
+        measure_index = 0
+        for start, stop, key in segments:
+            position = start
+            while position < stop:
+                while measures[measure_index + 1][0] <= position:
+                    measure_index += 1
+                measure_start, (numerator, denominator) = measures[
+                    measure_index
+                ]
+                barline = measures[measure_index + 1][0]
+                piece_end = min(stop, barline)
+                time_signature = _get_time_signature((numerator, denominator))
+                for duration in self._get_assignable_durations(
+                    piece_end - position
+                ):
+                    leaf = self._get_leaf(key, duration)
+                    if position == measure_start and (
+                        not metered_leaves
+                        or metered_leaves[-1].time_signature
+                        is not time_signature
+                    ):
+                        attach(time_signature, leaf)
+                    if key is not None and position + duration < stop:
+                        attach(Tie(), leaf)
+                    leaves.append(leaf)
+                    metered_leaves.append(MeteredLeaf(leaf, time_signature))
+                    position += duration
+        staff = Staff(leaves, name=input_part)
+        return staff, metered_leaves
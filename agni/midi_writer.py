@@ -0,0 +1,281 @@
+from collections import Counter
+from collections.abc import Iterable
+from fractions import Fraction
+from pathlib import Path
+from shutil import copyfileobj
+from struct import pack
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO
+
+from abjad import NamedPitch
+
+from .helpers import InputPart
+from .matrix_leaf import MatrixLeaf
+from .matrix_pitch import Tuning
+from .tuning import get_midi_number, get_quantizer
+
+TICKS_PER_QUARTER = 480
+MICROSECONDS_PER_QUARTER = 500_000
+VELOCITY = 80
+PITCH_BEND_CENTER = 8192
+PITCH_BEND_RANGE = 2
+DRUM_CHANNEL = 9
+CHANNELS = [channel for channel in range(16) if channel != DRUM_CHANNEL]
+SPOOL_SIZE = 1 << 20
+NOTE_OFF = 0x80
+NOTE_ON = 0x90
+CONTROL_CHANGE = 0xB0
+PITCH_BEND = 0xE0
+META_EVENT = 0xFF
+TRACK_NAME = 0x03
+END_OF_TRACK = 0x2F
+SET_TEMPO = 0x51
+RPN_MSB = 101
+RPN_LSB = 100
+DATA_ENTRY_MSB = 6
+DATA_ENTRY_LSB = 38
+
+
+def get_variable_length_quantity(value: int) -> bytes:
+    quantity = [value & 0x7F]
+    value >>= 7
+    while value:
+        quantity.append(value & 0x7F | 0x80)
+        value >>= 7
+    return bytes(reversed(quantity))
+
+
+def get_key_and_bend(midi_number: float) -> tuple[int, int]:
+    key = min(max(round(midi_number), 0), 127)
+    semitones = midi_number - key
+    bend = PITCH_BEND_CENTER + round(
+        semitones / PITCH_BEND_RANGE * PITCH_BEND_CENTER
+    )
+    return key, min(max(bend, 0), 2 * PITCH_BEND_CENTER - 1)
+
+
+def get_ticks(duration: Fraction) -> int:
+    return round(duration * 4 * TICKS_PER_QUARTER)
+
+
+class MidiChannelError(Exception):
+    pass
+
+
+class MidiChannels:
+    def __init__(self):
+        self._bends = dict.fromkeys(CHANNELS, PITCH_BEND_CENTER)
+        self._keys: dict[int, Counter[int]] = {
+            channel: Counter() for channel in CHANNELS
+        }
+
+    def acquire(self, key: int, bend: int) -> tuple[int, bool]:
+        bends = self._bends
+        keys = self._keys
+        channels = [
+            channel
+            for channel in CHANNELS
+            if not keys[channel] or bends[channel] == bend
+        ]
+        if not channels:
+            raise MidiChannelError(
+                f"more than {len(CHANNELS)} differently tuned notes sound at"
+                " once"
+            )
+        channel = min(
+            channels,
+            key=lambda channel: (
+                bool(keys[channel][key]),
+                bool(keys[channel]),
+                bends[channel] != bend,
+            ),
+        )
+        keys[channel][key] += 1
+        is_bent = bends[channel] != bend
+        bends[channel] = bend
+        return channel, is_bent
+
+    def release(self, channel: int, key: int) -> bool:
+        keys = self._keys[channel]
+        keys[key] -= 1
+        if keys[key]:
+            return False
+        del keys[key]
+        return True
+
+
+class MidiTrack:
+    def __init__(self, name: str, channels: MidiChannels | None = None):
+        self.name = name
+        self._channels = channels or MidiChannels()
+        self._events = SpooledTemporaryFile(  # noqa: SIM115
+            max_size=SPOOL_SIZE
+        )
+        self._tick = 0
+        self._channel = CHANNELS[0]
+        self._key: int | None = None
+        self._midi_number: float | None = None
+        self.add_meta_event(0, TRACK_NAME, name.encode())
+
+    def _add_event(self, tick: int, data: bytes):
+        delta = max(tick - self._tick, 0)
+        self._events.write(get_variable_length_quantity(delta) + data)
+        self._tick = max(tick, self._tick)
+
+    def _add_channel_event(
+        self, tick: int, status: int, channel: int, *data: int
+    ):
+        self._add_event(tick, bytes([status | channel, *data]))
+
+    def add_meta_event(self, tick: int, meta_type: int, data: bytes):
+        length = get_variable_length_quantity(len(data))
+        self._add_event(tick, bytes([META_EVENT, meta_type]) + length + data)
+
+    def set_pitch_bend_range(self, channel: int):
+        for controller, value in (
+            (RPN_MSB, 0),
+            (RPN_LSB, 0),
+            (DATA_ENTRY_MSB, PITCH_BEND_RANGE),
+            (DATA_ENTRY_LSB, 0),
+        ):
+            self._add_channel_event(
+                0, CONTROL_CHANGE, channel, controller, value
+            )
+
+    def is_held(self, midi_number: float | None, tie: bool) -> bool:
+        return (
+            tie
+            and midi_number is not None
+            and midi_number == self._midi_number
+        )
+
+    def stop(self, tick: int):
+        key = self._key
+        if key is None:
+            return
+        channel = self._channel
+        if self._channels.release(channel, key):
+            self._add_channel_event(tick, NOTE_OFF, channel, key, 0)
+        self._key = None
+        self._midi_number = None
+
+    def play(self, tick: int, midi_number: float | None, tie=False):
+        if self.is_held(midi_number, tie):
+            return
+        self.stop(tick)
+        if midi_number is None:
+            return
+        key, bend = get_key_and_bend(midi_number)
+        channel, is_bent = self._channels.acquire(key, bend)
+        if is_bent:
+            self._add_channel_event(
+                tick, PITCH_BEND, channel, bend & 0x7F, bend >> 7 & 0x7F
+            )
+        self._add_channel_event(tick, NOTE_ON, channel, key, VELOCITY)
+        self._channel = channel
+        self._key = key
+        self._midi_number = midi_number
+
+    def write(self, file: BinaryIO, tick: int):
+        self.stop(tick)
+        self.add_meta_event(tick, END_OF_TRACK, b"")
+        events = self._events
+        file.write(b"MTrk" + pack(">I", events.tell()))
+        events.seek(0)
+        copyfileobj(events, file)
+        events.close()
+
+
+class MidiWriter:
+    def __init__(
+        self,
+        track_names: Iterable[str],
+        tuning: Tuning = Tuning.MICROTONAL,
+        title: str = "",
+    ):
+        self._quantizer = get_quantizer(tuning)
+        self._conductor = MidiTrack(title)
+        self._conductor.add_meta_event(
+            0, SET_TEMPO, MICROSECONDS_PER_QUARTER.to_bytes(3, "big")
+        )
+        for channel in CHANNELS:
+            self._conductor.set_pitch_bend_range(channel)
+        channels = MidiChannels()
+        self._tracks = {
+            name: MidiTrack(name, channels)
+            for name in dict.fromkeys(
+                [InputPart.BASS.title(), InputPart.MELODY.title()]
+                + list(track_names)
+            )
+        }
+        self._onset = Fraction(0)
+        self._tie = False
+
+    def _get_midi_numbers(
+        self, frequencies: dict[str, float | None]
+    ) -> dict[str, float | None]:
+        sounding_frequencies = {
+            name: frequency
+            for name, frequency in frequencies.items()
+            if frequency and name in self._tracks
+        }
+        midi_numbers = self._quantizer.quantize_all(
+            map(get_midi_number, sounding_frequencies.values())
+        )
+        return dict(zip(sounding_frequencies, midi_numbers))
+
+    @staticmethod
+    def _get_input_frequency(pitch: NamedPitch | None) -> float | None:
+        if not pitch:
+            return None
+        return pitch.hertz
+
+    def add_leaf(self, matrix_leaf: MatrixLeaf):
+        duration = matrix_leaf.sounding_duration
+        if not duration:
+            return
+        tick = get_ticks(self._onset)
+        frequencies = {
+            InputPart.BASS.title(): self._get_input_frequency(
+                matrix_leaf._bass
+            ),
+            InputPart.MELODY.title(): self._get_input_frequency(
+                matrix_leaf._melody
+            ),
+        }
+        for matrix_pitch in matrix_leaf.generated_pitches:
+            frequencies[matrix_pitch.instrument_name] = matrix_pitch.frequency
+        midi_numbers = self._get_midi_numbers(frequencies)
+        for name, track in self._tracks.items():
+            if not track.is_held(midi_numbers.get(name), self._tie):
+                track.stop(tick)
+        for name, track in self._tracks.items():
+            track.play(tick, midi_numbers.get(name), self._tie)
+        self._onset += duration
+        self._tie = matrix_leaf.tie
+
+    def write(self, file: BinaryIO):
+        tracks = [self._conductor, *self._tracks.values()]
+        file.write(
+            b"MThd" + pack(">IHHH", 6, 1, len(tracks), TICKS_PER_QUARTER)
+        )
+        tick = get_ticks(self._onset)
+        for track in tracks:
+            track.write(file, tick)
+
+
+def write_midi_file(
+    matrix_leaves: Iterable[MatrixLeaf],
+    path: Path,
+    tuning: Tuning = Tuning.MICROTONAL,
+    title: str = "",
+):
+    writer = None
+    for matrix_leaf in matrix_leaves:
+        if writer is None:
+            writer = MidiWriter(matrix_leaf.instrument_names, tuning, title)
+        writer.add_leaf(matrix_leaf)
+    if writer is None:
+        writer = MidiWriter([], tuning, title)
+    with open(path, "wb") as file:
+        writer.write(file)
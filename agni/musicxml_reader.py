@@ -0,0 +1,324 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+from xml.etree.ElementTree import Element, iterparse
+from zipfile import ZipFile
+
+from abjad import Duration, Staff
+
+from .helpers import InputPart
+from .lilypond_reader import (
+    ContainerRecord,
+    IndicatorRecord,
+    LeafRecord,
+    MeteredStaffBuilder,
+    UnsupportedInputError,
+)
+from .timeline import MeteredLeaf
+
+MUSICXML_SUFFIXES = (".musicxml", ".xml", ".mxl")
+COMPRESSED_SUFFIX = ".mxl"
+NOTE_TYPES = {
+    "maxima": Duration(8),
+    "long": Duration(4),
+    "breve": Duration(2),
+    "whole": Duration(1),
+    "half": Duration(1, 2),
+    "quarter": Duration(1, 4),
+    "eighth": Duration(1, 8),
+    "16th": Duration(1, 16),
+    "32nd": Duration(1, 32),
+    "64th": Duration(1, 64),
+    "128th": Duration(1, 128),
+    "256th": Duration(1, 256),
+}
+ACCIDENTALS = {
+    -2: "ff",
+    -1.5: "tqf",
+    -1: "f",
+    -0.5: "qf",
+    0: "",
+    0.5: "qs",
+    1: "s",
+    1.5: "tqs",
+    2: "ss",
+}
+CLEFS = {
+    ("G", "2"): "treble",
+    ("F", "4"): "bass",
+    ("C", "3"): "alto",
+    ("C", "4"): "tenor",
+}
+LILYPOND_OCTAVE = 3
+
+
+def _get_text(element: Element | None, path: str, default="") -> str:
+    if element is None:
+        return default
+    text = element.findtext(path)
+    if text is None:
+        return default
+    return text.strip()
+
+
+def get_pitch_name(step: str, alter: float, octave: int) -> str:
+    accidental = ACCIDENTALS.get(alter)
+    if accidental is None:
+        raise UnsupportedInputError(f"unsupported alteration {alter}")
+    ticks = octave - LILYPOND_OCTAVE
+    if ticks > 0:
+        octave_marks = "'" * ticks
+    else:
+        octave_marks = "," * -ticks
+    return f"{step.lower()}{accidental}{octave_marks}"
+
+
+class MusicXmlPart:
+    def __init__(self, part_id: str, input_part: InputPart | None = None):
+        self.part_id = part_id
+        self.input_part = input_part
+        self.record = ContainerRecord()
+        self._containers = [self.record]
+        self._divisions = 1
+        self._voice: str | None = None
+        self._measure_duration = Duration(1)
+        self._time_signature = (4, 4)
+        self._keys: list[int] = []
+
+    @property
+    def average_key(self) -> float:
+        keys = self._keys
+        if not keys:
+            return 0
+        return sum(keys) / len(keys)
+
+    def _append(self, record: LeafRecord | ContainerRecord | IndicatorRecord):
+        self._containers[-1].items.append(record)
+
+    def read_attributes(self, attributes: Element):
+        divisions = attributes.findtext("divisions")
+        if divisions:
+            self._divisions = int(divisions)
+        time = attributes.find("time")
+        if time is not None:
+            beats = _get_text(time, "beats")
+            beat_type = _get_text(time, "beat-type")
+            if beats.isdigit() and beat_type.isdigit():
+                pair = (int(beats), int(beat_type))
+                self._time_signature = pair
+                self._measure_duration = Duration(*pair)
+                self._append(IndicatorRecord("\\time", pair))
+        clef = attributes.find("clef")
+        if clef is not None:
+            name = CLEFS.get(
+                (_get_text(clef, "sign"), _get_text(clef, "line"))
+            )
+            if name:
+                self._append(IndicatorRecord("\\clef", name))
+
+    def _get_written_duration(self, note: Element) -> Duration | None:
+        note_type = _get_text(note, "type")
+        if note_type not in NOTE_TYPES:
+            return None
+        written_duration = NOTE_TYPES[note_type]
+        dot_value = written_duration
+        for _ in note.iterfind("dot"):
+            dot_value /= 2
+            written_duration += dot_value
+        return Duration(written_duration)
+
+    def _get_pitch(self, note: Element) -> str | None:
+        pitch = note.find("pitch")
+        if pitch is None:
+            return None
+        alter = float(_get_text(pitch, "alter", "0"))
+        octave = int(_get_text(pitch, "octave"))
+        step = _get_text(pitch, "step")
+        name = get_pitch_name(step, alter, octave)
+        self._keys.append(octave * 12 + "CDEFGAB".index(step) * 2)
+        return name
+
+    def _get_measure_rest_record(self) -> LeafRecord:
+        duration = self._measure_duration
+        multiplier = None
+        if duration != 1:
+            multiplier = (duration.numerator, duration.denominator)
+        return LeafRecord(
+            None, Duration(1), multiplier, is_multi_measure_rest=True
+        )
+
+    def read_note(self, note: Element):
+        if note.find("grace") is not None or note.find("chord") is not None:
+            return
+        voice = _get_text(note, "voice", "1")
+        if self._voice is None:
+            self._voice = voice
+        if voice != self._voice:
+            return
+        notations = note.find("notations")
+        tuplets = [] if notations is None else notations.findall("tuplet")
+        time_modification = note.find("time-modification")
+        for tuplet in tuplets:
+            if tuplet.get("type") == "start" and time_modification is not None:
+                actual = _get_text(time_modification, "actual-notes")
+                normal = _get_text(time_modification, "normal-notes")
+                container = ContainerRecord(tuplet=f"{actual}:{normal}")
+                self._append(container)
+                self._containers.append(container)
+        written_duration = self._get_written_duration(note)
+        pitch = self._get_pitch(note)
+        rest = note.find("rest")
+        if rest is not None and rest.get("measure") == "yes":
+            record = self._get_measure_rest_record()
+        elif written_duration is None:
+            duration = Duration(
+                int(_get_text(note, "duration", "0")), self._divisions * 4
+            )
+            if pitch is None:
+                record = self._get_measure_rest_record()
+            elif duration.is_assignable:
+                record = LeafRecord(pitch, duration)
+            else:
+                raise UnsupportedInputError("unassignable note duration")
+        else:
+            multiplier = None
+            if time_modification is not None and len(self._containers) == 1:
+                multiplier = (
+                    int(_get_text(time_modification, "normal-notes")),
+                    int(_get_text(time_modification, "actual-notes")),
+                )
+            record = LeafRecord(pitch, written_duration, multiplier)
+        self._append(record)
+        if any(tie.get("type") == "start" for tie in note.iterfind("tie")):
+            self._append(IndicatorRecord("~"))
+        for tuplet in tuplets:
+            if tuplet.get("type") == "stop" and len(self._containers) > 1:
+                self._containers.pop()
+
+    def get_metered_staff(
+        self, input_part: InputPart
+    ) -> tuple[Staff, list[MeteredLeaf]]:
+        builder = MeteredStaffBuilder()
+        staff = builder.build_staff(self.record, input_part)
+        return staff, builder.metered_leaves
+
+
+@contextmanager
+def open_musicxml(input_file: Path) -> Iterator[IO[bytes]]:
+    if input_file.suffix.lower() != COMPRESSED_SUFFIX:
+        with open(input_file, "rb") as file:
+            yield file
+        return
+    with ZipFile(input_file) as archive:
+        name = next(
+            name
+            for name in archive.namelist()
+            if not name.startswith("META-INF")
+            and name.endswith((".xml", ".musicxml"))
+        )
+        with archive.open(name) as file:
+            yield file
+
+
+class MusicXmlReader:
+    def __init__(
+        self,
+        input_file: Path,
+        bass_part: int | None = None,
+        melody_part: int | None = None,
+    ):
+        self.title = ""
+        self.composer = ""
+        self._part_names: dict[str, str] = {}
+        self._part_indices = {
+            InputPart.BASS: bass_part,
+            InputPart.MELODY: melody_part,
+        }
+        self._parts: dict[str, MusicXmlPart] | None = None
+        with open_musicxml(input_file) as file:
+            self._read(file)
+
+    def _get_selected_parts(self) -> dict[str, MusicXmlPart]:
+        part_names = self._part_names
+        part_ids = list(part_names)
+        selected = {}
+        for input_part, index in self._part_indices.items():
+            if index is not None:
+                part_id = part_ids[index]
+            else:
+                part_id = next(
+                    (
+                        part_id
+                        for part_id, name in part_names.items()
+                        if name.lower() == input_part
+                    ),
+                    None,
+                )
+            if part_id:
+                selected[part_id] = MusicXmlPart(part_id, input_part)
+        for part_id in part_ids:
+            if len(selected) == len(InputPart):
+                break
+            if part_id not in selected:
+                selected[part_id] = MusicXmlPart(part_id)
+        return selected
+
+    def _read(self, file: IO[bytes]):
+        part: MusicXmlPart | None = None
+        part_element: Element | None = None
+        for event, element in iterparse(file, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                if tag == "part":
+                    if self._parts is None:
+                        self._parts = self._get_selected_parts()
+                    part = self._parts.get(element.get("id", ""))
+                    part_element = element
+                continue
+            if tag == "score-part":
+                part_id = element.get("id", "")
+                self._part_names[part_id] = _get_text(element, "part-name")
+                element.clear()
+            elif tag in ("work-title", "movement-title"):
+                self.title = self.title or (element.text or "").strip()
+            elif tag == "creator" and element.get("type") == "composer":
+                self.composer = (element.text or "").strip()
+            elif tag == "attributes":
+                if part:
+                    part.read_attributes(element)
+            elif tag == "note":
+                if part:
+                    part.read_note(element)
+            elif tag == "measure":
+                element.clear()
+                if part_element is not None:
+                    part_element.clear()
+            elif tag == "part":
+                part = None
+                part_element = None
+                element.clear()
+
+    def _get_part(self, input_part: InputPart) -> MusicXmlPart:
+        parts = list((self._parts or {}).values())
+        selected_part = next(
+            (part for part in parts if part.input_part == input_part), None
+        )
+        if selected_part:
+            return selected_part
+        unselected_parts = [part for part in parts if not part.input_part]
+        if len(parts) < len(InputPart) or not unselected_parts:
+            raise UnsupportedInputError("expected at least two parts")
+        if len(unselected_parts) == 1:
+            return unselected_parts[0]
+        bass, *_, melody = sorted(
+            unselected_parts, key=lambda part: part.average_key
+        )
+        if input_part == InputPart.BASS:
+            return bass
+        return melody
+
+    def get_metered_staff(
+        self, input_part: InputPart
+    ) -> tuple[Staff, list[MeteredLeaf]]:
+        return self._get_part(input_part).get_metered_staff(input_part)
@@ -1,19 +1,38 @@
-from collections.abc import Iterable
+from asyncio import (
+    CancelledError,
+    Semaphore,
+    TaskGroup,
+    create_subprocess_exec,
+    run,
+    to_thread,
+)
+from asyncio import timeout as get_timeout
+from asyncio.subprocess import PIPE, STDOUT
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import suppress
 from functools import cached_property
+from os import killpg, replace
 from pathlib import Path
-from statistics import mode
-from typing import cast
+from shutil import which
+from signal import SIGKILL
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from typing import TypeVar, cast
+from uuid import uuid4
 
 from abjad import (
+    UP,
     BarLine,
     Chord,
     Clef,
     Component,
+    Configuration,
     Duration,
     InstrumentName,
     Leaf,
     LilyPondFile,
     LilyPondLiteral,
+    Markup,
     MultimeasureRest,
     NamedPitch,
     Note,
@@ -28,24 +47,74 @@ from abjad import (
     TimeSignature,
     Tuplet,
     attach,
+    lilypond,
     show,
 )
 from abjad.get import duration as get_duration
 from abjad.get import indicators as get_indicators
 from abjad.get import lineage as get_lineage
+from abjad.io import open_file
 from abjad.persist import as_pdf
 from abjad.select import leaves as get_leaves
-from abjad.select import notes as get_notes
 from abjad.select import tuplets as get_tuplets
 from abjadext.rmakers import multiplied_duration
+from more_itertools import chunked
 from rich.progress import Progress, track
 
 from .helpers import get_staff_by_name, remove_none_values
+from .lilypond_writer import (
+    OCTAVE_CLEFS_AND_OTTAVAS,
+    clamp_octave,
+    get_reference_score,
+    get_staff_clef,
+)
 from .matrix import Matrix
 from .matrix_leaf import MatrixLeaf
-from .matrix_pitch import MatrixPitch, Tuning
+from .matrix_pitch import MatrixPitch, Tuning, quantize_matrix_pitches
 from .part import MeteredLeaf
 from .passage import Passage
+from .tuning import get_cent_deviation
+from .voice_leading import VoiceLeading
+
+CLEFS_AND_OTTAVAS = {
+    octave: (Clef(clef), Ottava(n=ottava))
+    for octave, (clef, ottava) in OCTAVE_CLEFS_AND_OTTAVAS.items()
+}
+STAFF_CLEFS = {name: Clef(name) for name in ("bass", "treble")}
+DEFAULT_CONCURRENCY = 4
+DEFAULT_CHUNK_SIZE = 50
+
+T = TypeVar("T")
+
+
+class EngravingError(Exception):
+    pass
+
+
+def get_lilypond_path() -> str:
+    return (
+        Configuration().get("lilypond_path") or which("lilypond") or "lilypond"
+    )
+
+
+def get_ghostscript_path() -> str:
+    return which("gs") or "gs"
+
+
+async def run_subprocess(*args: str, timeout: float | None = None):
+    process = await create_subprocess_exec(
+        *args, stdout=PIPE, stderr=STDOUT, start_new_session=True
+    )
+    try:
+        async with get_timeout(timeout):
+            output, _ = await process.communicate()
+    except (TimeoutError, CancelledError):
+        with suppress(ProcessLookupError):
+            killpg(process.pid, SIGKILL)
+        await process.wait()
+        raise
+    if process.returncode:
+        raise EngravingError(output.decode(errors="ignore"))
 
 
 class Notation:
@@ -60,20 +129,31 @@ class Notation:
         as_chord: bool,
         output_directory: Path,
         full_score: bool = False,
+        voice_leading: bool = False,
+        fast_output: bool = True,
+        engraving_workers: int = 1,
     ):
         if isinstance(input, Matrix):
             matrices = [input]
             self._passage = None
+            self._matrix_title = input.title
         else:
             matrices = input.matrices
             self._passage = input
+            self._matrix_title = Matrix.TITLE
         self._number_of_matrices = len(matrices)
-        self._matrices = track(matrices, description=self.PROGRESS_DESCRIPTION)
+        self._matrices = matrices
+        self._show_progress = False
         self._as_ensemble = as_ensemble
         self._tuning = tuning
         self._save = save
         self._as_chord = as_chord
         self._full_score = full_score
+        self._voice_leading = voice_leading
+        self._fast_output = fast_output
+        self._engraving_workers = engraving_workers
+        self._staff_octaves: dict[str, Counter[int]] = {}
+        self._staff_first_leaves: dict[str, Leaf] = {}
         self._output_directory = output_directory
 
     @staticmethod
@@ -95,13 +175,17 @@ class Notation:
         attach(InstrumentName(instrument_name), first_leaf)
         attach(ShortInstrumentName(instrument_name), first_leaf)
 
+    def _track(self, items: Iterable[T]) -> Iterable[T]:
+        if not self._show_progress:
+            return items
+        return track(items, description=self.PROGRESS_DESCRIPTION)
+
     @property
     def _matrix_leaves(self) -> Iterable[MatrixLeaf]:
         passage = self._passage
         if not passage:
             return []
-        matrix_leaves = passage.matrix_leaves
-        return track(matrix_leaves, description=self.PROGRESS_DESCRIPTION)
+        return self._track(passage.matrix_leaves)
 
     @property
     def _input_staves(self) -> list[Staff]:
@@ -121,9 +205,19 @@ class Notation:
         command = "\\markup"
         return f"{command} {{ {text} }}"
 
-    @classmethod
+    def _add_octave_to_staff(self, staff_name: str, leaf: Leaf):
+        if staff_name not in self._staff_first_leaves:
+            self._staff_first_leaves[staff_name] = leaf
+        if not isinstance(leaf, Note):
+            return
+        octave = self._get_octave(leaf)
+        if octave is None:
+            return
+        octaves = self._staff_octaves.setdefault(staff_name, Counter())
+        octaves[octave] += 1
+
     def _add_leaf_to_staff(
-        cls,
+        self,
         staff_group: StaffGroup,
         instrument_name: str,
         leaf: Leaf,
@@ -136,6 +230,7 @@ class Notation:
             component: Leaf | Tuplet = Tuplet(multiplier, components=[leaf])
         else:
             component = leaf
+        self._add_octave_to_staff(instrument_name, leaf)
         staff = next(
             (staff for staff in staff_group if staff.name == instrument_name),
             None,
@@ -148,16 +243,15 @@ class Notation:
             parent.append(component)
         else:
             staff = Staff([component], name=instrument_name)
-            instrument_name_markup = cls._make_markup(instrument_name)
+            instrument_name_markup = self._make_markup(instrument_name)
             instrument_name_markup = instrument_name_markup.replace("'", "")
             first_leaf = staff[0]
             attach(InstrumentName(instrument_name_markup), first_leaf)
             attach(ShortInstrumentName(instrument_name_markup), first_leaf)
             staff_group.insert(0, staff)
 
-    @classmethod
     def _add_notes_to_staff(
-        cls, matrix_leaf: MatrixLeaf, staff_group: StaffGroup
+        self, matrix_leaf: MatrixLeaf, staff_group: StaffGroup
     ):
         duration = matrix_leaf.duration
         if not duration:
@@ -167,7 +261,7 @@ class Notation:
             if not note:
                 continue
             instrument_names = matrix_pitch.instrument_name
-            cls._add_leaf_to_staff(
+            self._add_leaf_to_staff(
                 staff_group,
                 instrument_names,
                 note,
@@ -186,16 +280,15 @@ class Notation:
             )
         return Rest(duration)
 
-    @classmethod
     def _add_rests_to_staff(
-        cls, matrix_leaf: MatrixLeaf, staff_group: StaffGroup
+        self, matrix_leaf: MatrixLeaf, staff_group: StaffGroup
     ):
         duration = matrix_leaf.duration
         if not duration:
             return
         for instrument_names in matrix_leaf.instrument_names:
-            rest = cls._get_rest(duration, matrix_leaf.is_multi_measure_rest)
-            cls._add_leaf_to_staff(
+            rest = self._get_rest(duration, matrix_leaf.is_multi_measure_rest)
+            self._add_leaf_to_staff(
                 staff_group,
                 instrument_names,
                 rest,
@@ -203,6 +296,43 @@ class Notation:
                 matrix_leaf.is_start_of_tuplet,
             )
 
+    @staticmethod
+    def _get_voice_name(voice: int) -> str:
+        return f"Voice {voice + 1}"
+
+    def _add_voices_to_staff(
+        self,
+        matrix_leaf: MatrixLeaf,
+        staff_group: StaffGroup,
+        voice_leading: VoiceLeading,
+    ):
+        duration = matrix_leaf.duration
+        if not duration:
+            return
+        voice_notes: dict[int, Note] = {}
+        if matrix_leaf.contains_pitches:
+            notes = []
+            midi_numbers = []
+            for matrix_pitch in matrix_leaf.generated_pitches:
+                note = matrix_pitch.get_note(duration, matrix_leaf.tie)
+                if not note:
+                    continue
+                notes.append(note)
+                midi_numbers.append(matrix_pitch.midi_number)
+            voices = voice_leading.assign(midi_numbers)
+            voice_notes = dict(zip(voices, notes))
+        for voice in range(len(voice_leading.voices)):
+            leaf = voice_notes.get(voice) or self._get_rest(
+                duration, matrix_leaf.is_multi_measure_rest
+            )
+            self._add_leaf_to_staff(
+                staff_group,
+                self._get_voice_name(voice),
+                leaf,
+                matrix_leaf.tuplet,
+                matrix_leaf.is_start_of_tuplet,
+            )
+
     @staticmethod
     def _get_melody_note_duration(
         metered_leaf: MeteredLeaf | None,
@@ -227,20 +357,21 @@ class Notation:
 
     def _get_note(
         self,
-        frequency: float,
+        matrix_pitch: MatrixPitch,
         duration: Duration | None = None,
-        is_base_frequency=False,
-        is_base_multiple=False,
     ) -> Note:
         if not duration:
-            if is_base_frequency:
+            if matrix_pitch.is_base_frequency:
                 duration = Duration(1, 1)
-            elif is_base_multiple:
+            elif matrix_pitch.is_base_multiple:
                 duration = Duration(1, 2)
             else:
                 duration = Duration(1, 4)
-        pitch = NamedPitch.from_hertz(frequency)
-        if self._tuning == Tuning.EQUAL_TEMPERED:
+        tuning = self._tuning
+        if not tuning.has_lilypond_names:
+            return self._get_cent_deviation_note(matrix_pitch, duration)
+        pitch = NamedPitch.from_hertz(matrix_pitch.frequency or 0)
+        if tuning == Tuning.EQUAL_TEMPERED:
             pitch_number = pitch.number
             if isinstance(pitch_number, float):
                 pitch_number = int(pitch_number)
@@ -248,12 +379,25 @@ class Notation:
                 pitch = NamedPitch(pitch_name)
         return Note(pitch, duration)
 
+    def _get_cent_deviation_note(
+        self, matrix_pitch: MatrixPitch, duration: Duration
+    ) -> Note:
+        midi_number = matrix_pitch.get_quantized_midi_number(self._tuning) or 0
+        semitone, deviation = get_cent_deviation(midi_number)
+        pitch = NamedPitch(NumberedPitch(semitone - 60).name)
+        note = Note(pitch, duration)
+        if deviation:
+            attach(
+                Markup(f"\\markup {{ {deviation:+d} }}"), note, direction=UP
+            )
+        return note
+
     def _get_matrix_note_from_melody_note(
         self, matrix_pitch: MatrixPitch, melody_note: MeteredLeaf | None
     ) -> Note:
         duration = self._get_melody_note_duration(melody_note)
         tie = self._get_melody_note_tie(melody_note)
-        note = self._get_note(matrix_pitch.frequency or 0, duration=duration)
+        note = self._get_note(matrix_pitch, duration=duration)
         if tie:
             attach(tie, note)
         return note
@@ -275,81 +419,53 @@ class Notation:
             return None
         return written_pitch.octave.number
 
+    @staticmethod
+    def _get_clef_and_ottava(
+        octave: int | None,
+    ) -> tuple[Clef | None, Ottava | None]:
+        if not octave:
+            return None, None
+        return CLEFS_AND_OTTAVAS[clamp_octave(octave)]
+
     @classmethod
     def _get_clef(
         cls, note: Note | None = None, octave: int | None = None
     ) -> Clef | None:
-        octave = octave or cls._get_octave(note)
-        if not octave:
-            return None
-        if octave < 1:
-            return Clef("bass_15")
-        if octave < 2:
-            return Clef("bass_8")
-        if octave < 4:
-            return Clef("bass")
-        if octave < 6:
-            return Clef("treble")
-        if octave < 7:
-            return Clef("treble^8")
-        return Clef("treble^15")
+        clef, _ = cls._get_clef_and_ottava(octave or cls._get_octave(note))
+        return clef
 
-    @classmethod
+    @staticmethod
     def _set_clef(
-        cls, note: Note, clef: Clef | None = None, use_ottava=False
+        note: Note, clef: Clef | None, use_ottava=False
     ) -> Clef | None:
-        if clef is None:
-            clef = cls._get_clef(note)
         if use_ottava:
-            if clef and "bass" in clef.name:
-                clef = Clef("bass")
-            else:
-                clef = Clef("treble")
-        else:
-            clef = clef
-        attach(clef, note)
+            clef = STAFF_CLEFS[get_staff_clef(clef.name if clef else None)]
+        if clef:
+            attach(clef, note)
         return clef
 
     @staticmethod
-    def _get_ottava_from_clef(clef: Clef | None) -> Ottava | None:
-        if clef is None:
-            return None
-        if clef == Clef("bass_15"):
-            return Ottava(n=-2)
-        if clef == Clef("bass_8"):
-            return Ottava(n=-1)
-        if clef == Clef("bass"):
-            return Ottava(n=0)
-        if clef == Clef("treble"):
-            return Ottava(n=0)
-        if clef == Clef("treble^8"):
-            return Ottava(n=1)
-        return Ottava(n=2)
-
-    @classmethod
     def _set_ottava(
-        cls, note: Note, clef: Clef | None, current_ottava: Ottava | None
-    ):
-        new_ottava = cls._get_ottava_from_clef(clef)
-        if new_ottava and new_ottava != current_ottava:
-            attach(new_ottava, note)
-        return new_ottava
+        note: Note, ottava: Ottava | None, current_ottava: Ottava | None
+    ) -> Ottava | None:
+        if ottava and ottava != current_ottava:
+            attach(ottava, note)
+        return ottava
 
     @classmethod
     def _set_clefs(cls, notes: list[Note], use_ottava=False):
-        first_note = notes[0]
-        clef = cls._get_clef(first_note)
-        current_clef = cls._set_clef(first_note, clef, use_ottava=use_ottava)
-        current_ottava = None
-        if use_ottava:
-            current_ottava = cls._set_ottava(first_note, clef, current_ottava)
-        for note in notes[1:]:
-            clef = cls._get_clef(note)
-            if clef != current_clef:
-                cls._set_clef(note, clef, use_ottava=use_ottava)
+        current_clef: Clef | None = None
+        current_ottava: Ottava | None = None
+        for index, note in enumerate(notes):
+            clef, ottava = cls._get_clef_and_ottava(cls._get_octave(note))
+            if not index:
+                current_clef = cls._set_clef(note, clef, use_ottava)
+            else:
+                if clef != current_clef:
+                    cls._set_clef(note, clef, use_ottava)
+                current_clef = clef
             if use_ottava:
-                current_ottava = cls._set_ottava(note, clef, current_ottava)
-            current_clef = clef
+                current_ottava = cls._set_ottava(note, ottava, current_ottava)
 
     @staticmethod
     def _get_staff_name(name: str | None) -> str:
@@ -381,7 +497,6 @@ class Notation:
         note: Note,
         time_signature: TimeSignature | None,
     ):
-        cls._set_clefs([note])
         staff = cls._get_staff(index, time_signature, note)
         staff_group.insert(0, staff)
 
@@ -446,12 +561,14 @@ class Notation:
         melody_note: MeteredLeaf | None = None,
         previous_note: MeteredLeaf | None = None,
     ):
+        quantize_matrix_pitches(matrix.sorted_pitches, self._tuning)
         for index, frequency in enumerate(matrix.sorted_pitches):
             matrix_note = self._get_matrix_note_from_melody_note(
                 frequency, melody_note
             )
             staff_names = [staff.name for staff in staff_group]
             staff_name = str(index)
+            self._add_octave_to_staff(staff_name, matrix_note)
             time_signature = self._get_melody_note_time_signature(melody_note)
             if staff_name not in staff_names:
                 self._add_new_staff(
@@ -480,41 +597,44 @@ class Notation:
             last_leaf = leaves[-1]
             attach(BarLine("|."), last_leaf)
 
-    @classmethod
-    def _set_staff_group_clefs(cls, staff_group: StaffGroup):
-        staves = [
-            staff
-            for staff in staff_group
-            if staff.name not in ["bass", "melody"]
-        ]
-        for staff in staves:
-            written_pitches = [note.written_pitch for note in get_notes(staff)]
-            pitches = [note for note in written_pitches if note]
-            octaves = [pitch.octave.number for pitch in pitches]
-            octave = mode(octaves)
-            clef = cls._get_clef(octave=octave)
-            leaves = get_leaves(staff)
-            if not leaves:
+    def _set_staff_group_clefs(self, staff_group: StaffGroup):
+        for staff in staff_group:
+            octaves = self._staff_octaves.get(staff.name)
+            first_leaf = self._staff_first_leaves.get(staff.name)
+            if not octaves or not first_leaf:
                 continue
-            first_leaf = leaves[0]
-            attach(clef, first_leaf)
+            [(octave, _)] = octaves.most_common(1)
+            clef = self._get_clef(octave=octave)
+            if clef:
+                attach(clef, first_leaf)
 
     def _get_ensemble_score(self) -> Score:
+        self._staff_octaves.clear()
+        self._staff_first_leaves.clear()
         staff_group = StaffGroup()
         passage = self._passage
         if passage:
             for staff in reversed(self._input_staves):
                 staff_group.append(staff)
+            voice_leading = None
             for matrix_leaf in self._matrix_leaves:
                 duration = matrix_leaf.duration
                 if not duration:
                     continue
-                if matrix_leaf.contains_pitches:
+                if self._voice_leading:
+                    if not voice_leading:
+                        voice_leading = VoiceLeading(
+                            len(matrix_leaf.instrument_names)
+                        )
+                    self._add_voices_to_staff(
+                        matrix_leaf, staff_group, voice_leading
+                    )
+                elif matrix_leaf.contains_pitches:
                     self._add_notes_to_staff(matrix_leaf, staff_group)
                 else:
                     self._add_rests_to_staff(matrix_leaf, staff_group)
         else:
-            for matrix in self._matrices:
+            for matrix in self._track(self._matrices):
                 self._add_matrix_to_staff_group(matrix, staff_group)
         self._add_double_bar_lines(staff_group)
         self._set_staff_group_clefs(staff_group)
@@ -523,12 +643,9 @@ class Notation:
         return score
 
     def _get_matrix_notes(self, matrix: Matrix) -> list[Note]:
+        quantize_matrix_pitches(matrix.sorted_pitches, self._tuning)
         notes = [
-            self._get_note(
-                frequency.frequency,
-                is_base_frequency=frequency.is_base_frequency,
-                is_base_multiple=frequency.is_base_multiple,
-            )
+            self._get_note(frequency)
             for frequency in matrix.sorted_pitches
             if frequency.frequency
         ]
@@ -556,9 +673,23 @@ class Notation:
             components = notes
         return Score([Staff(components)])
 
-    def _get_reference_score(self) -> list[Score]:
-        scores = [self._get_matrix_score(matrix) for matrix in self._matrices]
-        for index, score in enumerate(scores):
+    def _get_reference_score(
+        self, matrices: Iterable[Matrix] | None = None, start: int = 0
+    ) -> list[Score] | list[str]:
+        if matrices is None:
+            matrices = self._track(self._matrices)
+        if self._fast_output:
+            return [
+                get_reference_score(
+                    matrix.sorted_pitches,
+                    self._tuning,
+                    index + 1,
+                    as_chord=self._as_chord,
+                )
+                for index, matrix in enumerate(matrices, start=start)
+            ]
+        scores = [self._get_matrix_score(matrix) for matrix in matrices]
+        for index, score in enumerate(scores, start=start):
             staff = next(iter(score.components), None)
             if staff:
                 name = index + 1
@@ -566,7 +697,7 @@ class Notation:
         return scores
 
     @property
-    def _scores(self) -> list[Score]:
+    def _scores(self) -> list[Score] | list[str]:
         if self._as_ensemble:
             return [self._get_ensemble_score()]
         return self._get_reference_score()
@@ -575,10 +706,8 @@ class Notation:
     def _title(self) -> str:
         if not self._passage:
             if self._number_of_matrices > 1:
-                matrix_display = "Matrices"
-            else:
-                matrix_display = "Matrix"
-            return f"Combination-Tone {matrix_display}"
+                return "Combination-Tone Matrices"
+            return self._matrix_title
         return self._passage.title
 
     @cached_property
@@ -603,13 +732,15 @@ class Notation:
             return ""
         return "indent = 0"
 
-    @property
-    def _lilypond_preamble(self) -> str:
+    def _get_lilypond_preamble(
+        self, title: str, composer: str, page_numbers: bool = True
+    ) -> str:
+        print_page_number = "" if page_numbers else "print-page-number = ##f"
         return f"""
                     \\header {{
                         tagline = ##f
-                        title = "{self._title}"
-                        composer = "{self._composer}"
+                        title = "{title}"
+                        composer = "{composer}"
                     }}
 
                     \\paper {{
@@ -618,6 +749,7 @@ class Notation:
                         right-margin = 0.75\\in
                         top-margin = 0.5\\in
                         bottom-margin = 0.5\\in
+                        {print_page_number}
                     }}
 
                     \\layout {{
@@ -630,6 +762,10 @@ class Notation:
                     }}
                 """
 
+    @property
+    def _lilypond_preamble(self) -> str:
+        return self._get_lilypond_preamble(self._title, self._composer)
+
     @staticmethod
     def _format_for_filename(text: str) -> str:
         return text.lower().replace(" ", "-")
@@ -640,16 +776,134 @@ class Notation:
             return "ensemble"
         return "reference"
 
-    def notate(self):
-        lilypond_file = LilyPondFile([self._lilypond_preamble] + self._scores)
+    @property
+    def _lilypond_file(self) -> LilyPondFile:
+        return LilyPondFile([self._lilypond_preamble] + self._scores)
+
+    @property
+    def _pdf_file_path(self) -> Path:
+        composer = self._format_for_filename(self._composer)
+        title = self._format_for_filename(self._title)
+        output_type = self._output_type
+        return (
+            self._output_directory
+            / f"{composer}-{title}-{output_type}-matrices.pdf"
+        )
+
+    def _get_lilypond_source(self) -> str:
+        return lilypond(self._lilypond_file)
+
+    def _get_async_pdf_file_path(self) -> Path:
         if self._save:
-            composer = self._format_for_filename(self._composer)
-            title = self._format_for_filename(self._title)
-            output_type = self._output_type
-            pdf_file_path = (
-                self._output_directory
-                / f"{composer}-{title}-{output_type}-matrices.pdf"
+            return self._pdf_file_path
+        output_directory = Path(Configuration()["abjad_output_directory"])
+        title = self._format_for_filename(self._title)
+        return output_directory / f"{title}-{uuid4().hex}.pdf"
+
+    def _get_chunk_sources(self, chunk_size: int) -> Iterator[str]:
+        if self._as_ensemble:
+            yield self._get_lilypond_source()
+            return
+        preamble = self._get_lilypond_preamble(
+            self._title, self._composer, page_numbers=False
+        )
+        for index, matrices in enumerate(chunked(self._matrices, chunk_size)):
+            scores = self._get_reference_score(matrices, index * chunk_size)
+            yield lilypond(LilyPondFile([preamble] + scores))
+            if not index:
+                preamble = self._get_lilypond_preamble(
+                    "", "", page_numbers=False
+                )
+
+    async def _engrave(
+        self,
+        lilypond_source: str,
+        pdf_file_path: Path,
+        timeout: float | None = None,
+    ):
+        pdf_file_path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(
+            "w", suffix=".ly", dir=pdf_file_path.parent, delete=False
+        ) as ly_file:
+            ly_file.write(lilypond_source)
+        ly_file_path = Path(ly_file.name)
+        engraved_file_path = ly_file_path.with_suffix(".pdf")
+        try:
+            await run_subprocess(
+                get_lilypond_path(),
+                "-dno-point-and-click",
+                "-o",
+                str(engraved_file_path.with_suffix("")),
+                str(ly_file_path),
+                timeout=timeout,
+            )
+            replace(engraved_file_path, pdf_file_path)
+            if not self._save:
+                replace(ly_file_path, pdf_file_path.with_suffix(".ly"))
+        finally:
+            ly_file_path.unlink(missing_ok=True)
+            engraved_file_path.unlink(missing_ok=True)
+
+    async def notate_async(self, timeout: float | None = None) -> Path:
+        lilypond_source = await to_thread(self._get_lilypond_source)
+        pdf_file_path = self._get_async_pdf_file_path()
+        await self._engrave(lilypond_source, pdf_file_path, timeout)
+        return pdf_file_path
+
+    async def notate_pipelined(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float | None = None,
+    ) -> Path:
+        pdf_file_path = self._get_async_pdf_file_path()
+        semaphore = Semaphore(concurrency)
+
+        async def engrave(lilypond_source: str, chunk_path: Path):
+            try:
+                await self._engrave(lilypond_source, chunk_path, timeout)
+            finally:
+                semaphore.release()
+
+        with TemporaryDirectory() as directory:
+            chunk_paths: list[Path] = []
+            sources = self._get_chunk_sources(chunk_size)
+            async with TaskGroup() as task_group:
+                while lilypond_source := await to_thread(next, sources, ""):
+                    await semaphore.acquire()
+                    chunk_path = Path(directory) / f"{len(chunk_paths)}.pdf"
+                    chunk_paths.append(chunk_path)
+                    task_group.create_task(
+                        engrave(lilypond_source, chunk_path)
+                    )
+            pdf_file_path.parent.mkdir(parents=True, exist_ok=True)
+            await run_subprocess(
+                get_ghostscript_path(),
+                "-q",
+                "-dBATCH",
+                "-dNOPAUSE",
+                "-dSAFER",
+                "-sDEVICE=pdfwrite",
+                f"-sOutputFile={pdf_file_path}",
+                *map(str, chunk_paths),
+                timeout=timeout,
+            )
+        return pdf_file_path
+
+    def notate(self):
+        if self._engraving_workers > 1:
+            pdf_file_path = run(
+                self.notate_pipelined(concurrency=self._engraving_workers)
             )
+            if self._save:
+                print(f"Score saved to: {pdf_file_path}")
+            else:
+                open_file(str(pdf_file_path))
+            return
+        self._show_progress = True
+        lilypond_file = self._lilypond_file
+        if self._save:
+            pdf_file_path = self._pdf_file_path
             with Progress() as progress:
                 progress.add_task("Engraving score...", total=None)
                 as_pdf(
@@ -660,3 +914,21 @@ class Notation:
             with Progress() as progress:
                 progress.add_task("Engraving score...", total=None)
                 show(lilypond_file)
+
+
+async def notate_all(
+    notations: Iterable[Notation],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float | None = None,
+) -> list[Path]:
+    semaphore = Semaphore(concurrency)
+
+    async def notate(notation: Notation) -> Path:
+        async with semaphore:
+            return await notation.notate_async(timeout)
+
+    async with TaskGroup() as task_group:
+        tasks = [
+            task_group.create_task(notate(notation)) for notation in notations
+        ]
+    return [task.result() for task in tasks]
@@ -1,43 +1,69 @@
-from dataclasses import dataclass
+from copy import copy
 from typing import cast
 
 from abjad import (
+    Clef,
+    Component,
+    Container,
     Duration,
     Leaf,
     LilyPondFile,
-    MultimeasureRest,
     NamedPitch,
-    Note,
     Staff,
     Tie,
     TimeSignature,
     Tuplet,
+    attach,
+    detach,
     parse,
 )
-from abjad.get import duration as get_duration
+from abjad.get import effective as get_effective
 from abjad.get import indicators as get_indicators
 from abjad.get import parentage as get_parentage
+from abjad.get import timespan as get_timespan
+from abjad.mutate import copy as copy_components
+from abjad.mutate import split as split_components
 from abjad.select import components as get_components
 from abjad.select import leaves as get_leaves
-from more_itertools import seekable
 
 from .helpers import InputPart, get_staff_by_name
-
-
-@dataclass
-class MeteredLeaf:
-    leaf: Leaf
-    time_signature: TimeSignature
+from .lilypond_reader import read_metered_staff
+from .timeline import (
+    LeafType,
+    MeteredLeaf,
+    Timeline,
+    get_duration_from_ticks,
+)
 
 
 class Part:
-    def __init__(self, lilypond_input: str, input_part: InputPart):
-        self.input_staff = self._get_input_staff(lilypond_input, input_part)
-        metered_leaves = self._get_metered_leaves()
-        self._metered_leaves = seekable(metered_leaves)
+    def __init__(
+        self,
+        lilypond_input: str,
+        input_part: InputPart,
+        fast_input: bool = True,
+        metered_staff: tuple[Staff, list[MeteredLeaf]] | None = None,
+    ):
+        if fast_input and not metered_staff:
+            metered_staff = read_metered_staff(lilypond_input, input_part)
+        if metered_staff:
+            self.input_staff, metered_leaves = metered_staff
+        else:
+            self.input_staff = self._get_input_staff(
+                lilypond_input, input_part
+            )
+            metered_leaves = self._get_metered_leaves()
+        self.timeline = Timeline(metered_leaves)
         self._index = 0
-        self.remaining_duration: Duration | None = None
-        self.metered_leaf = self.get_next_metered_leaf()
+        self.remaining_ticks: int | None = None
+        self.get_next_metered_leaf()
+
+    def get_cursor(self) -> "Part":
+        cursor = copy(self)
+        cursor._index = 0
+        cursor.remaining_ticks = None
+        cursor.get_next_metered_leaf()
+        return cursor
 
     @classmethod
     def _get_input_staff(
@@ -51,6 +77,74 @@ class Part:
         )
         return get_staff_by_name(staves, input_part)
 
+    @staticmethod
+    def _get_window_components(
+        first_leaf: Leaf, last_leaf: Leaf
+    ) -> list[Component]:
+        first_parentage = get_parentage(first_leaf).components
+        last_parentage = get_parentage(last_leaf).components
+        for index, component in enumerate(first_parentage[1:]):
+            if component in last_parentage:
+                container = cast(Container, component)
+                first_child = first_parentage[index]
+                last_child = last_parentage[
+                    last_parentage.index(component) - 1
+                ]
+                start = container.index(first_child)
+                stop = container.index(last_child) + 1
+                return container[start:stop]
+        return [first_leaf]
+
+    @staticmethod
+    def _trim_window_staff(
+        window_staff: Staff, start: Duration, duration: Duration
+    ):
+        durations = [start, duration] if start else [duration]
+        groups = split_components(window_staff[:], durations)
+        if start:
+            groups.pop(1)
+        else:
+            groups.pop(0)
+        for group in groups:
+            for component in group:
+                cast(Container, get_parentage(component).parent).remove(
+                    component
+                )
+        for container in get_components(window_staff, prototype=Container):
+            if not len(container) and container is not window_staff:
+                cast(Container, get_parentage(container).parent).remove(
+                    container
+                )
+
+    def get_window_staff(self, start_ticks: int, end_ticks: int) -> Staff:
+        timeline = self.timeline
+        staff = self.input_staff
+        first_row = max(timeline.get_row(start_ticks), 0)
+        last_row = timeline.get_row(end_ticks - 1)
+        if staff is None or last_row < first_row:
+            return Staff()
+        first_leaf = timeline.metered_leaves[first_row].leaf
+        last_leaf = timeline.metered_leaves[last_row].leaf
+        components = self._get_window_components(first_leaf, last_leaf)
+        window_staff = Staff(copy_components(components), name=staff.name)
+        resolution = timeline.resolution
+        offset = get_timespan(components[0]).start_offset
+        start = Duration(
+            get_duration_from_ticks(start_ticks, resolution) - offset
+        )
+        duration = get_duration_from_ticks(end_ticks - start_ticks, resolution)
+        self._trim_window_staff(window_staff, start, duration)
+        window_leaves = get_leaves(window_staff)
+        window_first_leaf = window_leaves[0]
+        detach(Tie, window_leaves[-1])
+        time_signature = timeline.get_time_signature(first_row)
+        for indicator in get_effective(first_leaf, Clef), time_signature:
+            if indicator and not get_indicators(
+                window_first_leaf, prototype=type(indicator)
+            ):
+                attach(indicator, window_first_leaf)
+        return window_staff
+
     @staticmethod
     def _get_time_signature(leaf: Leaf) -> TimeSignature | None:
         time_signatures = get_indicators(leaf, prototype=TimeSignature)
@@ -69,120 +163,167 @@ class Part:
             notes_in_measure.append(MeteredLeaf(leaf, current_time_signature))
         return notes_in_measure
 
-    def _shorten_leaf(self, duration: Duration):
-        remaining_duration = self.remaining_duration
-        if not remaining_duration:
+    def _shorten_leaf(self, ticks: int):
+        remaining_ticks = self.remaining_ticks
+        if not remaining_ticks:
             return
-        shortened_duration = remaining_duration - duration
-        if not shortened_duration:
+        shortened_ticks: int | None = remaining_ticks - ticks
+        if not shortened_ticks:
             return
-        if shortened_duration >= 0:
-            self.remaining_duration = shortened_duration
+        if shortened_ticks >= 0:
+            self.remaining_ticks = shortened_ticks
             return
         self.get_next_metered_leaf()
-        shortened_duration = abs(shortened_duration)
-        if self.remaining_duration == shortened_duration:
-            shortened_duration = None
-        self.get_next_metered_leaf(shortened_duration)
+        shortened_ticks = abs(shortened_ticks)
+        if self.remaining_ticks == shortened_ticks:
+            shortened_ticks = None
+        self.get_next_metered_leaf(shortened_ticks)
 
     def get_next_metered_leaf(
         self,
-        shorten_duration: Duration | None = None,
-        skip_duration: Duration | None = None,
+        shorten_ticks: int | None = None,
+        skip_ticks: int | None = None,
     ) -> MeteredLeaf | None:
-        if shorten_duration:
-            self._shorten_leaf(shorten_duration)
+        if shorten_ticks:
+            self._shorten_leaf(shorten_ticks)
             return None
-        duration_skipped = self.remaining_duration
-        next_leaf = next(self._metered_leaves, None)
-        if skip_duration and duration_skipped is not None:
-            while not duration_skipped or duration_skipped < skip_duration:
-                next_leaf = next(self._metered_leaves, None)
-                if next_leaf:
-                    duration_skipped += get_duration(next_leaf.leaf)
-        if next_leaf:
-            self.remaining_duration = get_duration(next_leaf.leaf)
-        self.metered_leaf = next_leaf
+        timeline = self.timeline
+        ticks_skipped = self.remaining_ticks
+        if skip_ticks and ticks_skipped is not None:
+            while (
+                not ticks_skipped or ticks_skipped < skip_ticks
+            ) and timeline.contains(self._index + 1):
+                self._index += 1
+                ticks_skipped += timeline.get_duration_ticks(self._index)
+        if timeline.contains(self._index):
+            self.remaining_ticks = timeline.get_duration_ticks(self._index)
         self._index += 1
-        return next_leaf
+        return self.metered_leaf
 
-    def peek(self, duration: Duration | None = None) -> MeteredLeaf | None:
-        if duration and duration < self.remaining_duration:
-            return self.metered_leaf
-        next_leaf = self._metered_leaves.peek(None)
-        return next_leaf
+    def set_resolution(self, resolution: int):
+        timeline = self.timeline
+        scale = resolution // timeline.resolution
+        timeline.set_resolution(resolution)
+        if self.remaining_ticks is not None:
+            self.remaining_ticks *= scale
+
+    @property
+    def _row(self) -> int:
+        return self._index - 1
+
+    @property
+    def metered_leaf(self) -> MeteredLeaf | None:
+        return self.timeline.get_metered_leaf(self._row)
+
+    def _get_peek_row(self, ticks: int | None = None) -> int:
+        if ticks and self.remaining_ticks and ticks < self.remaining_ticks:
+            return self._row
+        return self._index
+
+    def peek(self, ticks: int | None = None) -> MeteredLeaf | None:
+        return self.timeline.get_metered_leaf(self._get_peek_row(ticks))
+
+    def peek_hertz(self, ticks: int | None = None) -> float | None:
+        return self.timeline.get_hertz(self._get_peek_row(ticks))
 
     def seek(self, index: int):
-        index = index - 1
-        self._metered_leaves.seek(index)
-        self._index = index
-        self.metered_leaf = self.get_next_metered_leaf()
+        self._index = index - 1
+        self.get_next_metered_leaf()
+
+    def seek_ticks(self, ticks: int):
+        timeline = self.timeline
+        row = timeline.get_row(ticks)
+        self.seek(row + 1)
+        if timeline.contains(row) and self.remaining_ticks:
+            offset = ticks - timeline.onset_ticks[row]
+            if offset < self.remaining_ticks:
+                self.remaining_ticks -= offset
+            else:
+                self.get_next_metered_leaf()
+
+    def seek_measure(self, measure: int):
+        self.seek_ticks(self.timeline.get_measure_onset_ticks(measure))
+
+    @property
+    def onset_ticks(self) -> int:
+        timeline = self.timeline
+        row = self._row
+        if not timeline.contains(row) or self.remaining_ticks is None:
+            return timeline.end_ticks
+        return (
+            timeline.onset_ticks[row]
+            + timeline.get_duration_ticks(row)
+            - self.remaining_ticks
+        )
+
+    @property
+    def _leaf_type(self) -> LeafType | None:
+        return self.timeline.get_leaf_type(self._row)
+
+    @property
+    def is_note(self) -> bool:
+        return self._leaf_type == LeafType.NOTE
 
     @property
     def named_pitch(self) -> NamedPitch | None:
-        metered_leaf = self.metered_leaf
-        if not metered_leaf or not isinstance(metered_leaf.leaf, Note):
-            return None
-        return metered_leaf.leaf.written_pitch
+        return self.timeline.get_named_pitch(self._row)
 
     @property
-    def matrix_duration(self) -> Duration | None:
-        remaining_duration = self.remaining_duration
+    def remaining_duration(self) -> Duration | None:
+        return self.timeline.get_duration_from_ticks(self.remaining_ticks)
+
+    @property
+    def matrix_ticks(self) -> int | None:
+        remaining_ticks = self.remaining_ticks
         if (
             self.tuplet
-            or self.metered_leaf
-            and isinstance(self.metered_leaf.leaf, Note)
-            and remaining_duration
-            and not remaining_duration.is_assignable
+            or self.is_note
+            and remaining_ticks
+            and not self.timeline.is_assignable(remaining_ticks)
         ):
-            return self.written_duration
-        return remaining_duration
+            return self.written_ticks
+        return remaining_ticks
+
+    @property
+    def matrix_duration(self) -> Duration | None:
+        return self.timeline.get_duration_from_ticks(self.matrix_ticks)
+
+    @property
+    def written_ticks(self) -> int | None:
+        return self.timeline.get_written_duration_ticks(self._row)
 
     @property
     def written_duration(self) -> Duration | None:
-        metered_leaf = self.metered_leaf
-        if not metered_leaf:
-            return None
-        return metered_leaf.leaf.written_duration
+        return self.timeline.get_duration_from_ticks(self.written_ticks)
+
+    @property
+    def time_signature(self) -> TimeSignature | None:
+        return self.timeline.get_time_signature(self._row)
 
     @property
     def is_start_of_written_note(self) -> bool:
-        return self.remaining_duration == self.written_duration
+        return self.remaining_ticks == self.written_ticks
 
     @property
     def is_multi_measure_rest(self) -> bool:
-        if not self.metered_leaf or not isinstance(
-            self.metered_leaf.leaf, MultimeasureRest
-        ):
-            return False
-        return True
+        return self._leaf_type == LeafType.MULTI_MEASURE_REST
 
     @property
     def hertz(self) -> float | None:
-        named_pitch = self.named_pitch
-        if not named_pitch:
-            return None
-        return named_pitch.hertz
+        return self.timeline.get_hertz(self._row)
 
     @property
     def tie(self) -> bool:
-        if not self.metered_leaf:
-            return False
-        ties = get_indicators(self.metered_leaf.leaf, prototype=Tie)
-        return bool(ties)
+        return self.timeline.get_tie(self._row)
 
     @property
     def tuplet(self) -> Tuplet | None:
-        if not self.metered_leaf or not self.remaining_duration:
+        if not self.remaining_ticks:
             return None
-        leaf = self.metered_leaf.leaf
-        parent = get_parentage(leaf).parent
-        if isinstance(parent, Tuplet):
-            return parent
-        return None
+        return self.timeline.get_tuplet(self._row)
 
     @property
     def is_start_of_tuplet(self) -> bool:
-        if not self.metered_leaf or not self.tuplet:
+        if not self.tuplet:
             return False
-        return self.tuplet.index(self.metered_leaf.leaf) == 0
+        return self.timeline.get_is_start_of_tuplet(self._row)
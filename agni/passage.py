@@ -1,13 +1,22 @@
-from functools import cached_property
+from collections import Counter
+from collections.abc import Iterator
+from copy import copy
+from dataclasses import replace
+from fractions import Fraction
+from math import lcm
 from pathlib import Path
 
-from abjad import Duration, Note, Staff, Tuplet
+from abjad import Duration, Staff, Tuplet
+from rich import print
 
-from .helpers import InputPart
+from .helpers import InputPart, atomic_cached_property, stylize
 from .matrix import DisplayFormat, Matrix
 from .matrix_leaf import MatrixLeaf
-from .matrix_pitch import PitchType, Tuning
+from .matrix_pitch import DisplayColor, PitchType, ToneSet, Tuning
+from .midi_reader import MIDI_SUFFIXES, MidiReader
+from .musicxml_reader import MUSICXML_SUFFIXES, MusicXmlReader
 from .part import Part
+from .timeline import get_assignable_durations, get_duration_from_ticks
 
 
 class Passage:
@@ -20,18 +29,46 @@ class Passage:
         display_format: DisplayFormat,
         as_set: bool,
         adjacent_duplicates: bool,
+        fast_input: bool = True,
+        unordered: bool = False,
+        counts: bool = False,
+        tone_set: ToneSet = ToneSet.SUM,
+        bass_track: int | None = None,
+        melody_track: int | None = None,
+        bars: tuple[int, int] | None = None,
+        start: Fraction | None = None,
+        end: Fraction | None = None,
     ):
-        lilypond_input = input_file.read_text()
         self._multiples = multiples
         self._pitch_type = pitch_type
         self._tuning = tuning
         self._display_format = display_format
         self._as_set = as_set
         self._adjacent_duplicates = adjacent_duplicates
-        self.title = self._get_title(lilypond_input)
-        self.composer = self._get_composer(lilypond_input)
-        self._bass = self._get_bass(lilypond_input)
-        self._melody = self._get_melody(lilypond_input)
+        self._fast_input = fast_input
+        self._unordered = unordered
+        self._counts = counts
+        self._tone_set = tone_set
+        suffix = input_file.suffix.lower()
+        if suffix in MIDI_SUFFIXES or suffix in MUSICXML_SUFFIXES:
+            if suffix in MIDI_SUFFIXES:
+                reader = MidiReader(
+                    input_file.read_bytes(), bass_track, melody_track
+                )
+            else:
+                reader = MusicXmlReader(input_file, bass_track, melody_track)
+            self.title = reader.title or input_file.stem
+            self.composer = reader.composer
+            self._bass = self._get_score_part(reader, InputPart.BASS)
+            self._melody = self._get_score_part(reader, InputPart.MELODY)
+        else:
+            lilypond_input = input_file.read_text()
+            self.title = self._get_title(lilypond_input)
+            self.composer = self._get_composer(lilypond_input)
+            self._bass = self._get_bass(lilypond_input)
+            self._melody = self._get_melody(lilypond_input)
+        self._resolution = self._get_resolution(start, end)
+        self._window = self._get_window(bars, start, end)
 
     @staticmethod
     def _get_header_item(lilypond_input: str, item: str) -> str:
@@ -50,18 +87,75 @@ class Passage:
         return cls._get_header_item(lilypond_input, "composer")
 
     def _get_bass(self, lilypond_input: str) -> Part:
-        return Part(lilypond_input, InputPart.BASS)
+        return Part(lilypond_input, InputPart.BASS, self._fast_input)
 
     def _get_melody(self, lilypond_input) -> Part:
-        return Part(lilypond_input, InputPart.MELODY)
+        return Part(lilypond_input, InputPart.MELODY, self._fast_input)
+
+    @staticmethod
+    def _get_score_part(
+        reader: MidiReader | MusicXmlReader, input_part: InputPart
+    ) -> Part:
+        metered_staff = reader.get_metered_staff(input_part)
+        return Part("", input_part, metered_staff=metered_staff)
+
+    def _get_resolution(self, *offsets: Fraction | None) -> int:
+        resolution = lcm(
+            *(part.timeline.minimum_resolution for part in self._parts),
+            *(offset.denominator for offset in offsets if offset),
+        )
+        for part in self._parts:
+            part.set_resolution(resolution)
+        return resolution
+
+    @property
+    def _end_ticks(self) -> int:
+        return max(part.timeline.end_ticks for part in self._parts)
+
+    def _get_window(
+        self,
+        bars: tuple[int, int] | None,
+        start: Fraction | None,
+        end: Fraction | None,
+    ) -> tuple[int, int] | None:
+        end_ticks = self._end_ticks
+        if bars:
+            first_bar, last_bar = bars
+            timeline = max(
+                (part.timeline for part in self._parts),
+                key=lambda timeline: timeline.measure_count,
+            )
+            return (
+                min(
+                    timeline.get_measure_onset_ticks(max(first_bar, 1)),
+                    end_ticks,
+                ),
+                min(timeline.get_measure_onset_ticks(last_bar + 1), end_ticks),
+            )
+        if start is None and end is None:
+            return None
+        start_ticks = min(self._get_ticks(start), end_ticks)
+        if end is None:
+            return start_ticks, end_ticks
+        return start_ticks, min(self._get_ticks(end), end_ticks)
+
+    def _get_duration(self, ticks: int | None) -> Duration | None:
+        if ticks is None:
+            return None
+        return get_duration_from_ticks(ticks, self._resolution)
+
+    def _get_staff(self, part: Part) -> Staff:
+        if self._window:
+            return part.get_window_staff(*self._window)
+        return part.input_staff or Staff()
 
     @property
     def bass_staff(self) -> Staff:
-        return self._bass.input_staff or Staff()
+        return self._get_staff(self._bass)
 
     @property
     def melody_staff(self) -> Staff:
-        return self._melody.input_staff or Staff()
+        return self._get_staff(self._melody)
 
     @property
     def _parts(self) -> tuple[Part, Part]:
@@ -71,28 +165,23 @@ class Passage:
     def _contains_more_leaves(self) -> bool:
         return any([part.metered_leaf for part in self._parts])
 
+    @property
+    def _onset_ticks(self) -> int:
+        return min(part.onset_ticks for part in self._parts)
+
     @property
     def _leaves_are_notes(self) -> bool:
-        bass_metered_leaf = self._bass.metered_leaf
-        melody_metered_leaf = self._melody.metered_leaf
-        if (
-            bass_metered_leaf
-            and melody_metered_leaf
-            and isinstance(bass_metered_leaf.leaf, Note)
-            and isinstance(melody_metered_leaf.leaf, Note)
-        ):
-            return True
-        return False
+        return self._bass.is_note and self._melody.is_note
 
     @property
     def _leaves_are_notes_of_different_durations(self) -> bool:
-        bass_duration = self._bass.remaining_duration
-        melody_duration = self._melody.remaining_duration
+        bass_ticks = self._bass.remaining_ticks
+        melody_ticks = self._melody.remaining_ticks
         if (
             self._leaves_are_notes
-            and bass_duration
-            and melody_duration
-            and bass_duration != melody_duration
+            and bass_ticks
+            and melody_ticks
+            and bass_ticks != melody_ticks
         ):
             return True
         return False
@@ -101,13 +190,13 @@ class Passage:
     def _bass_is_shorter_than_melody(self) -> bool:
         bass = self._bass
         melody = self._melody
-        bass_duration = bass.remaining_duration
-        melody_duration = melody.remaining_duration
+        bass_ticks = bass.remaining_ticks
+        melody_ticks = melody.remaining_ticks
         if (
             self._leaves_are_notes_of_different_durations
-            and bass_duration
-            and melody_duration
-            and bass_duration < melody_duration
+            and bass_ticks
+            and melody_ticks
+            and bass_ticks < melody_ticks
         ):
             return True
         return False
@@ -134,26 +223,26 @@ class Passage:
             or longer_part.tie
         ):
             return False
-        shorter_duration = shorter_part.remaining_duration
-        duration_seeked = shorter_duration
+        shorter_ticks = shorter_part.remaining_ticks
+        ticks_seeked = shorter_ticks
         shorter_part_index = shorter_part._index
         longer_part_has_shortest_sounding_note = False
         while (
             shorter_part.tie
-            and duration_seeked
-            and duration_seeked < longer_part.remaining_duration
+            and ticks_seeked
+            and ticks_seeked < longer_part.remaining_ticks
         ):
             shorter_part.get_next_metered_leaf()
-            duration_seeked += shorter_part.remaining_duration
-        longer_written_duration = longer_part.written_duration
+            ticks_seeked += shorter_part.remaining_ticks
+        longer_written_ticks = longer_part.written_ticks
         if (
-            duration_seeked
-            and duration_seeked >= longer_written_duration
+            ticks_seeked
+            and ticks_seeked >= longer_written_ticks
             and longer_part.is_start_of_written_note
         ):
             longer_part_has_shortest_sounding_note = True
         shorter_part.seek(shorter_part_index)
-        shorter_part.remaining_duration = shorter_duration
+        shorter_part.remaining_ticks = shorter_ticks
         return longer_part_has_shortest_sounding_note
 
     @property
@@ -171,39 +260,28 @@ class Passage:
 
     @property
     def _shorter_note_is_tied(self) -> bool:
-        bass_duration = self._bass.remaining_duration
-        melody_duration = self._melody.remaining_duration
+        bass_ticks = self._bass.remaining_ticks
+        melody_ticks = self._melody.remaining_ticks
         bass_tie = self._bass.tie
         melody_tie = self._melody.tie
-        if not bass_duration or not melody_duration:
+        if not bass_ticks or not melody_ticks:
             return False
         return (
             bass_tie
-            and bass_duration < melody_duration
+            and bass_ticks < melody_ticks
             or melody_tie
-            and melody_duration < bass_duration
+            and melody_ticks < bass_ticks
         )
 
     @staticmethod
     def _get_next_hertz_values(
-        next_leaf_instructions: dict[Part, Duration | None],
+        next_leaf_instructions: dict[Part, int | None],
     ) -> set[float | None]:
-        next_metered_leaves = [
-            part.peek(duration)
-            for part, duration in next_leaf_instructions.items()
-        ]
-        next_leaves = [
-            metered_leaf.leaf
-            for metered_leaf in next_metered_leaves
-            if metered_leaf
+        next_hertz_values = [
+            part.peek_hertz(ticks)
+            for part, ticks in next_leaf_instructions.items()
         ]
-        next_notes = [leaf for leaf in next_leaves if isinstance(leaf, Note)]
-        next_pitches = [
-            leaf.written_pitch
-            for leaf in next_notes
-            if leaf and leaf.written_pitch
-        ]
-        return {pitch.hertz for pitch in next_pitches}
+        return {hertz for hertz in next_hertz_values if hertz}
 
     @property
     def _hertz(self) -> set[float | None]:
@@ -212,14 +290,12 @@ class Passage:
         return {bass_hertz, melody_hertz}
 
     def _next_matrix_is_same(
-        self, next_leaf_instructions: dict[Part, Duration | None]
+        self, next_leaf_instructions: dict[Part, int | None]
     ) -> bool:
         next_hertz_values = self._get_next_hertz_values(next_leaf_instructions)
         return self._hertz == next_hertz_values
 
-    def _get_tie(
-        self, next_leaf_instructions: dict[Part, Duration | None]
-    ) -> bool:
+    def _get_tie(self, next_leaf_instructions: dict[Part, int | None]) -> bool:
         return (
             self._both_parts_are_tied
             or self._shorter_note_is_tied
@@ -244,63 +320,170 @@ class Passage:
             return longer_part.is_start_of_tuplet
         return shorter_part.is_start_of_tuplet
 
-    @cached_property
-    def matrix_leaves(self) -> list[MatrixLeaf]:
+    def _get_next_matrix_leaf(self) -> MatrixLeaf:
+        bass = self._bass
+        melody = self._melody
+        decrement_ticks: dict[Part, int | None] = {
+            melody: None,
+            bass: None,
+        }
+        shorter_part = self._shorter_part
+        longer_part = self._longer_part
+        if self._longer_part_has_shortest_sounding_note:
+            longer_ticks = longer_part.written_ticks
+            matrix_ticks = longer_ticks
+            decrement_ticks[shorter_part] = longer_ticks
+        else:
+            matrix_ticks = shorter_part.matrix_ticks
+            if self._leaves_are_notes_of_different_durations:
+                decrement_ticks[longer_part] = shorter_part.remaining_ticks
+        matrix_leaf = MatrixLeaf(
+            _bass=bass.named_pitch,
+            _melody=melody.named_pitch,
+            duration=self._get_duration(matrix_ticks),
+            is_multi_measure_rest=self._is_multi_measure_rest,
+            tie=self._get_tie(decrement_ticks),
+            tuplet=self._tuplet,
+            is_start_of_tuplet=self._is_start_of_tuplet,
+            _multiples=self._multiples,
+            _pitch_type=self._pitch_type,
+            _tuning=self._tuning,
+            _display_format=self._display_format,
+            _tone_set=self._tone_set,
+        )
+        for part, ticks in decrement_ticks.items():
+            part.get_next_metered_leaf(ticks)
+        return matrix_leaf
+
+    def _get_cursor(self) -> "Passage":
+        cursor = copy(self)
+        cursor._bass = self._bass.get_cursor()
+        cursor._melody = self._melody.get_cursor()
+        return cursor
+
+    def _get_ticks(self, duration: Fraction | None) -> int:
+        return int((duration or 0) * self._resolution)
+
+    def _get_clipped_matrix_leaves(
+        self, matrix_leaf: MatrixLeaf, ticks: int, tie: bool
+    ) -> list[MatrixLeaf]:
+        duration = get_duration_from_ticks(ticks, self._resolution)
+        tuplet = matrix_leaf.tuplet
+        if tuplet:
+            numerator, denominator = tuplet.multiplier
+            duration = Duration(duration / Fraction(numerator, denominator))
+        if matrix_leaf.is_multi_measure_rest:
+            durations = [duration]
+        else:
+            durations = get_assignable_durations(duration)
+        last_index = len(durations) - 1
+        return [
+            replace(
+                matrix_leaf,
+                duration=piece,
+                tie=tie if index == last_index else True,
+                is_start_of_tuplet=matrix_leaf.is_start_of_tuplet
+                and not index,
+            )
+            for index, piece in enumerate(durations)
+        ]
+
+    def _get_matrix_leaves(
+        self, start_ticks: int, end_ticks: int
+    ) -> list[MatrixLeaf]:
         leaves = []
-        while self._contains_more_leaves:
-            bass = self._bass
-            melody = self._melody
-            decrement_durations: dict[Part, Duration | None] = {
-                melody: None,
-                bass: None,
-            }
-            shorter_part = self._shorter_part
-            longer_part = self._longer_part
-            if self._longer_part_has_shortest_sounding_note:
-                longer_duration = longer_part.written_duration
-                matrix_duration = longer_duration
-                decrement_durations[shorter_part] = longer_duration
+        onset_ticks = start_ticks
+        while self._contains_more_leaves and onset_ticks < end_ticks:
+            matrix_leaf = self._get_next_matrix_leaf()
+            ticks = self._get_ticks(matrix_leaf.sounding_duration)
+            next_onset_ticks = self._onset_ticks
+            if next_onset_ticks <= onset_ticks:
+                next_onset_ticks = onset_ticks + ticks
+            clipped_ticks = min(next_onset_ticks, end_ticks) - onset_ticks
+            if clipped_ticks == ticks:
+                leaves.append(matrix_leaf)
             else:
-                matrix_duration = shorter_part.matrix_duration
-                if self._leaves_are_notes_of_different_durations:
-                    decrement_durations[longer_part] = (
-                        shorter_part.remaining_duration
+                tie = matrix_leaf.tie and next_onset_ticks < end_ticks
+                leaves.extend(
+                    self._get_clipped_matrix_leaves(
+                        matrix_leaf, clipped_ticks, tie
                     )
-            matrix_leaf = MatrixLeaf(
-                _bass=bass.named_pitch,
-                _melody=melody.named_pitch,
-                duration=matrix_duration,
-                is_multi_measure_rest=self._is_multi_measure_rest,
-                tie=self._get_tie(decrement_durations),
-                tuplet=self._tuplet,
-                is_start_of_tuplet=self._is_start_of_tuplet,
-                _multiples=self._multiples,
-                _pitch_type=self._pitch_type,
-                _tuning=self._tuning,
-                _display_format=self._display_format,
-            )
-            leaves.append(matrix_leaf)
-            for part, duration in decrement_durations.items():
-                part.get_next_metered_leaf(duration)
+                )
+            onset_ticks = next_onset_ticks
         return leaves
 
-    @property
-    def matrices(self) -> list[Matrix]:
-        matrices = [
-            matrix_leaf.matrix
+    def _get_window_matrix_leaves(
+        self, start_ticks: int, end_ticks: int
+    ) -> list[MatrixLeaf]:
+        for part in self._parts:
+            part.seek_ticks(start_ticks)
+        leaves = self._get_matrix_leaves(start_ticks, end_ticks)
+        if leaves:
+            leaves[-1].tie = False
+        return leaves
+
+    @atomic_cached_property
+    def matrix_leaves(self) -> list[MatrixLeaf]:
+        cursor = self._get_cursor()
+        if self._window:
+            return cursor._get_window_matrix_leaves(*self._window)
+        return cursor._get_matrix_leaves(0, cursor._end_ticks)
+
+    def _get_matrix_runs(self) -> Iterator[tuple[Matrix, int]]:
+        run_matrix = None
+        run_key = None
+        run_length = 0
+        for matrix_leaf in self.matrix_leaves:
+            matrix = matrix_leaf.matrix
+            if not matrix:
+                continue
+            key = matrix.get_key(self._unordered)
+            if run_matrix and key == run_key:
+                run_length += 1
+                continue
+            if run_matrix:
+                yield run_matrix, run_length
+            run_matrix = matrix
+            run_key = key
+            run_length = 1
+        if run_matrix:
+            yield run_matrix, run_length
+
+    def _get_unique_matrix_counts(self) -> list[tuple[Matrix, int]]:
+        matrices: dict[tuple[int | None, int | None], Matrix] = {}
+        counts: Counter[tuple[int | None, int | None]] = Counter()
+        for matrix, run_length in self._get_matrix_runs():
+            key = matrix.get_key(self._unordered)
+            matrices.setdefault(key, matrix)
+            counts[key] += run_length
+        return [(matrix, counts[key]) for key, matrix in matrices.items()]
+
+    @atomic_cached_property
+    def matrix_counts(self) -> list[tuple[Matrix, int]]:
+        if self._as_set:
+            return self._get_unique_matrix_counts()
+        if not self._adjacent_duplicates:
+            return list(self._get_matrix_runs())
+        return [
+            (matrix_leaf.matrix, 1)
             for matrix_leaf in self.matrix_leaves
             if matrix_leaf.matrix
         ]
-        if self._as_set:
-            return list(dict.fromkeys(matrices))
-        if not self._adjacent_duplicates:
-            return [
-                matrix
-                for index, matrix in enumerate(matrices)
-                if index == 0 or index != matrices[index - 1]
-            ]
-        return matrices
+
+    @property
+    def matrices(self) -> list[Matrix]:
+        return [matrix for matrix, _ in self.matrix_counts]
+
+    @staticmethod
+    def _display_count(count: int):
+        if count == 1:
+            occurrences = "occurrence"
+        else:
+            occurrences = "occurrences"
+        print(stylize(f"{count} {occurrences}", DisplayColor.LABEL))
 
     def display(self):
-        for matrix in self.matrices:
+        for matrix, count in self.matrix_counts:
             matrix.display()
+            if self._counts:
+                self._display_count(count)
@@ -0,0 +1,224 @@
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
+from heapq import nlargest
+from math import ceil, floor, inf, log2
+
+from abjad import NamedPitch
+from rich.box import SIMPLE
+from rich.console import Console
+from rich.table import Table
+
+from .helpers import stylize
+from .matrix import Matrix
+from .matrix_pitch import ToneSet
+from .tuning import CENTS_PER_OCTAVE, get_pitch_frequency
+
+
+def get_cents(frequency: float, reference: float) -> float:
+    return CENTS_PER_OCTAVE * log2(frequency / reference)
+
+
+def get_frequency_grid(low: float, high: float, step: float) -> list[float]:
+    steps = floor(get_cents(high, low) / step + 1e-9)
+    return [
+        low * 2 ** (index * step / CENTS_PER_OCTAVE)
+        for index in range(steps + 1)
+    ]
+
+
+@dataclass
+class SearchResult:
+    bass: float
+    melody: float
+    matches: int
+    deviation: float
+
+    def get_matrix(
+        self, multiples: int, tone_set: ToneSet = ToneSet.SUM
+    ) -> Matrix:
+        return Matrix(
+            str(self.bass), str(self.melody), multiples, tone_set=tone_set
+        )
+
+
+def _get_melody_index_range(
+    low: float,
+    high: float,
+    melody_low: float,
+    step: float,
+    count: int,
+) -> range:
+    if high <= 0:
+        return range(0)
+    start = 0
+    if low > 0:
+        start = max(start, ceil(get_cents(low, melody_low) / step) - 1)
+    stop = min(count, floor(get_cents(high, melody_low) / step) + 2)
+    return range(start, max(start, stop))
+
+
+def _search_bass_frequencies(
+    bass_frequencies: Sequence[float],
+    melody_frequencies: Sequence[float],
+    step: float,
+    targets: Sequence[float],
+    bass_multipliers: Sequence[int],
+    melody_multipliers: Sequence[int],
+    tolerance: float,
+    limit: int,
+) -> list[tuple[int, float, float, float]]:
+    melody_low = melody_frequencies[0]
+    count = len(melody_frequencies)
+    ratio = 2 ** (tolerance / CENTS_PER_OCTAVE)
+    candidates = []
+    for bass in bass_frequencies:
+        deviations = []
+        for target in targets:
+            row_deviation = inf
+            target_deviations = [inf] * count
+            bounds = (
+                (target / ratio, target * ratio),
+                (-target * ratio, -target / ratio),
+            )
+            for bass_multiplier in bass_multipliers:
+                offset = bass * bass_multiplier
+                for melody_multiplier in melody_multipliers:
+                    if not melody_multiplier:
+                        if offset:
+                            deviation = abs(get_cents(abs(offset), target))
+                            row_deviation = min(row_deviation, deviation)
+                        continue
+                    for low, high in bounds:
+                        indices = _get_melody_index_range(
+                            (low - offset) / melody_multiplier,
+                            (high - offset) / melody_multiplier,
+                            melody_low,
+                            step,
+                            count,
+                        )
+                        for index in indices:
+                            frequency = abs(
+                                offset
+                                + melody_frequencies[index] * melody_multiplier
+                            )
+                            if not frequency:
+                                continue
+                            deviation = abs(get_cents(frequency, target))
+                            target_deviations[index] = min(
+                                target_deviations[index], deviation
+                            )
+            deviations.append((row_deviation, target_deviations))
+        for index, melody in enumerate(melody_frequencies):
+            matches = 0
+            total_deviation = 0.0
+            for row_deviation, target_deviations in deviations:
+                deviation = min(row_deviation, target_deviations[index])
+                if deviation <= tolerance:
+                    matches += 1
+                    total_deviation += deviation
+            if matches:
+                candidates.append((matches, -total_deviation, bass, melody))
+    return nlargest(limit, candidates)
+
+
+class Search:
+    DEFAULT_STEP = 50
+    DEFAULT_TOLERANCE = 25
+    DEFAULT_LIMIT = 10
+
+    def __init__(
+        self,
+        target: Sequence[str | float],
+        multiples: int | None = None,
+        bass_range: tuple[str | float, str | float] = ("c,", "c'"),
+        melody_range: tuple[str | float, str | float] = ("c'", "c'''"),
+        step: float = DEFAULT_STEP,
+        tolerance: float = DEFAULT_TOLERANCE,
+        limit: int = DEFAULT_LIMIT,
+        tone_set: ToneSet = ToneSet.SUM,
+        workers: int | None = None,
+    ):
+        if not multiples:
+            multiples = Matrix.DEFAULT_MULTIPLES
+        self.targets = [get_pitch_frequency(pitch) for pitch in target]
+        self._multiples = multiples
+        self._bass_frequencies = get_frequency_grid(
+            *(get_pitch_frequency(pitch) for pitch in bass_range), step
+        )
+        self._melody_frequencies = get_frequency_grid(
+            *(get_pitch_frequency(pitch) for pitch in melody_range), step
+        )
+        self._step = step
+        self._tolerance = tolerance
+        self._limit = limit
+        self._tone_set = tone_set
+        self._workers = workers or 1
+
+    @property
+    def number_of_candidates(self) -> int:
+        return len(self._bass_frequencies) * len(self._melody_frequencies)
+
+    def _get_chunks(self) -> list[list[float]]:
+        bass_frequencies = self._bass_frequencies
+        size = max(1, ceil(len(bass_frequencies) / (self._workers * 4)))
+        return [
+            bass_frequencies[index : index + size]
+            for index in range(0, len(bass_frequencies), size)
+        ]
+
+    def _search(self, bass_frequencies: Sequence[float]) -> list[tuple]:
+        return _search_bass_frequencies(
+            bass_frequencies,
+            self._melody_frequencies,
+            self._step,
+            self.targets,
+            self._tone_set.get_bass_multipliers(self._multiples),
+            range(self._multiples),
+            self._tolerance,
+            self._limit,
+        )
+
+    @cached_property
+    def results(self) -> list[SearchResult]:
+        if not self.targets or not self._melody_frequencies:
+            return []
+        if self._workers <= 1:
+            candidates = self._search(self._bass_frequencies)
+        else:
+            chunks = self._get_chunks()
+            with ProcessPoolExecutor(max_workers=self._workers) as executor:
+                chunk_candidates = executor.map(self._search, chunks)
+                candidates = [
+                    candidate
+                    for candidates in chunk_candidates
+                    for candidate in candidates
+                ]
+        return [
+            SearchResult(bass, melody, matches, -negative_deviation / matches)
+            for matches, negative_deviation, bass, melody in nlargest(
+                self._limit, candidates
+            )
+        ]
+
+    @staticmethod
+    def _get_pitch_display(frequency: float) -> str:
+        name = NamedPitch.from_hertz(frequency).name
+        return f"{name} ({round(frequency, 2):,})"
+
+    def display(self):
+        title = stylize("Matrix Search", "cyan")
+        table = Table(title=title, box=SIMPLE)
+        for column in ("Rank", "Bass", "Melody", "Matches", "Deviation"):
+            table.add_column(column)
+        targets = len(self.targets)
+        for rank, result in enumerate(self.results, start=1):
+            table.add_row(
+                str(rank),
+                self._get_pitch_display(result.bass),
+                self._get_pitch_display(result.melody),
+                f"{result.matches}/{targets}",
+                f"{round(result.deviation, 2)} cents",
+            )
+        Console().print(table)
@@ -0,0 +1,95 @@
+from collections.abc import Sequence
+
+from abjad import NamedPitch
+
+from .helpers import atomic_cached_property
+from .matrix import Matrix
+from .matrix_pitch import DisplayFormat, PitchType, Tuning
+
+
+class RingModulation(Matrix):
+    TITLE = "Ring-Modulation Spectrum"
+    INPUT_NAMES = ("carrier", "modulator")
+
+    @atomic_cached_property
+    def _bass_multipliers(self) -> Sequence[int]:
+        multiples = len(self._multiples)
+        return [*range(1 - multiples, 0), *range(1, multiples)]
+
+    @atomic_cached_property
+    def _melody_multipliers(self) -> range:
+        return range(1, len(self._multiples))
+
+    @property
+    def _deduplicate(self) -> bool:
+        return True
+
+
+class FrequencyModulation(Matrix):
+    TITLE = "Frequency-Modulation Spectrum"
+    INPUT_NAMES = ("carrier", "modulator")
+
+    @atomic_cached_property
+    def _bass_multipliers(self) -> Sequence[int]:
+        return [1]
+
+    @atomic_cached_property
+    def _melody_multipliers(self) -> range:
+        multiples = len(self._multiples)
+        return range(1 - multiples, multiples)
+
+    @property
+    def _deduplicate(self) -> bool:
+        return True
+
+
+class HarmonicSeries(Matrix):
+    TITLE = "Harmonic Series"
+    INPUT_NAMES = ("fundamental", "shift")
+
+    def __init__(
+        self,
+        fundamental: str | NamedPitch,
+        shift: float = 0,
+        partials: int | None = None,
+        pitch_type: PitchType = PitchType.HERTZ,
+        tuning: Tuning = Tuning.MICROTONAL,
+        display_format: DisplayFormat = DisplayFormat.TABLE,
+        midi_input=False,
+        min_hz: float | None = None,
+        max_hz: float | None = None,
+        limit: int | None = None,
+    ):
+        super().__init__(
+            fundamental,
+            fundamental,
+            partials,
+            pitch_type,
+            tuning,
+            display_format,
+            midi_input,
+            min_hz,
+            max_hz,
+            limit,
+        )
+        self.melody = shift
+
+    @property
+    def title(self) -> str:
+        if self.melody:
+            return "Frequency-Shifted Harmonic Series"
+        return self.TITLE
+
+    @atomic_cached_property
+    def _bass_multipliers(self) -> Sequence[int]:
+        return range(1, len(self._multiples) + 1)
+
+    @property
+    def _instrument_name_multiples(self) -> int:
+        return len(self._multiples) + 1
+
+    @atomic_cached_property
+    def _melody_multipliers(self) -> range:
+        if self.melody:
+            return range(1, 2)
+        return range(1)
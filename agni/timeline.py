@@ -0,0 +1,308 @@
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from math import lcm
+from typing import cast
+
+from abjad import (
+    Duration,
+    Leaf,
+    MultimeasureRest,
+    NamedPitch,
+    Note,
+    Tie,
+    TimeSignature,
+    Tuplet,
+)
+from abjad.get import duration as get_duration
+from abjad.get import indicators as get_indicators
+from abjad.get import parentage as get_parentage
+
+
+@dataclass
+class MeteredLeaf:
+    leaf: Leaf
+    time_signature: TimeSignature
+
+
+class LeafType(IntEnum):
+    NOTE = 0
+    REST = 1
+    MULTI_MEASURE_REST = 2
+
+
+@lru_cache
+def get_duration_from_ticks(ticks: int, resolution: int) -> Duration:
+    return Duration(ticks, resolution)
+
+
+@lru_cache
+def is_assignable(ticks: int, resolution: int) -> bool:
+    return get_duration_from_ticks(ticks, resolution).is_assignable
+
+
+def get_assignable_durations(duration: Duration) -> list[Duration]:
+    if not duration.is_dyadic_rational:
+        return [duration]
+    durations = []
+    while duration:
+        assignable_duration = duration.equal_or_lesser_assignable
+        durations.append(assignable_duration)
+        duration -= assignable_duration
+    return durations
+
+
+class Timeline:
+    NO_TUPLET = -1
+
+    def __init__(self, metered_leaves: list[MeteredLeaf]):
+        self.metered_leaves = metered_leaves
+        self.onset_numerators = array("q")
+        self.onset_denominators = array("q")
+        self.duration_numerators = array("q")
+        self.duration_denominators = array("q")
+        self.written_duration_numerators = array("q")
+        self.written_duration_denominators = array("q")
+        self.hertz = array("d")
+        self.leaf_types = array("b")
+        self.ties = array("b")
+        self.tuplet_ids = array("q")
+        self.tuplet_starts = array("b")
+        self.time_signature_ids = array("q")
+        self.measure_rows = array("q")
+        self.measure_onset_numerators = array("q")
+        self.measure_onset_denominators = array("q")
+        self.tuplets: list[Tuplet] = []
+        self.time_signatures: list[TimeSignature] = []
+        self._add_metered_leaves(metered_leaves)
+        self.resolution = 1
+        self.onset_ticks = array("q")
+        self.duration_ticks = array("q")
+        self.written_duration_ticks = array("q")
+        self.measure_onset_ticks = array("q")
+        self.set_resolution(self.minimum_resolution)
+
+    def __len__(self) -> int:
+        return len(self.metered_leaves)
+
+    @staticmethod
+    def _get_leaf_type(leaf: Leaf) -> LeafType:
+        if isinstance(leaf, Note):
+            return LeafType.NOTE
+        if isinstance(leaf, MultimeasureRest):
+            return LeafType.MULTI_MEASURE_REST
+        return LeafType.REST
+
+    def _get_tuplet_id(self, tuplet: Tuplet) -> int:
+        tuplets = self.tuplets
+        if not tuplets or tuplets[-1] is not tuplet:
+            tuplets.append(tuplet)
+        return len(tuplets) - 1
+
+    def _get_time_signature_id(self, time_signature: TimeSignature) -> int:
+        time_signatures = self.time_signatures
+        if not time_signatures or time_signatures[-1] is not time_signature:
+            time_signatures.append(time_signature)
+        return len(time_signatures) - 1
+
+    def _add_measures(
+        self,
+        row: int,
+        end: Duration,
+        measure_onset: Duration,
+        time_signature: TimeSignature,
+    ) -> Duration:
+        while measure_onset < end:
+            self.measure_rows.append(row)
+            self.measure_onset_numerators.append(measure_onset.numerator)
+            self.measure_onset_denominators.append(measure_onset.denominator)
+            measure_onset += time_signature.duration
+        return measure_onset
+
+    def _add_metered_leaves(self, metered_leaves: list[MeteredLeaf]):
+        onset = Duration(0)
+        measure_onset = Duration(0)
+        for row, metered_leaf in enumerate(metered_leaves):
+            leaf = metered_leaf.leaf
+            duration = get_duration(leaf)
+            measure_onset = self._add_measures(
+                row,
+                onset + duration,
+                measure_onset,
+                metered_leaf.time_signature,
+            )
+            written_duration = leaf.written_duration
+            leaf_type = self._get_leaf_type(leaf)
+            self.onset_numerators.append(onset.numerator)
+            self.onset_denominators.append(onset.denominator)
+            self.duration_numerators.append(duration.numerator)
+            self.duration_denominators.append(duration.denominator)
+            self.written_duration_numerators.append(written_duration.numerator)
+            self.written_duration_denominators.append(
+                written_duration.denominator
+            )
+            if leaf_type == LeafType.NOTE and leaf.written_pitch:
+                self.hertz.append(leaf.written_pitch.hertz)
+            else:
+                self.hertz.append(0)
+            self.leaf_types.append(leaf_type)
+            ties = get_indicators(leaf, prototype=Tie)
+            self.ties.append(bool(ties))
+            parent = get_parentage(leaf).parent
+            if isinstance(parent, Tuplet):
+                self.tuplet_ids.append(self._get_tuplet_id(parent))
+                self.tuplet_starts.append(parent.index(leaf) == 0)
+            else:
+                self.tuplet_ids.append(self.NO_TUPLET)
+                self.tuplet_starts.append(False)
+            self.time_signature_ids.append(
+                self._get_time_signature_id(metered_leaf.time_signature)
+            )
+            onset += duration
+
+    @property
+    def minimum_resolution(self) -> int:
+        return lcm(
+            *self.onset_denominators,
+            *self.duration_denominators,
+            *self.written_duration_denominators,
+            *self.measure_onset_denominators,
+        )
+
+    @staticmethod
+    def _get_ticks(
+        numerators: array, denominators: array, resolution: int
+    ) -> array:
+        return array(
+            "q",
+            (
+                numerator * (resolution // denominator)
+                for numerator, denominator in zip(numerators, denominators)
+            ),
+        )
+
+    def set_resolution(self, resolution: int):
+        if resolution % self.minimum_resolution:
+            raise ValueError(
+                f"resolution {resolution} is not a multiple of"
+                f" {self.minimum_resolution}"
+            )
+        self.resolution = resolution
+        self.onset_ticks = self._get_ticks(
+            self.onset_numerators, self.onset_denominators, resolution
+        )
+        self.duration_ticks = self._get_ticks(
+            self.duration_numerators, self.duration_denominators, resolution
+        )
+        self.written_duration_ticks = self._get_ticks(
+            self.written_duration_numerators,
+            self.written_duration_denominators,
+            resolution,
+        )
+        self.measure_onset_ticks = self._get_ticks(
+            self.measure_onset_numerators,
+            self.measure_onset_denominators,
+            resolution,
+        )
+
+    def get_duration_from_ticks(self, ticks: int | None) -> Duration | None:
+        if ticks is None:
+            return None
+        return get_duration_from_ticks(ticks, self.resolution)
+
+    def is_assignable(self, ticks: int) -> bool:
+        return is_assignable(ticks, self.resolution)
+
+    def contains(self, index: int) -> bool:
+        return 0 <= index < len(self.metered_leaves)
+
+    def get_metered_leaf(self, index: int) -> MeteredLeaf | None:
+        if not self.contains(index):
+            return None
+        return self.metered_leaves[index]
+
+    def get_onset(self, index: int) -> Duration:
+        return Duration(
+            self.onset_numerators[index], self.onset_denominators[index]
+        )
+
+    def get_duration(self, index: int) -> Duration:
+        return Duration(
+            self.duration_numerators[index], self.duration_denominators[index]
+        )
+
+    @property
+    def measure_count(self) -> int:
+        return len(self.measure_rows)
+
+    @property
+    def end_ticks(self) -> int:
+        if not self.metered_leaves:
+            return 0
+        return self.onset_ticks[-1] + self.duration_ticks[-1]
+
+    def contains_measure(self, measure: int) -> bool:
+        return 1 <= measure <= self.measure_count
+
+    def get_measure_row(self, measure: int) -> int:
+        return self.measure_rows[measure - 1]
+
+    def get_measure_onset_ticks(self, measure: int) -> int:
+        if measure > self.measure_count:
+            return self.end_ticks
+        return self.measure_onset_ticks[measure - 1]
+
+    def get_row(self, ticks: int) -> int:
+        return bisect_right(self.onset_ticks, ticks) - 1
+
+    def get_duration_ticks(self, index: int) -> int:
+        return self.duration_ticks[index]
+
+    def get_written_duration_ticks(self, index: int) -> int | None:
+        if not self.contains(index):
+            return None
+        return self.written_duration_ticks[index]
+
+    def get_written_duration(self, index: int) -> Duration | None:
+        if not self.contains(index):
+            return None
+        return Duration(
+            self.written_duration_numerators[index],
+            self.written_duration_denominators[index],
+        )
+
+    def get_hertz(self, index: int) -> float | None:
+        if not self.contains(index):
+            return None
+        return self.hertz[index] or None
+
+    def get_named_pitch(self, index: int) -> NamedPitch | None:
+        if self.get_leaf_type(index) != LeafType.NOTE:
+            return None
+        return cast(Note, self.metered_leaves[index].leaf).written_pitch
+
+    def get_leaf_type(self, index: int) -> LeafType | None:
+        if not self.contains(index):
+            return None
+        return LeafType(self.leaf_types[index])
+
+    def get_tie(self, index: int) -> bool:
+        return self.contains(index) and bool(self.ties[index])
+
+    def get_tuplet(self, index: int) -> Tuplet | None:
+        if not self.contains(index):
+            return None
+        tuplet_id = self.tuplet_ids[index]
+        if tuplet_id == self.NO_TUPLET:
+            return None
+        return self.tuplets[tuplet_id]
+
+    def get_is_start_of_tuplet(self, index: int) -> bool:
+        return self.contains(index) and bool(self.tuplet_starts[index])
+
+    def get_time_signature(self, index: int) -> TimeSignature | None:
+        if not self.contains(index):
+            return None
+        return self.time_signatures[self.time_signature_ids[index]]
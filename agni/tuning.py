@@ -0,0 +1,167 @@
+from array import array
+from bisect import bisect
+from collections.abc import Iterable, Sequence
+from enum import StrEnum, auto
+from fractions import Fraction
+from functools import lru_cache
+from math import log2
+
+from abjad import NamedPitch
+
+CENTS_PER_OCTAVE = 1200
+CENTS_PER_SEMITONE = 100
+SEMITONES_PER_OCTAVE = 12
+JUST_RATIOS = (
+    Fraction(1, 1),
+    Fraction(16, 15),
+    Fraction(9, 8),
+    Fraction(7, 6),
+    Fraction(6, 5),
+    Fraction(5, 4),
+    Fraction(4, 3),
+    Fraction(7, 5),
+    Fraction(3, 2),
+    Fraction(8, 5),
+    Fraction(5, 3),
+    Fraction(7, 4),
+    Fraction(15, 8),
+)
+
+
+class Tuning(StrEnum):
+    EQUAL_TEMPERED = auto()
+    MICROTONAL = auto()
+    EDO_36 = auto()
+    EDO_48 = auto()
+    EDO_72 = auto()
+    JUST = auto()
+    CENTS = auto()
+
+    @property
+    def divisions(self) -> int | None:
+        return EDO_DIVISIONS.get(self)
+
+    @property
+    def has_lilypond_names(self) -> bool:
+        return self in (Tuning.EQUAL_TEMPERED, Tuning.MICROTONAL)
+
+
+EDO_DIVISIONS = {
+    Tuning.EQUAL_TEMPERED: 12,
+    Tuning.MICROTONAL: 24,
+    Tuning.EDO_36: 36,
+    Tuning.EDO_48: 48,
+    Tuning.EDO_72: 72,
+}
+
+
+def get_midi_number(frequency: float) -> float:
+    return SEMITONES_PER_OCTAVE * log2(frequency / 440) + 69
+
+
+def get_frequency(midi_number: float) -> float:
+    return 440 * 2 ** ((midi_number - 69) / SEMITONES_PER_OCTAVE)
+
+
+def get_pitch_frequency(
+    pitch: str | float | NamedPitch, midi_input=False
+) -> float:
+    if isinstance(pitch, NamedPitch):
+        return pitch.hertz
+    try:
+        number = float(pitch)
+    except ValueError:
+        return NamedPitch(pitch).hertz
+    if midi_input:
+        return get_frequency(number)
+    return number
+
+
+class Quantizer:
+    def __init__(
+        self,
+        steps: Sequence[float] | None = None,
+        divisions: int | None = None,
+        labels: Sequence[str] | None = None,
+    ):
+        self.divisions = divisions
+        if divisions:
+            step = CENTS_PER_OCTAVE / divisions
+            steps = [index * step for index in range(divisions)]
+        self.steps = array("d", steps or [])
+        self._bounds = array("d", [*self.steps, CENTS_PER_OCTAVE])
+        self.labels = list(labels or [])
+
+    @classmethod
+    @lru_cache
+    def edo(cls, divisions: int) -> "Quantizer":
+        if divisions < 1:
+            raise ValueError(
+                "an equal division of the octave needs at least one step,"
+                f" got {divisions}"
+            )
+        return cls(divisions=divisions)
+
+    def _get_nearest_step(self, cents: float) -> tuple[int, float]:
+        octave, remainder = divmod(cents, CENTS_PER_OCTAVE)
+        bounds = self._bounds
+        index = bisect(bounds, remainder)
+        lower = bounds[index - 1]
+        upper = bounds[index]
+        if remainder - lower > upper - remainder:
+            index += 1
+        step_index = (index - 1) % len(self.steps)
+        step = bounds[index - 1]
+        return step_index, octave * CENTS_PER_OCTAVE + step
+
+    def quantize(self, midi_number: float) -> float:
+        divisions = self.divisions
+        if divisions:
+            return (
+                round(midi_number * divisions / SEMITONES_PER_OCTAVE)
+                * SEMITONES_PER_OCTAVE
+                / divisions
+            )
+        if not self.steps:
+            return midi_number
+        _, cents = self._get_nearest_step(midi_number * CENTS_PER_SEMITONE)
+        return cents / CENTS_PER_SEMITONE
+
+    def quantize_all(self, midi_numbers: Iterable[float]) -> array:
+        divisions = self.divisions
+        if divisions:
+            return array(
+                "d",
+                (
+                    round(midi_number * divisions / SEMITONES_PER_OCTAVE)
+                    * SEMITONES_PER_OCTAVE
+                    / divisions
+                    for midi_number in midi_numbers
+                ),
+            )
+        if not self.steps:
+            return array("d", midi_numbers)
+        return array("d", map(self.quantize, midi_numbers))
+
+    def get_label(self, midi_number: float) -> str | None:
+        if not self.labels:
+            return None
+        index, _ = self._get_nearest_step(midi_number * CENTS_PER_SEMITONE)
+        return self.labels[index]
+
+
+@lru_cache
+def get_quantizer(tuning: Tuning) -> Quantizer:
+    if tuning == Tuning.JUST:
+        steps = [CENTS_PER_OCTAVE * log2(ratio) for ratio in JUST_RATIOS]
+        labels = [str(ratio) for ratio in JUST_RATIOS]
+        return Quantizer(steps, labels=labels)
+    if tuning == Tuning.CENTS:
+        return Quantizer()
+    return Quantizer.edo(tuning.divisions or SEMITONES_PER_OCTAVE)
+
+
+def get_cent_deviation(midi_number: float) -> tuple[int, int]:
+    semitone = round(midi_number)
+    deviation = round((midi_number - semitone) * CENTS_PER_SEMITONE)
+    return semitone, deviation
@@ -0,0 +1,98 @@
+from collections.abc import Sequence
+from math import inf
+
+
+def get_assignment(costs: Sequence[Sequence[float]]) -> list[int]:
+    rows = len(costs)
+    if not rows:
+        return []
+    columns = len(costs[0])
+    if rows > columns:
+        raise ValueError(
+            f"cannot assign {rows} rows to only {columns} columns"
+        )
+    row_potentials = [0.0] * (rows + 1)
+    column_potentials = [0.0] * (columns + 1)
+    column_rows = [0] * (columns + 1)
+    previous_columns = [0] * (columns + 1)
+    for row in range(1, rows + 1):
+        column_rows[0] = row
+        column = 0
+        minimums = [inf] * (columns + 1)
+        used = [False] * (columns + 1)
+        while True:
+            used[column] = True
+            current_row = column_rows[column]
+            row_costs = costs[current_row - 1]
+            row_potential = row_potentials[current_row]
+            delta = inf
+            next_column = 0
+            for candidate in range(1, columns + 1):
+                if used[candidate]:
+                    continue
+                reduced_cost = (
+                    row_costs[candidate - 1]
+                    - row_potential
+                    - column_potentials[candidate]
+                )
+                if reduced_cost < minimums[candidate]:
+                    minimums[candidate] = reduced_cost
+                    previous_columns[candidate] = column
+                if minimums[candidate] < delta:
+                    delta = minimums[candidate]
+                    next_column = candidate
+            for candidate in range(columns + 1):
+                if used[candidate]:
+                    row_potentials[column_rows[candidate]] += delta
+                    column_potentials[candidate] -= delta
+                else:
+                    minimums[candidate] -= delta
+            column = next_column
+            if not column_rows[column]:
+                break
+        while column:
+            previous_column = previous_columns[column]
+            column_rows[column] = column_rows[previous_column]
+            column = previous_column
+    assignment = [0] * rows
+    for column in range(1, columns + 1):
+        if column_rows[column]:
+            assignment[column_rows[column] - 1] = column - 1
+    return assignment
+
+
+class VoiceLeading:
+    NO_HISTORY_COST = 1_000
+
+    def __init__(self, number_of_voices: int):
+        self.voices: list[float | None] = [None] * number_of_voices
+        self._assignment: dict[float, int] = {}
+
+    def _get_cost(self, voice: int, midi_number: float, rank: int) -> float:
+        previous_midi_number = self.voices[voice]
+        if previous_midi_number is None:
+            return self.NO_HISTORY_COST + abs(voice - rank)
+        return abs(midi_number - previous_midi_number)
+
+    def assign(self, midi_numbers: Sequence[float]) -> list[int]:
+        assignment = self._assignment
+        if len(assignment) == len(midi_numbers) and all(
+            midi_number in assignment for midi_number in midi_numbers
+        ):
+            return [assignment[midi_number] for midi_number in midi_numbers]
+        voices = self.voices
+        if len(midi_numbers) > len(voices):
+            voices.extend([None] * (len(midi_numbers) - len(voices)))
+        ranks = sorted(range(len(midi_numbers)), key=midi_numbers.__getitem__)
+        costs = [[0.0] * len(voices) for _ in midi_numbers]
+        for rank, index in enumerate(ranks):
+            midi_number = midi_numbers[index]
+            costs[index] = [
+                self._get_cost(voice, midi_number, rank)
+                for voice in range(len(voices))
+            ]
+        voice_assignment = get_assignment(costs)
+        for midi_number, voice in zip(midi_numbers, voice_assignment):
+            voices[voice] = midi_number
+        self._assignment = dict(zip(midi_numbers, voice_assignment))
+        return voice_assignment
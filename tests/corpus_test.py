@@ -0,0 +1,67 @@
+from fractions import Fraction
+from pathlib import Path
+
+from abjad import Duration, NamedPitch, Tuplet
+from pytest import approx, mark
+
+from agni.corpus import Corpus, get_leaf_rows
+from agni.matrix_leaf import MatrixLeaf
+from agni.matrix_pitch import ToneSet
+
+
+def get_matrix_leaves() -> list[MatrixLeaf]:
+    tuplet = Tuplet("3:2", "c'8 c'8 c'8")
+    return [
+        MatrixLeaf(NamedPitch("c"), NamedPitch("g'")),
+        MatrixLeaf(None, None, duration=Duration(1, 2)),
+        MatrixLeaf(
+            NamedPitch("d"),
+            NamedPitch("a'"),
+            duration=Duration(1, 8),
+            tuplet=tuplet,
+        ),
+        MatrixLeaf(NamedPitch("d"), NamedPitch("e'")),
+    ]
+
+
+def test_get_leaf_rows():
+    rows = list(get_leaf_rows(1, get_matrix_leaves()))
+    onsets = [leaf_row[2] for leaf_row, _ in rows]
+    assert onsets == approx([0, 0.25, 0.75, 0.75 + 1 / 12])
+    assert rows[1][1] == []
+    instrument_names = [pitch_row[2] for pitch_row in rows[0][1]]
+    assert instrument_names[-2:] == ["Bass", "Melody"]
+    assert len(instrument_names) == len(set(instrument_names))
+
+
+expected_queries = [
+    ("g'", 1, Fraction(0)),
+    ("1320", 2, Fraction(0)),
+    ("a'", 2, Fraction(3, 4)),
+    ("bf'''", 0, None),
+]
+
+
+@mark.parametrize("pitch, matrices, onset", expected_queries)
+def test_query(
+    tmp_path: Path, pitch: str, matrices: int, onset: Fraction | None
+):
+    with Corpus(tmp_path / "agni.db") as corpus:
+        for _ in range(2):
+            corpus.add(
+                tmp_path / "passage.ly",
+                "Passage",
+                "",
+                3,
+                ToneSet.SUM,
+                get_matrix_leaves(),
+            )
+        results = corpus.query(pitch)
+    if not matrices:
+        assert results == []
+        return
+    (result,) = results
+    assert result.title == "Passage"
+    assert result.matrices == matrices
+    assert result.onset == onset
+    assert result.deviation < 20
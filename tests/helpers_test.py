@@ -1,10 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
 from abjad import Staff, StaffGroup
 from pytest import mark
 
 from agni.helpers import (
     InputPart,
     _get_part_label,
+    atomic_cached_property,
     get_instrument_name,
+    get_instrument_name_table,
+    get_instrument_names,
     get_staff_by_name,
     remove_none_values,
     stylize,
@@ -16,6 +22,7 @@ expected_part_labels = [
     (1, InputPart.MELODY, "M"),
     (2, InputPart.BASS, "2B"),
     (3, InputPart.MELODY, "3M"),
+    (-2, InputPart.BASS, "2B"),
 ]
 
 
@@ -33,6 +40,8 @@ expected_instrument_names = [
     (0, 1, "M"),
     (1, 2, "B + 2M"),
     (2, 3, "2B + 3M"),
+    (-1, 2, "2M - B"),
+    (-2, 0, "2B"),
 ]
 
 
@@ -44,11 +53,24 @@ def test_get_instrument_name(
     bass_multiple: int, melody_multiple: int, expected_instrument_name: str
 ):
     assert (
-        get_instrument_name(bass_multiple, melody_multiple)
+        get_instrument_name(bass_multiple, melody_multiple, 4)
         == expected_instrument_name
     )
 
 
+def test_get_instrument_name_is_shared():
+    table = get_instrument_name_table(4)
+    assert len(table) == len(table[0]) == 7
+    assert get_instrument_name(2, 3, 4) is table[6][5]
+    assert get_instrument_names(4, range(4))[-1] is table[6][6]
+    assert get_instrument_names(3, range(3)) is get_instrument_names(
+        3, range(3)
+    )
+    get_instrument_name_table.cache_clear()
+    get_instrument_names(5, range(-4, 5))
+    assert get_instrument_name_table.cache_info().currsize == 1
+
+
 def test_get_staff_by_name_found():
     bass_staff = Staff(name="bass")
     melody_staff = Staff(name="melody")
@@ -80,3 +102,19 @@ expected_styles = [
 def test_stylize(text: str, color: str, bold: bool, expected_text: str):
     styled_text = stylize(text, color, bold=bold)
     assert styled_text == expected_text
+
+
+def test_atomic_cached_property_publishes_one_value():
+    threads = 8
+    barrier = Barrier(threads)
+
+    class Cached:
+        @atomic_cached_property
+        def value(self) -> list[int]:
+            barrier.wait()
+            return [threads]
+
+    cached = Cached()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        values = list(executor.map(lambda _: cached.value, range(threads)))
+    assert all(value is cached.value for value in values)
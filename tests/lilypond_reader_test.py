@@ -0,0 +1,109 @@
+from typing import cast
+
+from abjad import LilyPondFile, Staff, lilypond, parse
+from abjad.get import duration as get_duration
+from abjad.select import components as get_components
+from pytest import MonkeyPatch, mark, raises
+
+from agni.helpers import InputPart, get_staff_by_name
+from agni.lilypond_reader import MeteredStaffBuilder, read_metered_staff
+
+lilypond_input = r"""
+\version "2.24.1"
+\language "english"
+
+\header {
+  title = "Title"
+  composer = "Composer"
+}
+
+melodyNotes = \relative a' {
+  \time 3/4
+
+  | a4 ~ a8 d!8 b4
+  | R2. * 3
+  \tuplet 3/2 { b8 c4 } \times 2/3 { e16 f8 } r2
+}
+
+\score {
+  <<
+    \new Staff = "melody" \with { instrumentName = "Melody" } {
+      \melodyNotes
+    }
+    \new Staff = "bass" {
+      \clef "bass"
+      \time 3/4
+      | g,2. ~ g,2.
+      | R2. * 3
+      | r4 g,2
+    }
+  >>
+}
+"""
+
+
+def get_parsed_staff(input_part: InputPart) -> Staff | None:
+    lilypond_file = cast(LilyPondFile, parse(lilypond_input))
+    score = next(
+        block for block in lilypond_file.items if block.name == "score"
+    )
+    staves = cast(list[Staff], get_components(score.items, prototype=Staff))
+    return get_staff_by_name(staves, input_part)
+
+
+@mark.parametrize("input_part", [InputPart.BASS, InputPart.MELODY])
+def test_read_metered_staff_matches_parse(input_part: InputPart):
+    metered_staff = read_metered_staff(lilypond_input, input_part)
+    assert metered_staff is not None
+    staff, _ = metered_staff
+    assert lilypond(staff) == lilypond(get_parsed_staff(input_part))
+
+
+def test_read_metered_staff_leaves():
+    metered_staff = read_metered_staff(lilypond_input, InputPart.MELODY)
+    assert metered_staff is not None
+    _, metered_leaves = metered_staff
+    durations = [
+        str(get_duration(metered_leaf.leaf)) for metered_leaf in metered_leaves
+    ]
+    time_signatures = {
+        metered_leaf.time_signature.pair for metered_leaf in metered_leaves
+    }
+    assert durations == [
+        "1/4",
+        "1/8",
+        "1/8",
+        "1/4",
+        "9/4",
+        "1/12",
+        "1/6",
+        "1/24",
+        "1/12",
+        "1/2",
+    ]
+    assert time_signatures == {(3, 4)}
+
+
+unsupported_inputs = [
+    r"\score { \new Staff = bass { <c e g>4 } }",
+    r"\score { \new Staff = bass { c4-. } }",
+    r"\score { \new Staff = bass { \undefinedMusic } }",
+    r'\language "nederlands" \score { \new Staff = bass { c4 } }',
+    r"\score { \new Staff = melody { c4 } }",
+]
+
+
+@mark.parametrize("unsupported_input", unsupported_inputs)
+def test_read_metered_staff_unsupported(unsupported_input: str):
+    assert read_metered_staff(unsupported_input, InputPart.BASS) is None
+
+
+def test_read_metered_staff_propagates_reader_errors(
+    monkeypatch: MonkeyPatch,
+):
+    def build_staff(*_):
+        raise IndexError
+
+    monkeypatch.setattr(MeteredStaffBuilder, "build_staff", build_staff)
+    with raises(IndexError):
+        read_metered_staff(lilypond_input, InputPart.BASS)
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+from abjad import NamedPitch, lilypond
+from pytest import mark
+
+from agni.lilypond_writer import (
+    get_clef_and_ottava,
+    get_octave,
+    get_quarter_tone,
+)
+from agni.matrix import Matrix
+from agni.matrix_pitch import Tuning
+from agni.notation import Notation
+
+expected_quarter_tones = [0.1, 0.25, 0.3, 0.6, 0.8, -0.3, 11.74, -12.6]
+
+
+@mark.parametrize("number", expected_quarter_tones)
+def test_get_quarter_tone(number: float):
+    assert get_quarter_tone(number) == NamedPitch(number).number
+
+
+expected_octaves = [("c'", 4), ("a,", 2), ("bqs", 3), ("c'''", 6)]
+
+
+@mark.parametrize("pitch_name, expected", expected_octaves)
+def test_get_octave(pitch_name: str, expected: int):
+    assert get_octave(pitch_name) == expected
+
+
+expected_clefs_and_ottavas = [
+    (0, (None, None)),
+    (1, ("bass_8", -1)),
+    (3, ("bass", 0)),
+    (5, ("treble", 0)),
+    (6, ("treble^8", 1)),
+    (8, ("treble^15", 2)),
+]
+
+
+@mark.parametrize("octave, expected", expected_clefs_and_ottavas)
+def test_get_clef_and_ottava(octave: int, expected: tuple):
+    assert get_clef_and_ottava(octave) == expected
+
+
+expected_reference_scores = [
+    ("a,", "cs'", 4, Tuning.MICROTONAL, False),
+    ("a,", "cs'", 4, Tuning.MICROTONAL, True),
+    ("bf,,", "c'", 3, Tuning.JUST, False),
+    ("c,,", "eqf''", 6, Tuning.EQUAL_TEMPERED, False),
+    ("g", "fs''", 5, Tuning.EDO_72, False),
+]
+
+
+@mark.parametrize(
+    "bass, melody, multiples, tuning, as_chord", expected_reference_scores
+)
+def test_reference_score_matches_abjad(
+    bass: str, melody: str, multiples: int, tuning: Tuning, as_chord: bool
+):
+    matrix = Matrix(bass, melody, multiples, tuning=tuning)
+    scores = [
+        Notation(
+            matrix,
+            False,
+            tuning,
+            False,
+            as_chord,
+            Path("examples"),
+            fast_output=fast_output,
+        )._scores
+        for fast_output in (False, True)
+    ]
+    abjad_scores, fast_scores = scores
+    assert fast_scores == [lilypond(score) for score in abjad_scores]
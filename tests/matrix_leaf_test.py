@@ -2,6 +2,7 @@ from abjad import NamedPitch
 from pytest import mark
 
 from agni.matrix_leaf import MatrixLeaf
+from agni.matrix_pitch import ToneSet
 
 from .conftest import bass_frequency, melody_frequency
 
@@ -144,4 +145,30 @@ def test_matrix_leaf_instrument_names(
 ):
     matrix_leaf = MatrixLeaf(_bass=None, _melody=None, _multiples=multiples)
     print(matrix_leaf.instrument_names)
-    assert matrix_leaf.instrument_names == expected_instrument_names
+    assert list(matrix_leaf.instrument_names) == expected_instrument_names
+
+
+def test_matrix_leaf_instrument_names_are_shared():
+    matrix_leaves = [
+        MatrixLeaf(_bass=None, _melody=None, _multiples=4) for _ in range(2)
+    ]
+    first, second = (leaf.instrument_names for leaf in matrix_leaves)
+    assert first is second
+
+
+def test_matrix_leaf_instrument_names_difference_tones():
+    matrix_leaf = MatrixLeaf(
+        _bass=None, _melody=None, _multiples=3, _tone_set=ToneSet.ALL
+    )
+    assert list(matrix_leaf.instrument_names) == [
+        "2B",
+        "M - 2B",
+        "M - B",
+        "B + M",
+        "2B + M",
+        "2M - 2B",
+        "2M - B",
+        "2M",
+        "B + 2M",
+        "2B + 2M",
+    ]
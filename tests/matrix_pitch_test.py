@@ -4,7 +4,9 @@ from abjad import Duration, Note, Tie
 from abjad.get import indicators as get_indicators
 from pytest import mark, raises
 
-from agni.matrix_pitch import MatrixPitch, Tuning
+from agni.matrix import Matrix
+from agni.matrix_pitch import MatrixPitch, Tuning, quantize_matrix_pitches
+from agni.tuning import get_quantizer
 
 from .conftest import bass_frequency, melody_frequency
 
@@ -15,6 +17,8 @@ expected_displays = [
     (1, 0, "MatrixPitch(440.0)"),
     (1, 1, "MatrixPitch(906.0)"),
     (1, 2, "MatrixPitch(1,372.0)"),
+    (-1, 1, "MatrixPitch(26.0)"),
+    (-2, 1, "MatrixPitch(414.0)"),
 ]
 
 
@@ -44,6 +48,8 @@ expected_is_base_multiples = [
     (1, 1, False),
     (1, 2, False),
     (2, 0, True),
+    (-2, 0, True),
+    (-2, 1, False),
 ]
 
 
@@ -68,6 +74,9 @@ expected_lilypond_displays = [
     (1, 0, Tuning.EQUAL_TEMPERED, "a'"),
     (1, 1, Tuning.MICROTONAL, "aqs''"),
     (1, 1, Tuning.EQUAL_TEMPERED, "a''"),
+    (1, 1, Tuning.EDO_36, "bf''-33"),
+    (1, 1, Tuning.CENTS, "bf''-50"),
+    (1, 0, Tuning.JUST, "a'-16 (5/3)"),
 ]
 
 
@@ -94,6 +103,8 @@ expected_midi_displays = [
     (1, 0, Tuning.EQUAL_TEMPERED, "69"),
     (1, 1, Tuning.MICROTONAL, "81.5"),
     (1, 1, Tuning.EQUAL_TEMPERED, "82"),
+    (1, 1, Tuning.EDO_36, "81.67"),
+    (1, 1, Tuning.EDO_72, "81.5"),
 ]
 
 
@@ -120,6 +131,8 @@ expected_hertz_displays = [
     (1, 0, Tuning.EQUAL_TEMPERED, "440"),
     (1, 1, Tuning.MICROTONAL, "906.0"),
     (1, 1, Tuning.EQUAL_TEMPERED, "906"),
+    (1, 1, Tuning.EDO_36, "914.55"),
+    (1, 1, Tuning.CENTS, "906.0"),
 ]
 
 
@@ -147,6 +160,8 @@ expected_instrument_names = [
     (1, 2, "B + 2M"),
     (2, 1, "2B + M"),
     (3, 3, "3B + 3M"),
+    (-1, 2, "2M - B"),
+    (-3, 1, "M - 3B"),
 ]
 
 
@@ -158,7 +173,11 @@ def test_get_instrument_name(
     bass_multiplier: int, melody_multiplier: int, expected_instrument_name: str
 ):
     matrix_pitch = MatrixPitch(
-        bass_frequency, melody_frequency, bass_multiplier, melody_multiplier
+        bass_frequency,
+        melody_frequency,
+        bass_multiplier,
+        melody_multiplier,
+        multiples=Matrix.DEFAULT_MULTIPLES,
     )
     assert matrix_pitch.instrument_name == expected_instrument_name
 
@@ -197,3 +216,58 @@ def test_get_note(
         and actual_note.written_duration == expected_note.written_duration
         and bool(actual_tie) == tie
     )
+
+
+expected_is_difference_tones = [
+    (0, 0, False),
+    (1, 1, False),
+    (-1, 0, False),
+    (-1, 1, True),
+    (2, -1, True),
+]
+
+
+@mark.parametrize(
+    "bass_multiplier, melody_multiplier, expected_is_difference_tone",
+    expected_is_difference_tones,
+)
+def test_is_difference_tone(
+    bass_multiplier: int,
+    melody_multiplier: int,
+    expected_is_difference_tone: bool,
+):
+    matrix_pitch = MatrixPitch(
+        bass_frequency, melody_frequency, bass_multiplier, melody_multiplier
+    )
+    assert matrix_pitch.is_difference_tone == expected_is_difference_tone
+
+
+def test_quantize_matrix_pitches_in_one_batch(monkeypatch):
+    tuning = Tuning.EDO_72
+    quantizer = get_quantizer(tuning)
+    batches = []
+    quantize_all = quantizer.quantize_all
+
+    def count_batches(midi_numbers):
+        midi_numbers = list(midi_numbers)
+        batches.append(midi_numbers)
+        return quantize_all(midi_numbers)
+
+    monkeypatch.setattr(quantizer, "quantize_all", count_batches)
+    matrix = Matrix(str(bass_frequency), str(melody_frequency))
+    quantize_matrix_pitches(matrix.pitches, tuning)
+    sounding_pitches = [
+        matrix_pitch
+        for matrix_pitch in matrix.pitches
+        if matrix_pitch.frequency
+    ]
+    assert len(batches) == 1
+    assert len(batches[0]) == len(sounding_pitches)
+    assert [
+        matrix_pitch.get_quantized_midi_number(tuning)
+        for matrix_pitch in sounding_pitches
+    ] == [
+        quantizer.quantize(matrix_pitch.midi_number or 0)
+        for matrix_pitch in sounding_pitches
+    ]
+    assert len(batches) == 1
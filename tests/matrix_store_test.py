@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from abjad import NamedPitch
+from pytest import approx, mark, raises
+
+from agni.matrix_leaf import MatrixLeaf
+from agni.matrix_store import (
+    HEADER,
+    MatrixStore,
+    UnsupportedMatrixStoreError,
+    get_column_offsets,
+    write_matrix_store,
+)
+
+
+def get_matrix_leaves() -> list[MatrixLeaf]:
+    return [
+        MatrixLeaf(NamedPitch("c"), NamedPitch("g'")),
+        MatrixLeaf(None, None),
+        MatrixLeaf(NamedPitch("d"), NamedPitch("a'")),
+    ]
+
+
+expected_column_offsets = [
+    (0, [HEADER.size] * 5),
+    (3, [16, 28, 28, 40, 40, 46, 46, 52]),
+]
+
+
+@mark.parametrize("count, expected", expected_column_offsets)
+def test_get_column_offsets(count: int, expected: list[int]):
+    offsets = [
+        offset
+        for start, end in get_column_offsets(count).values()
+        for offset in (start, end)
+    ]
+    assert offsets[: len(expected)] == expected
+
+
+@mark.parametrize("leaf", [0, 1, 2])
+def test_matrix_store(tmp_path: Path, leaf: int):
+    path = tmp_path / "passage.agmx"
+    matrix_leaves = get_matrix_leaves()
+    write_matrix_store(matrix_leaves, path)
+    matrix = matrix_leaves[leaf].matrix
+    expected = matrix.sorted_frequencies if matrix else []
+    with MatrixStore(path) as store:
+        frequencies = store.get_frequencies(leaf)
+        start, _ = store.get_leaf_range(leaf)
+        assert len(store) == 2 * len(
+            get_matrix_leaves()[0].matrix.sorted_frequencies
+        )
+        assert frequencies.tolist() == approx(expected, rel=1e-6)
+        if matrix:
+            sorted_pitches = matrix.sorted_pitches
+            assert store.bass_multipliers[start] == (
+                sorted_pitches[0].bass_multiplier
+            )
+            assert store.melody_multipliers[start] == (
+                sorted_pitches[0].melody_multiplier
+            )
+
+
+def test_rejects_other_files(tmp_path: Path):
+    path = tmp_path / "passage.agmx"
+    path.write_bytes(b"\0" * HEADER.size)
+    with raises(UnsupportedMatrixStoreError):
+        MatrixStore(path)
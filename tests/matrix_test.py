@@ -1,7 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
 from pytest import mark
 
 from agni.matrix import Matrix
-from agni.matrix_pitch import MatrixPitch
+from agni.matrix_pitch import MatrixPitch, ToneSet
 
 from .conftest import bass_frequency, call_command, melody_frequency
 
@@ -322,3 +325,128 @@ def test_matrix_display_table():
     """
     actual_output = call_command(matrix_command + [display_option, "table"])
     assert_lines_match(actual_output, expected_output)
+
+
+expected_matrix_equality = [
+    ((bass, melody), (bass, melody), True),
+    ((bass, melody), ("440.01", "466.01"), True),
+    ((bass, melody), ("441", melody), False),
+    ((bass, melody), (melody, bass), False),
+]
+
+
+@mark.parametrize("pitches, other_pitches, expected", expected_matrix_equality)
+def test_matrix_equality(
+    pitches: tuple[str, str], other_pitches: tuple[str, str], expected: bool
+):
+    matrix = Matrix(*pitches)
+    other_matrix = Matrix(*other_pitches)
+    assert (matrix == other_matrix) is expected
+    assert (hash(matrix) == hash(other_matrix)) is expected
+
+
+def test_matrix_unordered_key():
+    matrix = Matrix(bass, melody)
+    swapped_matrix = Matrix(melody, bass)
+    assert matrix.get_key() != swapped_matrix.get_key()
+    assert matrix.get_key(unordered=True) == swapped_matrix.get_key(
+        unordered=True
+    )
+
+
+def test_matrix_grid():
+    multiples = 3
+    matrix = Matrix(bass, melody, multiples)
+    assert len(matrix.grid) == multiples
+    assert all(len(row) == multiples for row in matrix.grid)
+    for bass_multiplier in range(multiples):
+        for melody_multiplier in range(multiples):
+            expected_pitch = MatrixPitch(
+                bass_frequency,
+                melody_frequency,
+                bass_multiplier,
+                melody_multiplier,
+            )
+            pitch = matrix.get_pitch(bass_multiplier, melody_multiplier)
+            assert pitch == expected_pitch
+    assert matrix.pitches == [pitch for row in matrix.grid for pitch in row]
+
+
+expected_query_frequencies = [
+    ({"limit": 4}, [440.0, 466.0, 880.0, 906.0]),
+    ({"min_hz": 1_800, "limit": 3}, [1_812.0, 1_838.0, 2_252.0]),
+    ({"max_hz": 906}, [440.0, 466.0, 880.0, 906.0]),
+    ({"min_hz": 1_346, "max_hz": 1_398}, [1_346.0, 1_372.0, 1_398.0]),
+    ({"min_hz": 3_000}, []),
+]
+
+
+@mark.parametrize("query, expected", expected_query_frequencies)
+def test_matrix_query(query: dict, expected: list[float]):
+    matrix = Matrix(bass, melody, **query)
+    assert matrix.is_query
+    assert matrix.sorted_frequencies == expected
+
+
+def test_matrix_query_matches_full_grid():
+    multiples = 100
+    min_hz = 5_000
+    max_hz = 6_000
+    matrix = Matrix(bass, melody, multiples)
+    expected_pitches = [
+        pitch
+        for pitch in matrix.sorted_pitches
+        if pitch.frequency and min_hz <= pitch.frequency <= max_hz
+    ]
+    assert list(matrix.query(min_hz, max_hz)) == expected_pitches
+
+
+expected_tone_set_frequencies = [
+    (ToneSet.SUM, [440.0, 466.0, 880.0, 906.0, 932.0]),
+    (
+        ToneSet.DIFFERENCE,
+        [26.0, 52.0, 414.0, 440.0, 466.0, 492.0, 880.0, 932.0],
+    ),
+    (
+        ToneSet.ALL,
+        [26.0, 52.0, 414.0, 440.0, 466.0, 492.0, 880.0, 906.0, 932.0],
+    ),
+]
+
+
+@mark.parametrize("tone_set, expected", expected_tone_set_frequencies)
+def test_matrix_tone_set(tone_set: ToneSet, expected: list[float]):
+    matrix = Matrix(bass, melody, 3, max_hz=1_000, tone_set=tone_set)
+    assert matrix.sorted_frequencies == expected
+
+
+@mark.parametrize("tone_set", list(ToneSet))
+def test_matrix_tone_set_query_matches_full_grid(tone_set: ToneSet):
+    multiples = 50
+    min_hz = 1_000
+    max_hz = 3_000
+    matrix = Matrix(bass, melody, multiples, tone_set=tone_set)
+    expected_frequencies = [
+        frequency
+        for frequency in matrix.sorted_frequencies
+        if min_hz <= frequency <= max_hz
+    ]
+    frequencies = [pitch.frequency for pitch in matrix.query(min_hz, max_hz)]
+    assert frequencies == expected_frequencies
+
+
+def test_matrix_concurrent_sorted_pitches():
+    threads = 8
+    matrix = Matrix(bass, melody, multiples=8, tone_set=ToneSet.ALL)
+    barrier = Barrier(threads)
+
+    def get_pitches(_) -> tuple[list[MatrixPitch], MatrixPitch]:
+        barrier.wait()
+        return matrix.sorted_pitches, matrix.get_pitch(1, 1)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(get_pitches, range(threads)))
+    sorted_pitches, _ = results[0]
+    for thread_sorted_pitches, matrix_pitch in results:
+        assert thread_sorted_pitches is sorted_pitches
+        assert any(pitch is matrix_pitch for pitch in sorted_pitches)
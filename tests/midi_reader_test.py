@@ -0,0 +1,159 @@
+from pathlib import Path
+from struct import pack
+
+from abjad import NamedPitch, TimeSignature, lilypond
+from abjad.get import indicators as get_indicators
+from pytest import mark, raises
+
+from agni.helpers import InputPart
+from agni.matrix import DisplayFormat
+from agni.matrix_pitch import PitchType, Tuning
+from agni.midi_reader import (
+    MidiReader,
+    UnsupportedMidiError,
+    get_assignable_units,
+)
+from agni.midi_writer import get_variable_length_quantity
+from agni.passage import Passage
+
+expected_assignable_units = [
+    (1, [1]),
+    (3, [3]),
+    (5, [4, 1]),
+    (12, [12]),
+    (13, [12, 1]),
+    (23, [16, 7]),
+]
+
+
+@mark.parametrize("units, expected", expected_assignable_units)
+def test_get_assignable_units(units: int, expected: list[int]):
+    assert get_assignable_units(units) == expected
+
+
+def get_track(events: list[tuple[int, bytes]]) -> bytes:
+    data = b"".join(
+        get_variable_length_quantity(delta) + event for delta, event in events
+    )
+    return b"MTrk" + pack(">I", len(data)) + data
+
+
+def get_midi_input(time_signature: tuple[int, int] = (3, 2)) -> bytes:
+    numerator, denominator_power = time_signature
+    conductor = get_track(
+        [
+            (0, b"\xff\x03\x04Test"),
+            (
+                0,
+                b"\xff\x58\x04"
+                + bytes([numerator, denominator_power, 0x18, 0x08]),
+            ),
+            (0, b"\xff\x2f\x00"),
+        ]
+    )
+    bass = get_track(
+        [
+            (0, b"\xff\x03\x04Bass"),
+            (0, b"\x90\x30\x50"),
+            (1920, b"\x30\x00"),
+            (0, b"\xff\x2f\x00"),
+        ]
+    )
+    melody = get_track(
+        [
+            (0, b"\xff\x03\x06Melody"),
+            (480, b"\x91\x43\x50"),
+            (1440, b"\x81\x43\x00"),
+            (0, b"\xff\x2f\x00"),
+        ]
+    )
+    header = b"MThd" + pack(">IHHH", 6, 1, 3, 480)
+    return header + conductor + bass + melody
+
+
+expected_staves = [
+    (InputPart.BASS, ["c2.", "~", "c4"]),
+    (InputPart.MELODY, ["r4", "g'2", "~", "g'4"]),
+]
+
+
+@mark.parametrize("input_part, expected", expected_staves)
+def test_get_metered_staff(input_part: InputPart, expected: list[str]):
+    reader = MidiReader(get_midi_input())
+    staff, metered_leaves = reader.get_metered_staff(input_part)
+    leaves = [metered_leaf.leaf for metered_leaf in metered_leaves]
+    contents = lilypond(staff).split()
+    assert reader.title == "Test"
+    assert [item for item in contents if item[0] in "cgr~"] == expected
+    assert get_indicators(leaves[0], prototype=TimeSignature) == [
+        TimeSignature((3, 4))
+    ]
+    assert all(
+        metered_leaf.time_signature == TimeSignature((3, 4))
+        for metered_leaf in metered_leaves
+    )
+
+
+def test_get_metered_staff_by_index():
+    reader = MidiReader(get_midi_input(), bass_track=2)
+    staff, _ = reader.get_metered_staff(InputPart.BASS)
+    assert "g'2" in lilypond(staff)
+
+
+@mark.parametrize("track", [0, 3, -1])
+def test_rejects_empty_or_missing_track(track: int):
+    reader = MidiReader(get_midi_input(), bass_track=track)
+    with raises(UnsupportedMidiError):
+        reader.get_metered_staff(InputPart.BASS)
+
+
+expected_unquantized_measures = [
+    ((7, 5), ["c8..", "~"] * 4 + ["c8"], TimeSignature((7, 32))),
+    ((3, 6), ["c32.", "~"] * 21 + ["c64"], TimeSignature((3, 64))),
+]
+
+
+@mark.parametrize(
+    "time_signature, expected, expected_time_signature",
+    expected_unquantized_measures,
+)
+def test_measures_are_not_quantized(
+    time_signature: tuple[int, int],
+    expected: list[str],
+    expected_time_signature: TimeSignature,
+):
+    reader = MidiReader(get_midi_input(time_signature))
+    staff, metered_leaves = reader.get_metered_staff(InputPart.BASS)
+    contents = lilypond(staff).split()
+    assert [item for item in contents if item[0] in "c~"] == expected
+    assert all(
+        metered_leaf.time_signature == expected_time_signature
+        for metered_leaf in metered_leaves
+    )
+
+
+def test_rejects_missing_header():
+    with raises(UnsupportedMidiError):
+        MidiReader(b"RIFF")
+
+
+def test_passage_from_midi(tmp_path: Path):
+    input_file = tmp_path / "passage.mid"
+    input_file.write_bytes(get_midi_input())
+    passage = Passage(
+        input_file,
+        3,
+        PitchType.LILYPOND,
+        Tuning.MICROTONAL,
+        DisplayFormat.TABLE,
+        False,
+        False,
+    )
+    assert passage.title == "Test"
+    assert [
+        (
+            NamedPitch.from_hertz(matrix.bass).name,
+            NamedPitch.from_hertz(matrix.melody).name,
+        )
+        for matrix in passage.matrices
+    ] == [("c", "g'")]
@@ -0,0 +1,161 @@
+from pathlib import Path
+from struct import unpack
+
+from abjad import Duration, NamedPitch
+from pytest import mark
+
+from agni.matrix_leaf import MatrixLeaf
+from agni.matrix_pitch import Tuning
+from agni.midi_writer import (
+    NOTE_OFF,
+    NOTE_ON,
+    PITCH_BEND,
+    TICKS_PER_QUARTER,
+    get_key_and_bend,
+    get_variable_length_quantity,
+    write_midi_file,
+)
+from agni.tuning import get_midi_number, get_quantizer
+
+expected_variable_length_quantities = [
+    (0, b"\x00"),
+    (0x40, b"\x40"),
+    (0x7F, b"\x7f"),
+    (0x80, b"\x81\x00"),
+    (0x3FFF, b"\xff\x7f"),
+    (0x200000, b"\x81\x80\x80\x00"),
+]
+
+
+@mark.parametrize("value, expected", expected_variable_length_quantities)
+def test_get_variable_length_quantity(value: int, expected: bytes):
+    assert get_variable_length_quantity(value) == expected
+
+
+expected_keys_and_bends = [
+    (60, (60, 8192)),
+    (60.5, (60, 10240)),
+    (60.75, (61, 7168)),
+    (-3, (0, 0)),
+]
+
+
+@mark.parametrize("midi_number, expected", expected_keys_and_bends)
+def test_get_key_and_bend(midi_number: float, expected: tuple[int, int]):
+    assert get_key_and_bend(midi_number) == expected
+
+
+def get_tracks(data: bytes) -> list[bytes]:
+    tracks = []
+    position = 14
+    while position < len(data):
+        assert data[position : position + 4] == b"MTrk"
+        (length,) = unpack(">I", data[position + 4 : position + 8])
+        tracks.append(data[position + 8 : position + 8 + length])
+        position += 8 + length
+    return tracks
+
+
+def test_write_midi_file(tmp_path: Path):
+    matrix_leaves = [
+        MatrixLeaf(NamedPitch("c"), NamedPitch("g'"), tie=True),
+        MatrixLeaf(NamedPitch("c"), NamedPitch("g'")),
+        MatrixLeaf(None, None, duration=Duration(1, 2)),
+    ]
+    path = tmp_path / "passage.mid"
+    write_midi_file(matrix_leaves, path, title="Passage")
+    data = path.read_bytes()
+    tracks = get_tracks(data)
+    track_names = [track[4 : 4 + track[3]].decode() for track in tracks[:4]]
+    assert data[:4] == b"MThd"
+    assert unpack(">IHHH", data[4:14]) == (
+        6,
+        1,
+        len(matrix_leaves[0].instrument_names) + 3,
+        TICKS_PER_QUARTER,
+    )
+    assert track_names == ["Passage", "Bass", "Melody", "2B"]
+    bass_track = tracks[1]
+    assert bass_track.count(b"\x90\x30") == 1
+    assert bass_track.count(b"\x80\x30\x00") == 1
+    assert bass_track.endswith(b"\x87\x40\x80\x30\x00\x87\x40\xff\x2f\x00")
+
+
+def get_channel_events(track: bytes) -> list[tuple[int, int, int, int]]:
+    events = []
+    position = 0
+    tick = 0
+    while position < len(track):
+        delta = 0
+        while True:
+            byte = track[position]
+            position += 1
+            delta = delta << 7 | byte & 0x7F
+            if not byte & 0x80:
+                break
+        tick += delta
+        status = track[position]
+        if status == 0xFF:
+            length = track[position + 2]
+            position += 3 + length
+            continue
+        events.append((tick, status, track[position + 1], track[position + 2]))
+        position += 3
+    return events
+
+
+def get_expected_midi_numbers(
+    matrix_leaf: MatrixLeaf,
+) -> dict[str, float]:
+    quantizer = get_quantizer(Tuning.MICROTONAL)
+    frequencies = {
+        "Bass": matrix_leaf._bass and matrix_leaf._bass.hertz,
+        "Melody": matrix_leaf._melody and matrix_leaf._melody.hertz,
+    }
+    for matrix_pitch in matrix_leaf.generated_pitches:
+        frequencies[matrix_pitch.instrument_name] = matrix_pitch.frequency
+    return {
+        name: quantizer.quantize(get_midi_number(frequency))
+        for name, frequency in frequencies.items()
+        if frequency
+    }
+
+
+def test_simultaneous_tracks_keep_their_own_bends(tmp_path: Path):
+    matrix_leaves = [
+        MatrixLeaf(NamedPitch("c"), NamedPitch("gqs'"), _multiples=5),
+        MatrixLeaf(NamedPitch("cqs"), NamedPitch("gqs'"), _multiples=5),
+    ]
+    path = tmp_path / "passage.mid"
+    write_midi_file(matrix_leaves, path)
+    tracks = get_tracks(path.read_bytes())[1:]
+    names = [track[4 : 4 + track[3]].decode() for track in tracks]
+    assert len(tracks) > 15
+    event_order = [NOTE_OFF, PITCH_BEND, NOTE_ON]
+    events = sorted(
+        (tick, event_order.index(status & 0xF0), index, status, *data)
+        for index, track in enumerate(tracks)
+        for tick, status, *data in get_channel_events(track)
+        if status & 0xF0 in event_order
+    )
+    bends = dict.fromkeys(range(16), 8192)
+    sounding: dict[tuple[int, int], int] = {}
+    for tick, _, index, status, first_data, second_data in events:
+        event = status & 0xF0
+        channel = status & 0x0F
+        if event == PITCH_BEND:
+            assert channel not in {channel for channel, _ in sounding}
+            bends[channel] = first_data | second_data << 7
+        elif event == NOTE_ON:
+            assert (channel, first_data) not in sounding
+            sounding[channel, first_data] = index
+            expected = get_expected_midi_numbers(
+                matrix_leaves[tick // TICKS_PER_QUARTER]
+            )
+            assert get_key_and_bend(expected[names[index]]) == (
+                first_data,
+                bends[channel],
+            )
+        else:
+            assert sounding.pop((channel, first_data)) == index
+    assert not sounding
@@ -0,0 +1,171 @@
+from pathlib import Path
+from zipfile import ZipFile
+
+from abjad import NamedPitch, TimeSignature, lilypond
+from abjad.get import indicators as get_indicators
+from pytest import mark, raises
+
+from agni.helpers import InputPart
+from agni.lilypond_reader import UnsupportedInputError
+from agni.matrix import DisplayFormat
+from agni.matrix_pitch import PitchType, Tuning
+from agni.musicxml_reader import MusicXmlReader, get_pitch_name
+from agni.passage import Passage
+
+expected_pitch_names = [
+    (("C", 0, 4), "c'"),
+    (("C", 0, 3), "c"),
+    (("B", -1, 2), "bf,"),
+    (("F", 0.5, 5), "fqs''"),
+    (("E", -1.5, 4), "etqf'"),
+]
+
+
+@mark.parametrize("pitch, expected", expected_pitch_names)
+def test_get_pitch_name(pitch: tuple[str, float, int], expected: str):
+    assert get_pitch_name(*pitch) == expected
+
+
+def test_get_pitch_name_rejects_unsupported_alteration():
+    with raises(UnsupportedInputError):
+        get_pitch_name("C", 0.25, 4)
+
+
+MUSICXML_INPUT = """<?xml version="1.0" encoding="UTF-8"?>
+<score-partwise version="4.0">
+  <work><work-title>Test</work-title></work>
+  <identification>
+    <creator type="composer">Composer</creator>
+  </identification>
+  <part-list>
+    <score-part id="P1"><part-name>Melody</part-name></score-part>
+    <score-part id="P2"><part-name>Bass</part-name></score-part>
+  </part-list>
+  <part id="P1">
+    <measure number="1">
+      <attributes>
+        <divisions>6</divisions>
+        <time><beats>3</beats><beat-type>4</beat-type></time>
+        <clef><sign>G</sign><line>2</line></clef>
+      </attributes>
+      <note>
+        <pitch><step>G</step><octave>4</octave></pitch>
+        <duration>6</duration><type>quarter</type>
+      </note>
+      <note>
+        <pitch><step>G</step><octave>4</octave></pitch>
+        <duration>12</duration><tie type="start"/><type>half</type>
+      </note>
+    </measure>
+    <measure number="2">
+      <note>
+        <pitch><step>G</step><octave>4</octave></pitch>
+        <duration>6</duration><tie type="stop"/><type>quarter</type>
+      </note>
+      <note>
+        <pitch><step>A</step><octave>4</octave></pitch>
+        <duration>2</duration><type>eighth</type>
+        <time-modification>
+          <actual-notes>3</actual-notes><normal-notes>2</normal-notes>
+        </time-modification>
+        <notations><tuplet type="start"/></notations>
+      </note>
+      <note>
+        <pitch><step>B</step><alter>-1</alter><octave>4</octave></pitch>
+        <duration>2</duration><type>eighth</type>
+        <time-modification>
+          <actual-notes>3</actual-notes><normal-notes>2</normal-notes>
+        </time-modification>
+      </note>
+      <note>
+        <pitch><step>C</step><octave>5</octave></pitch>
+        <duration>2</duration><type>eighth</type>
+        <time-modification>
+          <actual-notes>3</actual-notes><normal-notes>2</normal-notes>
+        </time-modification>
+        <notations><tuplet type="stop"/></notations>
+      </note>
+      <note><rest/><duration>6</duration><type>quarter</type></note>
+    </measure>
+  </part>
+  <part id="P2">
+    <measure number="1">
+      <attributes>
+        <divisions>6</divisions>
+        <time><beats>3</beats><beat-type>4</beat-type></time>
+        <clef><sign>F</sign><line>4</line></clef>
+      </attributes>
+      <note>
+        <pitch><step>C</step><octave>3</octave></pitch>
+        <duration>18</duration><type>half</type><dot/>
+      </note>
+    </measure>
+    <measure number="2">
+      <note><rest measure="yes"/><duration>18</duration></note>
+    </measure>
+  </part>
+</score-partwise>
+"""
+
+expected_staves = [
+    (InputPart.BASS, ["c2.", "R1", "*", "3/4"]),
+    (
+        InputPart.MELODY,
+        ["g'4", "g'2", "~", "g'4", "\\tuplet", "3/2", "a'8", "bf'8", "c''8"],
+    ),
+]
+
+
+@mark.parametrize("input_part, expected", expected_staves)
+def test_get_metered_staff(
+    tmp_path: Path, input_part: InputPart, expected: list[str]
+):
+    input_file = tmp_path / "passage.musicxml"
+    input_file.write_text(MUSICXML_INPUT)
+    reader = MusicXmlReader(input_file)
+    staff, metered_leaves = reader.get_metered_staff(input_part)
+    leaves = [metered_leaf.leaf for metered_leaf in metered_leaves]
+    contents = lilypond(staff).split()
+    start = next(
+        index for index, item in enumerate(contents) if item[0] in "cgR"
+    )
+    assert reader.title == "Test"
+    assert reader.composer == "Composer"
+    items = [item for item in contents[start:] if item not in "{}|"]
+    assert items[: len(expected)] == expected
+    assert get_indicators(leaves[0], prototype=TimeSignature) == [
+        TimeSignature((3, 4))
+    ]
+
+
+def test_get_metered_staff_by_index(tmp_path: Path):
+    input_file = tmp_path / "passage.musicxml"
+    input_file.write_text(MUSICXML_INPUT)
+    reader = MusicXmlReader(input_file, bass_part=0, melody_part=1)
+    staff, _ = reader.get_metered_staff(InputPart.BASS)
+    assert "g'2" in lilypond(staff)
+
+
+def test_passage_from_compressed_musicxml(tmp_path: Path):
+    input_file = tmp_path / "passage.mxl"
+    with ZipFile(input_file, "w") as archive:
+        archive.writestr("META-INF/container.xml", "<container/>")
+        archive.writestr("score.xml", MUSICXML_INPUT)
+    passage = Passage(
+        input_file,
+        3,
+        PitchType.LILYPOND,
+        Tuning.MICROTONAL,
+        DisplayFormat.TABLE,
+        False,
+        False,
+    )
+    assert passage.title == "Test"
+    assert passage.composer == "Composer"
+    assert [
+        (
+            NamedPitch.from_hertz(matrix.bass).name,
+            NamedPitch.from_hertz(matrix.melody).name,
+        )
+        for matrix in passage.matrices
+    ] == [("c", "g'")]
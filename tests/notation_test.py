@@ -0,0 +1,188 @@
+from asyncio import run
+from pathlib import Path
+
+from abjad import Clef, Configuration, Ottava
+from abjad.get import indicators as get_indicators
+from abjad.select import leaves as get_leaves
+from pytest import MonkeyPatch, fixture, mark, raises
+
+from agni.matrix import DisplayFormat, Matrix
+from agni.matrix_pitch import PitchType, Tuning
+from agni.notation import EngravingError, Notation, notate_all
+from agni.passage import Passage
+
+LILYPOND_SCRIPT = """#!/bin/sh
+touch "$3.running"
+echo "$(ls "$(dirname "$3")"/../*/*.running | wc -l)" >> "$3.log"
+sleep {seconds}
+rm "$3.running"
+cp "$4" "$3.pdf" || exit 1
+exit {status}
+"""
+GHOSTSCRIPT_SCRIPT = """#!/bin/sh
+output_file="${6#-sOutputFile=}"
+shift 6
+cat "$@" > "$output_file"
+"""
+PIPELINED_PASSAGE_INPUT = r"""
+\header { title = "Passage" }
+
+\score {
+  <<
+    \new Staff = "bass" { c1 d1 e1 f1 g1 }
+    \new Staff = "melody" { g'1 a'1 b'1 c''1 d''1 }
+  >>
+}
+"""
+
+expected_clefs_and_ottavas = [
+    (None, (None, None)),
+    (0, (None, None)),
+    (-1, (Clef("bass_15"), Ottava(n=-2))),
+    (1, (Clef("bass_8"), Ottava(n=-1))),
+    (2, (Clef("bass"), Ottava(n=0))),
+    (4, (Clef("treble"), Ottava(n=0))),
+    (6, (Clef("treble^8"), Ottava(n=1))),
+    (9, (Clef("treble^15"), Ottava(n=2))),
+]
+
+
+@mark.parametrize("octave, expected", expected_clefs_and_ottavas)
+def test_get_clef_and_ottava(octave: int | None, expected: tuple):
+    assert Notation._get_clef_and_ottava(octave) == expected
+
+
+def test_ensemble_staves_have_one_clef():
+    matrix = Matrix("a,", "cs'", 3)
+    notation = Notation(
+        matrix, True, Tuning.MICROTONAL, False, False, Path("examples")
+    )
+    score = notation._get_ensemble_score()
+    staff_group = score[0]
+    clefs = {
+        staff.name: get_indicators(get_leaves(staff)[0], prototype=Clef)
+        for staff in staff_group
+    }
+    assert clefs == {
+        "7": [Clef("treble")],
+        "6": [Clef("treble")],
+        "5": [Clef("treble")],
+        "4": [Clef("treble")],
+        "3": [Clef("treble")],
+        "2": [Clef("treble")],
+        "1": [Clef("bass")],
+        "0": [Clef("bass")],
+    }
+
+
+def get_notation(output_directory: Path) -> Notation:
+    output_directory.mkdir(exist_ok=True)
+    return Notation(
+        Matrix("a,", "cs'", 3),
+        False,
+        Tuning.MICROTONAL,
+        True,
+        False,
+        output_directory,
+    )
+
+
+@fixture
+def fake_lilypond(tmp_path: Path, monkeypatch: MonkeyPatch):
+    def set_fake_lilypond(seconds: float = 0, status: int = 0):
+        lilypond_path = tmp_path / "lilypond"
+        lilypond_path.write_text(
+            LILYPOND_SCRIPT.format(seconds=seconds, status=status)
+        )
+        lilypond_path.chmod(0o755)
+        monkeypatch.setattr(
+            "agni.notation.get_lilypond_path", lambda: str(lilypond_path)
+        )
+
+    monkeypatch.setattr(Configuration, "_lilypond_version_string", "2.24.0")
+    return set_fake_lilypond
+
+
+def test_notate_async(tmp_path: Path, fake_lilypond):
+    fake_lilypond()
+    pdf_file_path = run(get_notation(tmp_path / "0").notate_async())
+    assert pdf_file_path.exists()
+    assert pdf_file_path.suffix == ".pdf"
+    assert not pdf_file_path.with_suffix(".ly").exists()
+
+
+def test_notate_async_raises_engraving_error(tmp_path: Path, fake_lilypond):
+    fake_lilypond(status=1)
+    with raises(EngravingError):
+        run(get_notation(tmp_path / "0").notate_async())
+
+
+def test_notate_async_timeout_kills_lilypond(tmp_path: Path, fake_lilypond):
+    fake_lilypond(seconds=5)
+    notation = get_notation(tmp_path / "0")
+    with raises(TimeoutError):
+        run(notation.notate_async(timeout=0.5))
+    assert not list((tmp_path / "0").glob("*.pdf"))
+
+
+def test_notate_all_bounds_concurrency(tmp_path: Path, fake_lilypond):
+    fake_lilypond(seconds=0.2)
+    notations = [get_notation(tmp_path / str(index)) for index in range(5)]
+    pdf_file_paths = run(notate_all(notations, concurrency=2))
+    assert [path.parent.name for path in pdf_file_paths] == list("01234")
+    running_counts = [
+        int(count)
+        for path in pdf_file_paths
+        for log_path in path.parent.glob("*.log")
+        for count in log_path.read_text().split()
+    ]
+    assert max(running_counts) <= 2
+
+
+def test_notate_all_saves_jobs_to_the_same_path(tmp_path: Path, fake_lilypond):
+    fake_lilypond(seconds=0.2)
+    output_directory = tmp_path / "0"
+    notations = [get_notation(output_directory) for _ in range(3)]
+    pdf_file_paths = run(notate_all(notations, concurrency=3))
+    assert len(set(pdf_file_paths)) == 1
+    pdf_file_path = pdf_file_paths[0]
+    assert "\\header" in pdf_file_path.read_text()
+    assert [path.name for path in output_directory.glob("*.pdf")] == [
+        pdf_file_path.name
+    ]
+    assert not list(output_directory.glob("*.ly"))
+
+
+def test_notate_pipelined(
+    tmp_path: Path, fake_lilypond, monkeypatch: MonkeyPatch
+):
+    fake_lilypond()
+    ghostscript_path = tmp_path / "gs"
+    ghostscript_path.write_text(GHOSTSCRIPT_SCRIPT)
+    ghostscript_path.chmod(0o755)
+    monkeypatch.setattr(
+        "agni.notation.get_ghostscript_path", lambda: str(ghostscript_path)
+    )
+    input_file = tmp_path / "passage.ly"
+    input_file.write_text(PIPELINED_PASSAGE_INPUT)
+    passage = Passage(
+        input_file,
+        3,
+        PitchType.LILYPOND,
+        Tuning.MICROTONAL,
+        DisplayFormat.TABLE,
+        True,
+        False,
+    )
+    notation = Notation(
+        passage, False, Tuning.MICROTONAL, True, False, tmp_path / "0"
+    )
+    pdf_file_path = run(notation.notate_pipelined(chunk_size=2))
+    output = pdf_file_path.read_text()
+    assert output.count('title = "Passage"') == 1
+    assert output.count("\\header") == 3
+    assert [
+        line.split()[-2]
+        for line in output.splitlines()
+        if "Staff.instrumentName" in line
+    ] == ["1", "2", "3", "4", "5"]
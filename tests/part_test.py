@@ -0,0 +1,52 @@
+from pytest import mark
+
+from agni.helpers import InputPart
+from agni.part import Part
+
+lilypond_input = r"""
+\score {
+  \new Staff = "bass" {
+    a,4 ~ a,8 r8 \tuplet 3/2 { b,8 c4 }
+  }
+}
+"""
+
+
+def test_part_leaf_attributes_follow_advance():
+    part = Part(lilypond_input, InputPart.BASS)
+    assert part.tie
+    assert part.hertz == 110.0
+    part.get_next_metered_leaf()
+    assert not part.tie
+    part.get_next_metered_leaf()
+    assert part.hertz is None
+    part.get_next_metered_leaf()
+    assert part.is_start_of_tuplet
+
+
+def test_part_seek():
+    part = Part(lilypond_input, InputPart.BASS)
+    part.seek(4)
+    assert part.is_start_of_tuplet
+    part.seek(1)
+    assert part.tie
+
+
+expected_seek_ticks = [(0, 0, 6), (3, 0, 3), (9, 2, 3), (14, 4, 4)]
+
+
+@mark.parametrize("ticks, row, remaining_ticks", expected_seek_ticks)
+def test_part_seek_ticks(ticks: int, row: int, remaining_ticks: int):
+    part = Part(lilypond_input, InputPart.BASS)
+    part.seek_ticks(ticks)
+    assert part._row == row
+    assert part.remaining_ticks == remaining_ticks
+    assert part.onset_ticks == ticks
+
+
+def test_part_seek_measure():
+    part = Part(lilypond_input, InputPart.BASS)
+    part.seek(3)
+    part.seek_measure(1)
+    assert part.onset_ticks == 0
+    assert part.tie
@@ -1,5 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from pathlib import Path
+from threading import Barrier
+
+from abjad import NamedPitch
+from abjad.get import duration as get_duration
+from abjad.select import leaves as get_leaves
 from pytest import mark
 
+from agni.matrix import Matrix
+from agni.matrix_pitch import DisplayFormat, PitchType, Tuning
+from agni.passage import Passage
+
 from .conftest import call_command
 
 passage_command_name = ["passage"]
@@ -13,3 +25,238 @@ def test_passage_help(arg: str):
     output = call_command(passage_command_name + [arg])
     print(arg)
     assert passage_help_text in output
+
+
+passage_input = r"""
+\score {
+  <<
+    \new Staff = "bass" {
+      a,4 a,4 c4 a,4 r4 a,4
+    }
+    \new Staff = "melody" {
+      c4 c4 a,4 c4 r4 e4
+    }
+  >>
+}
+"""
+
+
+def get_passage(
+    tmp_path: Path,
+    as_set: bool,
+    adjacent_duplicates: bool,
+    unordered: bool = False,
+) -> Passage:
+    input_file = tmp_path / "passage.ly"
+    input_file.write_text(passage_input)
+    return Passage(
+        input_file,
+        Matrix.DEFAULT_MULTIPLES,
+        PitchType.LILYPOND,
+        Tuning.MICROTONAL,
+        DisplayFormat.TABLE,
+        as_set,
+        adjacent_duplicates,
+        unordered=unordered,
+    )
+
+
+def get_pitch_names(passage: Passage) -> list[tuple[str, str, int]]:
+    return [
+        (
+            NamedPitch.from_hertz(matrix.bass).name,
+            NamedPitch.from_hertz(matrix.melody).name,
+            count,
+        )
+        for matrix, count in passage.matrix_counts
+    ]
+
+
+expected_matrix_counts = [
+    (
+        False,
+        True,
+        False,
+        [
+            ("a,", "c", 1),
+            ("a,", "c", 1),
+            ("c", "a,", 1),
+            ("a,", "c", 1),
+            ("a,", "e", 1),
+        ],
+    ),
+    (
+        False,
+        False,
+        False,
+        [("a,", "c", 2), ("c", "a,", 1), ("a,", "c", 1), ("a,", "e", 1)],
+    ),
+    (
+        False,
+        False,
+        True,
+        [("a,", "c", 4), ("a,", "e", 1)],
+    ),
+    (
+        True,
+        False,
+        False,
+        [("a,", "c", 3), ("c", "a,", 1), ("a,", "e", 1)],
+    ),
+    (
+        True,
+        False,
+        True,
+        [("a,", "c", 4), ("a,", "e", 1)],
+    ),
+]
+
+
+@mark.parametrize(
+    "as_set, adjacent_duplicates, unordered, expected", expected_matrix_counts
+)
+def test_passage_matrix_counts(
+    tmp_path: Path,
+    as_set: bool,
+    adjacent_duplicates: bool,
+    unordered: bool,
+    expected: list[tuple[str, str, int]],
+):
+    passage = get_passage(tmp_path, as_set, adjacent_duplicates, unordered)
+    assert get_pitch_names(passage) == expected
+
+
+parallel_passage_input = r"""
+\score {
+  <<
+    \new Staff = "bass" {
+      \time 4/4
+      c2. ~ c4 | c4 \tuplet 3/2 { a,8 b,8 c8 } d2 | c1 | R1 | a,2 a,2
+    }
+    \new Staff = "melody" {
+      \time 4/4
+      e'4 g'2 e'4 ~ | e'4 f'4 \tuplet 3/2 { g'4 a'8 } b'4 | c''1 | R1 |
+      r4 f'4 g'2
+    }
+  >>
+}
+"""
+
+
+def get_matrix_leaf_values(passage: Passage) -> list[tuple]:
+    return [
+        (
+            matrix_leaf._bass,
+            matrix_leaf._melody,
+            matrix_leaf.duration,
+            matrix_leaf.is_multi_measure_rest,
+            matrix_leaf.tie,
+            matrix_leaf.tuplet and matrix_leaf.tuplet.multiplier,
+            matrix_leaf.is_start_of_tuplet,
+        )
+        for matrix_leaf in passage.matrix_leaves
+    ]
+
+
+def test_concurrent_matrix_leaves(tmp_path: Path):
+    threads = 8
+    input_file = tmp_path / "passage.ly"
+    input_file.write_text(parallel_passage_input)
+    passage = Passage(
+        input_file,
+        Matrix.DEFAULT_MULTIPLES,
+        PitchType.LILYPOND,
+        Tuning.MICROTONAL,
+        DisplayFormat.TABLE,
+        False,
+        True,
+    )
+    expected = get_matrix_leaf_values(passage._get_cursor())
+    barrier = Barrier(threads)
+
+    def analyze(_) -> tuple[list, list[list[tuple]], list]:
+        barrier.wait()
+        cursor_values = [
+            get_matrix_leaf_values(passage._get_cursor()) for _ in range(5)
+        ]
+        return passage.matrix_leaves, cursor_values, passage.matrices
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(analyze, range(threads)))
+    matrix_leaves, _, matrices = results[0]
+    for leaves, cursor_values, thread_matrices in results:
+        assert leaves is matrix_leaves
+        assert thread_matrices == matrices
+        assert all(values == expected for values in cursor_values)
+    assert get_matrix_leaf_values(passage) == expected
+
+
+expected_windows = [
+    ({"bars": (2, 3)}, Fraction(1), Fraction(3)),
+    ({"start": Fraction(1), "end": Fraction(3)}, Fraction(1), Fraction(3)),
+    ({"bars": (5, 9)}, Fraction(4), Fraction(5)),
+    ({"end": Fraction(2)}, Fraction(0), Fraction(2)),
+    (
+        {"start": Fraction(1, 2), "end": Fraction(5, 4)},
+        Fraction(1, 2),
+        Fraction(5, 4),
+    ),
+    (
+        {"start": Fraction(4, 3), "end": Fraction(13, 8)},
+        Fraction(4, 3),
+        Fraction(13, 8),
+    ),
+    (
+        {"start": Fraction(7, 2), "end": Fraction(9, 2)},
+        Fraction(7, 2),
+        Fraction(9, 2),
+    ),
+]
+
+
+@mark.parametrize("window, start, end", expected_windows)
+def test_window_matrix_leaves(
+    tmp_path: Path, window: dict, start: Fraction, end: Fraction
+):
+    input_file = tmp_path / "passage.ly"
+    input_file.write_text(parallel_passage_input)
+    passages = [
+        Passage(
+            input_file,
+            Matrix.DEFAULT_MULTIPLES,
+            PitchType.LILYPOND,
+            Tuning.MICROTONAL,
+            DisplayFormat.TABLE,
+            False,
+            True,
+            **passage_window,
+        )
+        for passage_window in ({}, window)
+    ]
+    passage, window_passage = passages
+    onset = Fraction(0)
+    expected = []
+    for matrix_leaf, values in zip(
+        passage.matrix_leaves, get_matrix_leaf_values(passage)
+    ):
+        leaf_end = onset + (matrix_leaf.sounding_duration or 0)
+        if start <= onset and leaf_end <= end:
+            expected.append(values)
+        elif onset < end and start < leaf_end:
+            expected.append(values[:2])
+        onset = leaf_end
+    window_values = get_matrix_leaf_values(window_passage)
+    assert [
+        values[: len(expected_values)]
+        for values, expected_values in zip(window_values, expected)
+    ] == expected
+    assert len(window_values) == len(expected)
+    assert (
+        sum(
+            matrix_leaf.sounding_duration or 0
+            for matrix_leaf in window_passage.matrix_leaves
+        )
+        == end - start
+    )
+    for staff in window_passage.bass_staff, window_passage.melody_staff:
+        assert get_duration(get_leaves(staff)) == end - start
@@ -0,0 +1,83 @@
+from pytest import MonkeyPatch, approx, mark
+
+from agni.matrix import Matrix
+from agni.matrix_pitch import ToneSet
+from agni.search import Search, get_cents, get_frequency_grid
+from agni.tuning import get_pitch_frequency
+
+target = ["c", "g'", "e''", "bf''"]
+tolerance = 20
+
+
+def test_get_frequency_grid():
+    grid = get_frequency_grid(440, 880, 600)
+    assert grid == approx([440, 440 * 2**0.5, 880])
+
+
+def get_brute_force_results(
+    search: Search, tone_set: ToneSet
+) -> list[tuple[int, float, float, float]]:
+    results = []
+    for bass in search._bass_frequencies:
+        for melody in search._melody_frequencies:
+            matrix = Matrix(str(bass), str(melody), tone_set=tone_set)
+            frequencies = [
+                pitch.frequency for pitch in matrix.pitches if pitch.frequency
+            ]
+            matches = 0
+            total_deviation = 0.0
+            for target_frequency in search.targets:
+                deviation = min(
+                    abs(get_cents(frequency, target_frequency))
+                    for frequency in frequencies
+                )
+                if deviation <= tolerance:
+                    matches += 1
+                    total_deviation += deviation
+            if matches:
+                results.append((matches, -total_deviation, bass, melody))
+    return sorted(results, reverse=True)
+
+
+@mark.parametrize("tone_set", [ToneSet.SUM, ToneSet.ALL])
+def test_search_matches_brute_force(tone_set: ToneSet):
+    limit = 20
+    search = Search(
+        target,
+        bass_range=("c,", "c"),
+        melody_range=("c'", "c''"),
+        tolerance=tolerance,
+        limit=limit,
+        tone_set=tone_set,
+        workers=1,
+    )
+    expected_results = get_brute_force_results(search, tone_set)[:limit]
+    results = [
+        (result.matches, result.deviation, result.bass, result.melody)
+        for result in search.results
+    ]
+    expected = [
+        (matches, -total_deviation / matches, bass, melody)
+        for matches, total_deviation, bass, melody in expected_results
+    ]
+    assert results == approx(expected)
+
+
+def test_search_in_parallel():
+    search_arguments = {
+        "target": [get_pitch_frequency(pitch) for pitch in target],
+        "bass_range": ("c,", "c"),
+        "melody_range": ("c'", "c''"),
+    }
+    serial_search = Search(**search_arguments, workers=1)
+    parallel_search = Search(**search_arguments, workers=2)
+    assert parallel_search.results == serial_search.results
+
+
+def test_search_runs_serially_by_default(monkeypatch: MonkeyPatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("started a process pool")
+
+    monkeypatch.setattr("agni.search.ProcessPoolExecutor", fail)
+    search = Search(target, bass_range=("c,", "c"), melody_range=("c'", "c''"))
+    assert search.results
@@ -0,0 +1,76 @@
+from pytest import mark
+
+from agni.matrix import Matrix
+from agni.spectrum import FrequencyModulation, HarmonicSeries, RingModulation
+
+expected_spectrum_frequencies = [
+    (
+        RingModulation("440", "100", 3),
+        [240.0, 340.0, 540.0, 640.0, 680.0, 780.0, 980.0, 1_080.0],
+    ),
+    (
+        FrequencyModulation("440", "100", 3),
+        [240.0, 340.0, 440.0, 540.0, 640.0],
+    ),
+    (
+        FrequencyModulation("100", "300", 3),
+        [100.0, 200.0, 400.0, 500.0, 700.0],
+    ),
+    (HarmonicSeries("100", partials=4), [100.0, 200.0, 300.0, 400.0]),
+    (
+        HarmonicSeries("100", shift=-30, partials=4),
+        [70.0, 170.0, 270.0, 370.0],
+    ),
+]
+
+
+@mark.parametrize("spectrum, expected", expected_spectrum_frequencies)
+def test_spectrum_sorted_frequencies(spectrum: Matrix, expected: list[float]):
+    assert spectrum.sorted_frequencies == expected
+
+
+@mark.parametrize("spectrum, _", expected_spectrum_frequencies)
+def test_spectrum_query_matches_full_grid(spectrum: Matrix, _: list[float]):
+    min_hz = 150
+    max_hz = 700
+    expected_frequencies = [
+        frequency
+        for frequency in spectrum.sorted_frequencies
+        if min_hz <= frequency <= max_hz
+    ]
+    frequencies = [pitch.frequency for pitch in spectrum.query(min_hz, max_hz)]
+    assert frequencies == expected_frequencies
+
+
+def test_negative_shift_series_query_keeps_partials_in_range():
+    spectrum = HarmonicSeries("100", shift=-30, partials=4, max_hz=380)
+    assert spectrum.sorted_frequencies == [70.0, 170.0, 270.0, 370.0]
+
+
+expected_titles = [
+    (RingModulation("440", "100"), "Ring-Modulation Spectrum"),
+    (FrequencyModulation("440", "100"), "Frequency-Modulation Spectrum"),
+    (HarmonicSeries("100"), "Harmonic Series"),
+    (HarmonicSeries("100", shift=20), "Frequency-Shifted Harmonic Series"),
+]
+
+
+@mark.parametrize("spectrum, expected_title", expected_titles)
+def test_spectrum_title(spectrum: Matrix, expected_title: str):
+    assert spectrum.title == expected_title
+
+
+def test_frequency_modulation_labels():
+    spectrum = FrequencyModulation("440", "100", 2)
+    lower_sideband = spectrum.get_pitch(1, -1)
+    assert lower_sideband.is_difference_tone
+    assert "(1 x carrier) - (1 x modulator)" in (
+        lower_sideband._get_display_label()
+    )
+
+
+def test_negative_shift_series_labels():
+    spectrum = HarmonicSeries("100", shift=-30, partials=4)
+    partial = spectrum.get_pitch(2, 1)
+    assert partial.is_difference_tone
+    assert "(2 x fundamental) - (1 x shift)" in partial._get_display_label()
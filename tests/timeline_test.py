@@ -0,0 +1,124 @@
+from abjad import Duration
+from pytest import mark, raises
+
+from agni.helpers import InputPart
+from agni.lilypond_reader import read_metered_staff
+from agni.timeline import LeafType, Timeline
+
+lilypond_input = r"""
+\score {
+  \new Staff = "melody" {
+    \time 3/4
+    a'4 ~ a'8 r8 \tuplet 3/2 { b'8 c''4 }
+    \time 2/4
+    R2
+  }
+}
+"""
+
+
+def get_timeline() -> Timeline:
+    metered_staff = read_metered_staff(lilypond_input, InputPart.MELODY)
+    assert metered_staff is not None
+    _, metered_leaves = metered_staff
+    return Timeline(metered_leaves)
+
+
+def test_timeline_length():
+    assert len(get_timeline()) == 6
+
+
+expected_columns = [
+    (0, Duration(0), Duration(1, 4), 440.0, LeafType.NOTE, True),
+    (1, Duration(1, 4), Duration(1, 8), 440.0, LeafType.NOTE, False),
+    (2, Duration(3, 8), Duration(1, 8), None, LeafType.REST, False),
+    (
+        3,
+        Duration(1, 2),
+        Duration(1, 12),
+        493.8833012561241,
+        LeafType.NOTE,
+        False,
+    ),
+    (
+        5,
+        Duration(3, 4),
+        Duration(1, 2),
+        None,
+        LeafType.MULTI_MEASURE_REST,
+        False,
+    ),
+]
+
+
+@mark.parametrize(
+    "index, onset, duration, hertz, leaf_type, tie", expected_columns
+)
+def test_timeline_columns(
+    index: int,
+    onset: Duration,
+    duration: Duration,
+    hertz: float | None,
+    leaf_type: LeafType,
+    tie: bool,
+):
+    timeline = get_timeline()
+    assert timeline.get_onset(index) == onset
+    assert timeline.get_duration(index) == duration
+    assert timeline.get_hertz(index) == hertz
+    assert timeline.get_leaf_type(index) == leaf_type
+    assert timeline.get_tie(index) == tie
+
+
+def test_timeline_tuplets():
+    timeline = get_timeline()
+    assert list(timeline.tuplet_ids) == [-1, -1, -1, 0, 0, -1]
+    assert list(timeline.tuplet_starts) == [0, 0, 0, 1, 0, 0]
+    assert timeline.get_tuplet(4) is timeline.tuplets[0]
+
+
+def test_timeline_time_signatures():
+    timeline = get_timeline()
+    assert list(timeline.time_signature_ids) == [0, 0, 0, 0, 0, 1]
+    time_signature = timeline.get_time_signature(5)
+    assert time_signature and time_signature.pair == (2, 4)
+
+
+def test_timeline_out_of_range():
+    timeline = get_timeline()
+    assert timeline.get_metered_leaf(6) is None
+    assert timeline.get_hertz(6) is None
+    assert timeline.get_tuplet(-1) is None
+
+
+def test_timeline_ticks():
+    timeline = get_timeline()
+    assert timeline.resolution == 24
+    assert list(timeline.duration_ticks) == [6, 3, 3, 2, 4, 12]
+    assert list(timeline.onset_ticks) == [0, 6, 9, 12, 14, 18]
+    assert timeline.get_duration_from_ticks(4) == Duration(1, 6)
+
+
+def test_timeline_set_resolution():
+    timeline = get_timeline()
+    timeline.set_resolution(48)
+    assert list(timeline.written_duration_ticks) == [12, 6, 6, 6, 12, 24]
+    with raises(ValueError):
+        timeline.set_resolution(36)
+
+
+expected_assignable_ticks = [(6, True), (9, True), (10, False), (4, False)]
+
+
+@mark.parametrize("ticks, expected", expected_assignable_ticks)
+def test_timeline_is_assignable(ticks: int, expected: bool):
+    assert get_timeline().is_assignable(ticks) is expected
+
+
+def test_timeline_measures():
+    timeline = get_timeline()
+    assert timeline.measure_count == 2
+    assert list(timeline.measure_rows) == [0, 5]
+    assert list(timeline.measure_onset_ticks) == [0, 18]
+    assert timeline.get_measure_onset_ticks(3) == timeline.end_ticks == 30
+    assert timeline.get_row(13) == 3
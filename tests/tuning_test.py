@@ -0,0 +1,110 @@
+from abjad import NamedPitch
+from pytest import approx, mark, raises
+
+from agni.tuning import (
+    Quantizer,
+    Tuning,
+    get_cent_deviation,
+    get_frequency,
+    get_midi_number,
+    get_pitch_frequency,
+    get_quantizer,
+)
+
+expected_quantized_midi_numbers = [
+    (Tuning.EQUAL_TEMPERED, 69.4, 69),
+    (Tuning.MICROTONAL, 69.4, 69.5),
+    (Tuning.EDO_36, 69.4, 69 + 1 / 3),
+    (Tuning.EDO_48, 69.4, 69.5),
+    (Tuning.EDO_72, 69.4, 69 + 1 / 3),
+    (Tuning.CENTS, 69.4, 69.4),
+    (Tuning.JUST, 63.9, 60 + 386.3137 / 100),
+    (Tuning.JUST, 71.9, 72),
+    (Tuning.JUST, 59.9, 60),
+]
+
+
+@mark.parametrize(
+    "tuning, midi_number, expected", expected_quantized_midi_numbers
+)
+def test_quantize(tuning: Tuning, midi_number: float, expected: float):
+    quantizer = get_quantizer(tuning)
+    assert quantizer.quantize(midi_number) == approx(expected)
+
+
+def test_quantize_all():
+    quantizer = get_quantizer(Tuning.EDO_48)
+    midi_numbers = [60.1, 60.2, 60.4]
+    assert list(quantizer.quantize_all(midi_numbers)) == approx(
+        [60.0, 60.25, 60.5]
+    )
+
+
+@mark.parametrize("tuning", list(Tuning))
+def test_quantize_all_matches_quantize(tuning: Tuning):
+    quantizer = get_quantizer(tuning)
+    midi_numbers = [59.9, 63.9, 69.4, 71.9]
+    assert list(quantizer.quantize_all(midi_numbers)) == [
+        quantizer.quantize(midi_number) for midi_number in midi_numbers
+    ]
+
+
+def test_quantizers_are_cached():
+    assert get_quantizer(Tuning.EDO_72) is get_quantizer(Tuning.EDO_72)
+    assert get_quantizer(Tuning.EDO_72) is Quantizer.edo(72)
+
+
+def test_edo_quantizer():
+    quantizer = Quantizer.edo(31)
+    assert quantizer.quantize(69.4) == approx(69 + 9 / 31)
+    assert quantizer.quantize_all([69.4]).tolist() == approx([69 + 9 / 31])
+
+
+def test_edo_quantizer_needs_steps():
+    with raises(ValueError):
+        Quantizer.edo(0)
+
+
+expected_just_labels = [(63.9, "5/4"), (66.9, "3/2"), (69.7, "7/4")]
+
+
+@mark.parametrize("midi_number, expected_label", expected_just_labels)
+def test_just_label(midi_number: float, expected_label: str):
+    assert get_quantizer(Tuning.JUST).get_label(midi_number) == expected_label
+
+
+def test_edo_has_no_labels():
+    assert get_quantizer(Tuning.EDO_36).get_label(60) is None
+
+
+expected_cent_deviations = [
+    (69, (69, 0)),
+    (69 + 1 / 3, (69, 33)),
+    (69.84, (70, -16)),
+]
+
+
+@mark.parametrize("midi_number, expected", expected_cent_deviations)
+def test_get_cent_deviation(midi_number: float, expected: tuple[int, int]):
+    assert get_cent_deviation(midi_number) == expected
+
+
+def test_midi_number_round_trip():
+    assert get_midi_number(440) == 69
+    assert get_frequency(get_midi_number(906)) == approx(906)
+
+
+expected_pitch_frequencies = [
+    ("440", False, 440),
+    (440.0, False, 440),
+    ("a'", False, 440),
+    (NamedPitch("a"), False, 220),
+    ("69", True, 440),
+]
+
+
+@mark.parametrize("pitch, midi_input, expected", expected_pitch_frequencies)
+def test_get_pitch_frequency(
+    pitch: str | float | NamedPitch, midi_input: bool, expected: float
+):
+    assert get_pitch_frequency(pitch, midi_input) == approx(expected)
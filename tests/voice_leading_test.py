@@ -0,0 +1,127 @@
+from itertools import pairwise, permutations
+from pathlib import Path
+from random import Random
+
+from abjad import Note
+from abjad.select import leaves as get_leaves
+from pytest import mark, raises
+
+from agni.helpers import InputPart
+from agni.matrix import DisplayFormat
+from agni.matrix_pitch import PitchType, Tuning
+from agni.notation import Notation
+from agni.passage import Passage
+from agni.voice_leading import VoiceLeading, get_assignment
+
+expected_assignments = [
+    ([], []),
+    ([[4, 1, 3], [2, 0, 5], [3, 2, 2]], [1, 0, 2]),
+    ([[1, 2, 3], [3, 1, 2]], [0, 1]),
+    ([[5, 0, 9, 9]], [1]),
+]
+
+
+@mark.parametrize("costs, expected", expected_assignments)
+def test_get_assignment(costs: list[list[float]], expected: list[int]):
+    assert get_assignment(costs) == expected
+
+
+def test_get_assignment_is_optimal():
+    random = Random(0)
+    for _ in range(200):
+        rows = random.randint(1, 5)
+        columns = random.randint(rows, 6)
+        costs = [
+            [random.randint(0, 20) for _ in range(columns)]
+            for _ in range(rows)
+        ]
+        assignment = get_assignment(costs)
+        assert len(set(assignment)) == rows
+        total = sum(
+            costs[row][column] for row, column in enumerate(assignment)
+        )
+        assert total == min(
+            sum(costs[row][column] for row, column in enumerate(permutation))
+            for permutation in permutations(range(columns), rows)
+        )
+
+
+def test_get_assignment_rejects_too_many_rows():
+    with raises(ValueError):
+        get_assignment([[0], [1]])
+
+
+def test_first_chord_is_assigned_in_order():
+    voice_leading = VoiceLeading(3)
+    assert voice_leading.assign([60, 64, 67]) == [0, 1, 2]
+
+
+def test_voices_move_by_smallest_distance():
+    voice_leading = VoiceLeading(3)
+    voice_leading.assign([60, 64, 67])
+    assert voice_leading.assign([59, 65, 72]) == [0, 1, 2]
+    assert voice_leading.assign([64, 71, 60]) == [1, 2, 0]
+    assert voice_leading.voices == [60, 64, 71]
+
+
+def test_repeated_chord_keeps_assignment():
+    voice_leading = VoiceLeading(2)
+    voice_leading.assign([60, 67])
+    assert voice_leading.assign([67, 60]) == [1, 0]
+
+
+def test_voices_are_added_when_needed():
+    voice_leading = VoiceLeading(1)
+    voice_leading.assign([60])
+    assert voice_leading.assign([61, 72]) == [0, 1]
+    assert len(voice_leading.voices) == 2
+
+
+def get_ensemble_changes(voice_leading: bool) -> tuple[int, float]:
+    passage = Passage(
+        Path(__file__).parent.parent / "examples" / "lonely-child-notes.ily",
+        4,
+        PitchType.LILYPOND,
+        Tuning.MICROTONAL,
+        DisplayFormat.TABLE,
+        False,
+        False,
+        bars=(24, 40),
+    )
+    notation = Notation(
+        passage,
+        True,
+        Tuning.MICROTONAL,
+        False,
+        False,
+        Path("examples"),
+        voice_leading=voice_leading,
+    )
+    staff_group = notation._get_ensemble_score()[0]
+    clef_changes = 0
+    movement = 0.0
+    for staff in staff_group:
+        if staff.name in tuple(InputPart):
+            continue
+        notes = [leaf for leaf in get_leaves(staff) if isinstance(leaf, Note)]
+        for note, next_note in pairwise(notes):
+            clef_and_ottava = Notation._get_clef_and_ottava(
+                Notation._get_octave(note)
+            )
+            next_clef_and_ottava = Notation._get_clef_and_ottava(
+                Notation._get_octave(next_note)
+            )
+            clef_changes += clef_and_ottava != next_clef_and_ottava
+            movement += abs(
+                next_note.written_pitch.number - note.written_pitch.number
+            )
+    return clef_changes, movement
+
+
+def test_voice_leading_reduces_clef_and_ottava_changes():
+    clef_changes, movement = get_ensemble_changes(voice_leading=False)
+    voice_leading_clef_changes, voice_leading_movement = get_ensemble_changes(
+        voice_leading=True
+    )
+    assert voice_leading_clef_changes < clef_changes
+    assert voice_leading_movement <= movement